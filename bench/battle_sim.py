@@ -0,0 +1,30 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models import Player
+from sim.montecarlo import numpy_available, simulate_battles
+from systems.explore import BOSS_TEMPLATE, REGION_MONSTERS
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    if not numpy_available():
+        print("numpy is not installed; the scalar fallback is not meant for this benchmark.")
+        return
+    player = Player(name="bench", max_hp=40, hp=40, atk=8, defense=3)
+    templates = [monsters[-1] for monsters in REGION_MONSTERS.values()] + [BOSS_TEMPLATE]
+    for template in templates:
+        start = time.perf_counter()
+        result = simulate_battles(player, template, count, seed=1)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{template[0]}: win {result.win_rate:.4f}, turns {result.mean_turns:.2f}, "
+            f"{count / elapsed:,.0f} battles/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models import Enemy, Player
+from systems.combat import BOSS_NAME, AlwaysAttackPolicy, GuardOnChargePolicy, run_battle
+
+
+def run_turns(turns: int, boss: bool) -> int:
+    played = 0
+    while played < turns:
+        player = Player(name="bench", max_hp=turns * 10, hp=turns * 10, atk=5)
+        enemy = Enemy(BOSS_NAME if boss else "허수아비", (turns - played) * player.total_atk, 1, 0, 0)
+        policy = GuardOnChargePolicy() if boss else AlwaysAttackPolicy()
+        played += run_battle(player, enemy, policy).turns
+    return played
+
+
+def measure(label: str, turns: int, boss: bool) -> None:
+    start = time.perf_counter()
+    played = run_turns(turns, boss)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    run_turns(turns, boss)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label}: {played:,} turns, {elapsed / played * 1e9:,.0f} ns/turn, "
+        f"traced peak {peak / 1024:,.1f} KiB"
+    )
+
+
+def main() -> None:
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    measure("headless", turns, False)
+    measure("headless boss", turns, True)
+
+
+if __name__ == "__main__":
+    main()
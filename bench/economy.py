@@ -0,0 +1,22 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sim.economy import format_report, simulate_economy
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    start = time.perf_counter()
+    report = simulate_economy(count, master_seed=1, workers=workers)
+    elapsed = time.perf_counter() - start
+    for line in format_report(report):
+        print(line)
+    print(f"{count / elapsed:,.0f} runs/s")
+
+
+if __name__ == "__main__":
+    main()
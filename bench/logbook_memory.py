@@ -0,0 +1,69 @@
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from systems.combat import ENEMY_HIT_LOG, HP_STATUS_LOG, PLAYER_HIT_LOG
+from systems.explore import MATERIAL_GAINED_LOG, VICTORY_LOG
+from utils.logging import LogBook
+
+
+ENTRY_COUNT: int = 1_000_000
+ENEMY_NAMES: Tuple[str, ...] = ("슬라임", "고블린", "동굴거미", "녹슨 기사", "폐허의 왕")
+MATERIALS: Tuple[str, ...] = ("약초", "철", "고철", "망령가루")
+
+
+def synthetic_session(count: int, seed: int = 7) -> List[Tuple[str, Tuple[Any, ...]]]:
+    rng = random.Random(seed)
+    session: List[Tuple[str, Tuple[Any, ...]]] = []
+    for _ in range(count):
+        name = rng.choice(ENEMY_NAMES)
+        roll = rng.random()
+        if roll < 0.4:
+            session.append((HP_STATUS_LOG, (name, rng.randint(1, 40), rng.randint(1, 60))))
+        elif roll < 0.7:
+            session.append((PLAYER_HIT_LOG, (name, rng.randint(1, 12))))
+        elif roll < 0.9:
+            session.append((ENEMY_HIT_LOG, (name, rng.randint(1, 9))))
+        elif roll < 0.95:
+            session.append((VICTORY_LOG, (rng.randint(1, 30), rng.randint(1, 20))))
+        else:
+            session.append((MATERIAL_GAINED_LOG, (rng.choice(MATERIALS),)))
+    return session
+
+
+def measure(label: str, fill: Callable[[], Any], count: int) -> int:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    holder = fill()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    used = after - before
+    print(f"{label}: {used / count:.1f} bytes/entry ({used / 1024 / 1024:.1f} MiB)")
+    del holder
+    return used
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else ENTRY_COUNT
+    session = synthetic_session(count)
+
+    def formatted_list() -> List[str]:
+        return [template.format(*args) for template, args in session]
+
+    def interned_logbook() -> LogBook:
+        logbook = LogBook()
+        for template, args in session:
+            logbook.add_template(template, (*args,))
+        return logbook
+
+    baseline = measure("formatted str list", formatted_list, count)
+    interned = measure("interned LogBook", interned_logbook, count)
+    print(f"reduction: {(1 - interned / baseline) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models import EQUIPMENT_ITEMS, MATERIAL_NAMES, MONSTER_LIST, Player
+from systems.achievements import ACHIEVEMENT_DEFS, AchievementManager
+from systems.dex import DexManager
+from systems.explore import BOSS_TEMPLATE, REGION_TABLE
+from systems.save import build_save_data
+from systems.save_binary import decode_save, encode_save, read_binary_section
+
+
+LOAD_REPEATS: int = 2000
+
+
+def completed_profile() -> dict:
+    player = Player(name="완주자", level=30, exp=12345, gold=98765, potions=9)
+    player.materials.update({name: 99 for name in MATERIAL_NAMES})
+    for name, item in EQUIPMENT_ITEMS.items():
+        owned = player.weapons_owned if item.slot == "weapon" else player.armors_owned
+        owned.append(name)
+    for region in REGION_TABLE:
+        player.world.conquer(region)
+    player.world.record_boss_kill(BOSS_TEMPLATE[0])
+    player.world.true_ending_unlocked = True
+    player.world.true_ending_cleared = True
+    for name in MATERIAL_NAMES:
+        player.world.discover_material(name)
+    for name in EQUIPMENT_ITEMS:
+        player.world.discover_equipment(name)
+    achievements = AchievementManager(None)
+    achievements.set_unlocked([achievement.achievement_id for achievement in ACHIEVEMENT_DEFS])
+    dex = DexManager(MATERIAL_NAMES, EQUIPMENT_ITEMS, MONSTER_LIST)
+    return build_save_data(player, achievements, dex)
+
+
+def per_load(action: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    for _ in range(LOAD_REPEATS):
+        action()
+    return (time.perf_counter() - start) / LOAD_REPEATS * 1e6
+
+
+def main() -> None:
+    data = completed_profile()
+    pretty = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    compact = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    binary = encode_save(data)
+    assert decode_save(binary) == json.loads(compact)
+    print(f"json (indent=2): {len(pretty):,} bytes")
+    print(f"json (compact):  {len(compact):,} bytes")
+    print(f"binary:          {len(binary):,} bytes")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = Path(tmp_dir) / "savegame.json"
+        binary_path = Path(tmp_dir) / "savegame.sav"
+        json_path.write_bytes(pretty)
+        binary_path.write_bytes(binary)
+        json_load = per_load(lambda: json.loads(json_path.read_text(encoding="utf-8")))
+        print(f"json full load:      {json_load:8.1f} us")
+        print(f"binary full load:    {per_load(lambda: decode_save(binary_path.read_bytes())):8.1f} us")
+        print(f"binary player only:  {per_load(lambda: read_binary_section(binary_path, 'player')):8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
-﻿from pathlib import Path
+﻿import random
+from pathlib import Path
+from typing import Optional
 
 from models import Player
 from systems.achievements import AchievementManager
 from systems.dex import DexManager
 from systems.quests import QuestManager
+from systems.strategy import Strategy
 from systems.town import town_menu
 from utils.logging import LogBook
 
@@ -34,13 +37,20 @@ from utils.logging import LogBook
 def main() -> None:
     print("CLI 싱글플레이 RPG에 오신 것을 환영합니다.")
     name = input("영웅의 이름을 입력하세요: ").strip() or "영웅"
-    player = Player(name=name)
-    logbook = LogBook()
+    run_game(Player(name=name), LogBook(), AchievementManager(Path("achievements.json")))
+
+
+def run_game(
+    player: Player,
+    logbook: LogBook,
+    achievement_manager: AchievementManager,
+    strategy: Optional[Strategy] = None,
+    rng: Optional[random.Random] = None,
+) -> None:
     quest_manager = QuestManager()
-    achievement_manager = AchievementManager(Path("achievements.json"))
     dex_manager = DexManager()
-    quest_manager.activate_run_quests(logbook)
-    town_menu(player, logbook, quest_manager, achievement_manager, dex_manager)
+    quest_manager.activate_run_quests(logbook, rng)
+    town_menu(player, logbook, quest_manager, achievement_manager, dex_manager, strategy, rng)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,155 @@
-﻿from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+﻿import copy
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Set, Tuple
+
+
+CONTENT_VERSION: int = 1
+
+DERIVED_STAT_FIELDS: frozenset = frozenset(
+    {
+        "atk",
+        "defense",
+        "explore_bonus",
+        "weapon_level",
+        "armor_level",
+        "weapon_tag",
+        "armor_tag",
+        "weapon_item",
+        "armor_item",
+    }
+)
+
+
+MATERIAL_NAMES: Tuple[str, ...] = (
+    "약초",
+    "야생꽃",
+    "사슴뿔",
+    "이끼씨앗",
+    "은빛꽃잎",
+    "철",
+    "수정",
+    "박쥐날개",
+    "광휘석",
+    "어둠버섯",
+    "고철",
+    "망령가루",
+    "낡은 인장",
+    "망각의 유물",
+    "저주의 조각",
+    "초원의 정수",
+    "심층 광석",
+    "부패의 핵",
+    "왕의 심장석",
+    "심연의 잔재",
+)
+
+
+class MaterialBag(dict):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.listeners: List[Any] = []
+
+    def __setitem__(self, name: str, count: int) -> None:
+        old = self.get(name, 0)
+        super().__setitem__(name, count)
+        self._notify(name, old, count)
+
+    def __delitem__(self, name: str) -> None:
+        old = self[name]
+        super().__delitem__(name)
+        self._notify(name, old, 0)
+
+    def __ior__(self, other: Any) -> "MaterialBag":
+        self.update(other)
+        return self
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (dict(self),)
+
+    def __copy__(self) -> "MaterialBag":
+        return self.__class__(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "MaterialBag":
+        return self.__class__(copy.deepcopy(dict(self), memo))
+
+    def _notify(self, name: str, old: int, new: int) -> None:
+        if old != new:
+            for listener in self.listeners:
+                listener.material_changed(name, old, new)
+
+    def pop(self, name: str, *default: Any) -> Any:
+        if name not in self:
+            return super().pop(name, *default)
+        count = self[name]
+        del self[name]
+        return count
+
+    def popitem(self) -> Tuple[str, int]:
+        name, count = super().popitem()
+        self._notify(name, count, 0)
+        return name, count
+
+    def clear(self) -> None:
+        removed = list(self.items())
+        super().clear()
+        for name, count in removed:
+            self._notify(name, count, 0)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for name, count in dict(*args, **kwargs).items():
+            self[name] = count
+
+    def setdefault(self, name: str, default: int = 0) -> int:
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def subscribe(self, listener: Any) -> None:
+        self.listeners.append(listener)
+
+
+@dataclass
+class WorldState:
+    conquered_regions: Set[str] = field(default_factory=set)
+    boss_kills: Dict[str, int] = field(default_factory=dict)
+    true_ending_unlocked: bool = False
+    true_ending_cleared: bool = False
+    blacksmith_visits: int = 0
+    discovered_materials: Set[str] = field(default_factory=set)
+    discovered_equipment: Set[str] = field(default_factory=set)
+
+    def is_conquered(self, region: str) -> bool:
+        return region in self.conquered_regions
+
+    def conquer(self, region: str) -> bool:
+        if region in self.conquered_regions:
+            return False
+        self.conquered_regions.add(region)
+        return True
+
+    def record_boss_kill(self, name: str) -> None:
+        self.boss_kills[name] = self.boss_kills.get(name, 0) + 1
+
+    def has_killed(self, name: str) -> bool:
+        return self.boss_kills.get(name, 0) > 0
+
+    def discover_material(self, name: str) -> bool:
+        if name in self.discovered_materials or name not in MATERIAL_NAMES:
+            return False
+        self.discovered_materials.add(name)
+        return True
+
+    def discover_equipment(self, name: str) -> bool:
+        if name in self.discovered_equipment or name not in EQUIPMENT_ITEMS:
+            return False
+        self.discovered_equipment.add(name)
+        return True
+
+    @property
+    def dex_ratio(self) -> float:
+        total = len(MATERIAL_NAMES) + len(EQUIPMENT_ITEMS)
+        found = len(self.discovered_materials) + len(self.discovered_equipment)
+        return found / total if total else 0.0
 
 
 @dataclass
@@ -22,30 +172,26 @@ class Player:
     armor_item: str = ""
     weapons_owned: List[str] = field(default_factory=list)
     armors_owned: List[str] = field(default_factory=list)
-    materials: Dict[str, int] = field(
-        default_factory=lambda: {
-            "약초": 0,
-            "야생꽃": 0,
-            "사슴뿔": 0,
-            "이끼씨앗": 0,
-            "은빛꽃잎": 0,
-            "철": 0,
-            "수정": 0,
-            "박쥐날개": 0,
-            "광휘석": 0,
-            "어둠버섯": 0,
-            "고철": 0,
-            "망령가루": 0,
-            "낡은 인장": 0,
-            "망각의 유물": 0,
-            "저주의 조각": 0,
-            "초원의 정수": 0,
-            "심층 광석": 0,
-            "부패의 핵": 0,
-            "왕의 심장석": 0,
-            "심연의 잔재": 0,
-        }
-    )
+    materials: MaterialBag = field(default_factory=lambda: MaterialBag.fromkeys(MATERIAL_NAMES, 0))
+    world: WorldState = field(default_factory=WorldState)
+
+    def __post_init__(self) -> None:
+        self._refresh_derived_stats()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "materials" and not isinstance(value, MaterialBag):
+            value = MaterialBag(value)
+        object.__setattr__(self, name, value)
+        if name in DERIVED_STAT_FIELDS and "total_explore" in self.__dict__:
+            self._refresh_derived_stats()
+
+    def _refresh_derived_stats(self) -> None:
+        bonus = get_equipment_bonus(self)
+        atk_bonus, def_bonus, explore_bonus = bonus
+        object.__setattr__(self, "equipment_bonus", bonus)
+        object.__setattr__(self, "total_atk", self.atk + self.weapon_level + atk_bonus)
+        object.__setattr__(self, "total_defense", self.defense + self.armor_level + def_bonus)
+        object.__setattr__(self, "total_explore", self.explore_bonus + explore_bonus)
 
 
 @dataclass
@@ -0,0 +1,171 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from models import Player
+from sim.farm import CHUNK_SIZE, farm_chunks, run_seed
+from sim.runs import BotStrategy, simulate_run
+from utils.events import GOLD_SINKS, GOLD_SOURCES, EventKind, LogEvent
+from utils.logging import LogBook, LogCursor
+
+
+# gold flow per series for one expedition
+StageFlow = Dict[str, int]
+
+GOLD_BALANCE: str = "balance"
+ECONOMY_SERIES: Tuple[str, ...] = GOLD_SOURCES + GOLD_SINKS + (GOLD_BALANCE,)
+ECONOMY_PERCENTILES: Tuple[float, ...] = (0.1, 0.5, 0.9)
+HISTOGRAM_LINEAR_LIMIT: int = 16
+HISTOGRAM_GROWTH: float = 1.15
+HISTOGRAM_MAX: int = 1_000_000
+
+
+def histogram_edges() -> Tuple[int, ...]:
+    edges = list(range(HISTOGRAM_LINEAR_LIMIT))
+    edge = float(HISTOGRAM_LINEAR_LIMIT)
+    while edge < HISTOGRAM_MAX:
+        edges.append(int(edge))
+        edge = max(edge * HISTOGRAM_GROWTH, edge + 1)
+    edges.append(HISTOGRAM_MAX)
+    return tuple(edges)
+
+
+HISTOGRAM_EDGES: Tuple[int, ...] = histogram_edges()
+
+
+def bin_index(value: int) -> int:
+    return max(0, bisect_right(HISTOGRAM_EDGES, value) - 1)
+
+
+def histogram_percentile(counts: Sequence[int], quantile: float) -> float:
+    total = sum(counts)
+    if not total:
+        return 0.0
+    rank = quantile * total
+    seen = 0
+    for index, count in enumerate(counts):
+        if count and seen + count >= rank:
+            low = HISTOGRAM_EDGES[index]
+            high = HISTOGRAM_EDGES[index + 1] if index + 1 < len(HISTOGRAM_EDGES) else low + 1
+            if high - low <= 1:
+                return float(low)
+            return low + (high - low) * (rank - seen) / count
+        seen += count
+    return float(HISTOGRAM_EDGES[-1])
+
+
+@dataclass
+class EconomyReport:
+    runs: int = 0
+    stage_runs: List[int] = field(default_factory=list)
+    totals: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(ECONOMY_SERIES, 0))
+    histograms: Dict[str, List[List[int]]] = field(
+        default_factory=lambda: {series: [] for series in ECONOMY_SERIES}
+    )
+
+    def add(self, stages: Sequence[StageFlow]) -> None:
+        self.runs += 1
+        for stage, flow in enumerate(stages):
+            if stage == len(self.stage_runs):
+                self.stage_runs.append(0)
+                for rows in self.histograms.values():
+                    rows.append([0] * len(HISTOGRAM_EDGES))
+            self.stage_runs[stage] += 1
+            for series in ECONOMY_SERIES:
+                amount = flow.get(series, 0)
+                if series != GOLD_BALANCE:
+                    self.totals[series] += amount
+                self.histograms[series][stage][bin_index(amount)] += 1
+
+    def merge(self, other: "EconomyReport") -> None:
+        self.runs += other.runs
+        for series in ECONOMY_SERIES:
+            self.totals[series] += other.totals[series]
+        for stage, runs in enumerate(other.stage_runs):
+            if stage == len(self.stage_runs):
+                self.stage_runs.append(0)
+                for rows in self.histograms.values():
+                    rows.append([0] * len(HISTOGRAM_EDGES))
+            self.stage_runs[stage] += runs
+            for series in ECONOMY_SERIES:
+                row = self.histograms[series][stage]
+                for index, count in enumerate(other.histograms[series][stage]):
+                    row[index] += count
+
+    def percentiles(
+        self, series: str, quantiles: Sequence[float] = ECONOMY_PERCENTILES
+    ) -> List[Tuple[float, ...]]:
+        return [
+            tuple(histogram_percentile(counts, quantile) for quantile in quantiles)
+            for counts in self.histograms[series]
+        ]
+
+    def mean_per_run(self, series: str) -> float:
+        return self.totals[series] / self.runs if self.runs else 0.0
+
+
+class EconomyBotStrategy(BotStrategy):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.stages: List[StageFlow] = []
+        self._cursor: LogCursor[LogEvent] = LogCursor(events=True)
+
+    def after_expedition(self, player: Player, logbook: LogBook) -> None:
+        super().after_expedition(player, logbook)
+        flow: StageFlow = {}
+        for event in self._cursor.read(logbook):
+            if event.kind in (EventKind.GOLD_GAINED, EventKind.GOLD_SPENT):
+                flow[event.subject] = flow.get(event.subject, 0) + event.amount
+        flow[GOLD_BALANCE] = player.gold
+        self.stages.append(flow)
+
+
+def simulate_economy_run(seed: int, strategy: Optional[EconomyBotStrategy] = None) -> List[StageFlow]:
+    strategy = strategy or EconomyBotStrategy()
+    simulate_run(seed, strategy)
+    return strategy.stages
+
+
+def simulate_economy_chunk(
+    master_seed: int,
+    start: int,
+    stop: int,
+    strategy_factory: Callable[[], EconomyBotStrategy] = EconomyBotStrategy,
+) -> EconomyReport:
+    report = EconomyReport()
+    for index in range(start, stop):
+        report.add(simulate_economy_run(run_seed(master_seed, index), strategy_factory()))
+    return report
+
+
+def simulate_economy(
+    count: int,
+    master_seed: int = 0,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    strategy_factory: Callable[[], EconomyBotStrategy] = EconomyBotStrategy,
+) -> EconomyReport:
+    report = EconomyReport()
+    for chunk in farm_chunks(
+        simulate_economy_chunk, count, master_seed, workers, chunk_size, strategy_factory
+    ):
+        report.merge(chunk)
+    return report
+
+
+def format_report(report: EconomyReport, series: Sequence[str] = ECONOMY_SERIES) -> List[str]:
+    lines = [f"runs: {report.runs:,}"]
+    for name in series:
+        if name == GOLD_BALANCE:
+            continue
+        lines.append(f"{name}: mean {report.mean_per_run(name):,.1f}/run")
+    header = "stage runs " + " ".join(f"{name:>22}" for name in series)
+    lines.append(header)
+    tables = {name: report.percentiles(name) for name in series}
+    for stage, runs in enumerate(report.stage_runs):
+        cells = []
+        for name in series:
+            p10, p50, p90 = tables[name][stage]
+            cells.append(f"{p10:>6.0f}/{p50:>6.0f}/{p90:>8.0f}")
+        lines.append(f"{stage + 1:>5} {runs:>4} " + " ".join(cells))
+    return lines
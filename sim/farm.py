@@ -0,0 +1,133 @@
+import os
+import random
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List, Optional, Set
+
+from sim.runs import BotStrategy, RunSummary, simulate_run
+
+
+CHUNK_SIZE: int = 250
+IN_FLIGHT_PER_WORKER: int = 2
+
+
+@dataclass
+class FarmReport:
+    runs: int = 0
+    deaths: int = 0
+    boss_kills: int = 0
+    boss_kill_expeditions: int = 0
+    expeditions: int = 0
+    levels: Counter = field(default_factory=Counter)
+    conquests: Counter = field(default_factory=Counter)
+    materials: Counter = field(default_factory=Counter)
+    gold_totals: List[int] = field(default_factory=list)
+    gold_samples: List[int] = field(default_factory=list)
+
+    def add(self, summary: RunSummary) -> None:
+        self.runs += 1
+        self.deaths += summary.deaths
+        self.expeditions += summary.expeditions
+        if summary.boss_kill_expedition is not None:
+            self.boss_kills += 1
+            self.boss_kill_expeditions += summary.boss_kill_expedition
+        self.levels[summary.level] += 1
+        self.conquests.update(summary.conquests)
+        self.materials.update(summary.materials)
+        for index, gold in enumerate(summary.gold_curve):
+            if index == len(self.gold_totals):
+                self.gold_totals.append(0)
+                self.gold_samples.append(0)
+            self.gold_totals[index] += gold
+            self.gold_samples[index] += 1
+
+    def merge(self, other: "FarmReport") -> None:
+        self.runs += other.runs
+        self.deaths += other.deaths
+        self.boss_kills += other.boss_kills
+        self.boss_kill_expeditions += other.boss_kill_expeditions
+        self.expeditions += other.expeditions
+        self.levels.update(other.levels)
+        self.conquests.update(other.conquests)
+        self.materials.update(other.materials)
+        for index, (total, samples) in enumerate(zip(other.gold_totals, other.gold_samples)):
+            if index == len(self.gold_totals):
+                self.gold_totals.append(0)
+                self.gold_samples.append(0)
+            self.gold_totals[index] += total
+            self.gold_samples[index] += samples
+
+    @property
+    def death_rate(self) -> float:
+        return self.deaths / self.runs if self.runs else 0.0
+
+    @property
+    def boss_kill_rate(self) -> float:
+        return self.boss_kills / self.runs if self.runs else 0.0
+
+    @property
+    def mean_boss_kill_expedition(self) -> float:
+        return self.boss_kill_expeditions / self.boss_kills if self.boss_kills else 0.0
+
+    @property
+    def mean_gold_curve(self) -> List[float]:
+        return [total / samples for total, samples in zip(self.gold_totals, self.gold_samples)]
+
+
+def run_seed(master_seed: int, index: int) -> int:
+    return random.Random(f"{master_seed}:{index}").getrandbits(64)
+
+
+def simulate_chunk(
+    master_seed: int,
+    start: int,
+    stop: int,
+    strategy_factory: Callable[[], BotStrategy] = BotStrategy,
+) -> FarmReport:
+    report = FarmReport()
+    for index in range(start, stop):
+        report.add(simulate_run(run_seed(master_seed, index), strategy_factory()))
+    return report
+
+
+def farm_chunks(
+    chunk_fn: Callable[..., Any],
+    count: int,
+    master_seed: int = 0,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    *args: Any,
+) -> Iterator[Any]:
+    workers = workers if workers is not None else os.cpu_count() or 1
+    chunk_size = max(1, chunk_size)
+    if workers <= 1:
+        for start in range(0, count, chunk_size):
+            yield chunk_fn(master_seed, start, min(count, start + chunk_size), *args)
+        return
+
+    max_in_flight = workers * IN_FLIGHT_PER_WORKER
+    pending: Set[Future] = set()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, count, chunk_size):
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            stop = min(count, start + chunk_size)
+            pending.add(executor.submit(chunk_fn, master_seed, start, stop, *args))
+        for future in wait(pending).done:
+            yield future.result()
+
+
+def farm_runs(
+    count: int,
+    master_seed: int = 0,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    strategy_factory: Callable[[], BotStrategy] = BotStrategy,
+) -> FarmReport:
+    report = FarmReport()
+    for chunk in farm_chunks(simulate_chunk, count, master_seed, workers, chunk_size, strategy_factory):
+        report.merge(chunk)
+    return report
@@ -0,0 +1,324 @@
+import random
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from models import Enemy, Player
+from systems.combat import (
+    ACTION_ATTACK,
+    ACTION_DEFEND,
+    ACTION_GUARD,
+    ACTION_POTION,
+    ACTION_RUN,
+    BLEED_CHANCE_OFFENSE,
+    BLEED_DAMAGE,
+    BLEED_TURNS,
+    BOSS_CHARGE_CHANCE,
+    BOSS_CHARGE_MULT,
+    BOSS_ENRAGE_BONUS,
+    BOSS_ENRAGE_THRESHOLD,
+    BOSS_GUARD_CHANCE,
+    BOSS_GUARD_REDUCTION,
+    BOSS_NAME,
+    BOSS_STUN_RESIST_MULT,
+    DEFEND_DAMAGE_MULT,
+    ESCAPE_CHANCE,
+    GUARD_ATTACK_BONUS,
+    GUARD_DAMAGE_MULT,
+    POTION_HEAL,
+    AlwaysAttackPolicy,
+    CombatPolicy,
+    GuardOnChargePolicy,
+    STEP_ENEMY_DOWN,
+    STEP_ESCAPED,
+    CombatState,
+    PotionBelowThresholdPolicy,
+    calculate_stun_chance,
+    fight,
+)
+from systems.explore import BOSS_TEMPLATE, REGION_MONSTERS, MonsterTemplate
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+MAX_TURNS: int = 1000
+INTENT_ATTACK: int = 0
+INTENT_CHARGE: int = 1
+INTENT_GUARD: int = 2
+INTENT_HEAVY: int = 3
+
+
+@dataclass
+class CombatantStats:
+    max_hp: int
+    hp: int
+    attack: int
+    defense: int
+    potions: int
+    offense_weapon: bool
+
+
+@dataclass
+class SimulationResult:
+    battles: int
+    wins: int = 0
+    losses: int = 0
+    escapes: int = 0
+    unfinished: int = 0
+    total_turns: int = 0
+    total_hp_left_on_win: int = 0
+    total_potions_used: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.battles if self.battles else 0.0
+
+    @property
+    def mean_turns(self) -> float:
+        return self.total_turns / self.battles if self.battles else 0.0
+
+    @property
+    def mean_hp_left_on_win(self) -> float:
+        return self.total_hp_left_on_win / self.wins if self.wins else 0.0
+
+
+def combatant_stats(player: Player) -> CombatantStats:
+    return CombatantStats(
+        max_hp=player.max_hp,
+        hp=player.hp,
+        attack=player.total_atk,
+        defense=player.total_defense,
+        potions=player.potions,
+        offense_weapon=player.weapon_tag == "OFFENSE",
+    )
+
+
+def template_enemy(template: MonsterTemplate) -> Enemy:
+    name, hp, atk, exp_reward, gold_reward, desc, trophy = template
+    return Enemy(name, hp, atk, exp_reward, gold_reward, desc, trophy)
+
+
+def phase_two_template(template: MonsterTemplate = BOSS_TEMPLATE) -> MonsterTemplate:
+    name, hp, atk, exp_reward, gold_reward, desc, trophy = template
+    return (name, max(1, int(hp * 1.3)), max(1, int(atk * 1.3)), exp_reward, gold_reward, desc, trophy)
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def simulate_battles(
+    player: Player,
+    template: MonsterTemplate,
+    count: int,
+    policy: Optional[CombatPolicy] = None,
+    phase_two: bool = False,
+    seed: Optional[int] = None,
+) -> SimulationResult:
+    policy = policy or AlwaysAttackPolicy()
+    if np is not None and _vectorizable(policy):
+        return _simulate_vectorized(combatant_stats(player), template, count, policy, phase_two, seed)
+    return _simulate_scalar(player, template, count, policy, phase_two, seed)
+
+
+def win_rate_table(
+    builds: Dict[str, Player],
+    count: int,
+    policy: Optional[CombatPolicy] = None,
+    seed: Optional[int] = None,
+) -> Dict[Tuple[str, str], float]:
+    templates: Dict[str, MonsterTemplate] = {}
+    for monsters in REGION_MONSTERS.values():
+        for template in monsters:
+            templates[template[0]] = template
+    templates[BOSS_TEMPLATE[0]] = BOSS_TEMPLATE
+    table: Dict[Tuple[str, str], float] = {}
+    for build_name, player in builds.items():
+        for monster_name, template in templates.items():
+            result = simulate_battles(player, template, count, policy, seed=seed)
+            table[(build_name, monster_name)] = result.win_rate
+    return table
+
+
+def _vectorizable(policy: CombatPolicy) -> bool:
+    if type(policy) is AlwaysAttackPolicy:
+        return True
+    if type(policy) in (GuardOnChargePolicy, PotionBelowThresholdPolicy):
+        return _vectorizable(policy.fallback)
+    return False
+
+
+def _choose_actions(policy: CombatPolicy, php, potions, heavy, is_boss: bool):
+    if type(policy) is PotionBelowThresholdPolicy:
+        fallback = _choose_actions(policy.fallback, php, potions, heavy, is_boss)
+        return np.where((potions > 0) & (php <= policy.threshold), ACTION_POTION, fallback)
+    if type(policy) is GuardOnChargePolicy:
+        fallback = _choose_actions(policy.fallback, php, potions, heavy, is_boss)
+        if not is_boss:
+            return fallback
+        return np.where(heavy, ACTION_GUARD, fallback)
+    return np.full(php.shape, ACTION_ATTACK, dtype=np.int8)
+
+
+def _simulate_scalar(
+    player: Player,
+    template: MonsterTemplate,
+    count: int,
+    policy: CombatPolicy,
+    phase_two: bool,
+    seed: Optional[int],
+) -> SimulationResult:
+    rng = random.Random(seed)
+    result = SimulationResult(battles=count)
+    for _ in range(count):
+        state = CombatState(player, template_enemy(template), phase_two, rng)
+        status = fight(state, policy)
+        result.total_turns += state.turn
+        result.total_potions_used += state.potions_used
+        if status == STEP_ENEMY_DOWN:
+            result.wins += 1
+            result.total_hp_left_on_win += state.player_hp
+        elif status == STEP_ESCAPED:
+            result.escapes += 1
+        else:
+            result.losses += 1
+    return result
+
+
+def _simulate_vectorized(
+    stats: CombatantStats,
+    template: MonsterTemplate,
+    count: int,
+    policy: CombatPolicy,
+    phase_two: bool,
+    seed: Optional[int],
+) -> SimulationResult:
+    rng = np.random.default_rng(seed)
+    name, enemy_hp, enemy_atk = template[0], template[1], template[2]
+    is_boss = name == BOSS_NAME
+    charge_mult = BOSS_CHARGE_MULT * (1.3 if phase_two else 1.0)
+    enrage_bonus = BOSS_ENRAGE_BONUS + (1 if phase_two else 0)
+    guard_reduction = BOSS_GUARD_REDUCTION * (0.85 if phase_two else 1.0)
+    stun_chance = calculate_stun_chance(name)
+    if is_boss:
+        stun_chance *= BOSS_STUN_RESIST_MULT * (0.6 if phase_two else 1.0)
+    enrage_hp = enemy_hp * BOSS_ENRAGE_THRESHOLD
+    base_damage = enemy_atk - stats.defense
+    attack_base = stats.attack - enemy_atk // 4
+
+    result = SimulationResult(battles=count)
+    php = np.full(count, stats.hp, dtype=np.int32)
+    ehp = np.full(count, enemy_hp, dtype=np.int32)
+    potions = np.full(count, stats.potions, dtype=np.int32)
+    bonus = np.zeros(count, dtype=np.int32)
+    bleed = np.zeros(count, dtype=np.int32)
+    stunned = np.zeros(count, dtype=bool)
+    charging = np.zeros(count, dtype=bool)
+    enraged = np.zeros(count, dtype=bool)
+
+    turn = 0
+    while php.size and turn < MAX_TURNS:
+        turn += 1
+        done = np.zeros(php.size, dtype=bool)
+
+        ticking = bleed > 0
+        if ticking.any():
+            ehp = np.where(ticking, np.maximum(0, ehp - BLEED_DAMAGE), ehp)
+            bleed = np.where(ticking, bleed - 1, bleed)
+            killed = ehp <= 0
+            result.wins += int(killed.sum())
+            result.total_hp_left_on_win += int(php[killed].sum())
+            result.total_turns += turn * int(killed.sum())
+            done |= killed
+
+        if is_boss:
+            enraged |= ehp <= enrage_hp
+            rolls = rng.random(php.size)
+            intent = np.where(
+                charging,
+                INTENT_HEAVY,
+                np.where(
+                    rolls < BOSS_CHARGE_CHANCE,
+                    INTENT_CHARGE,
+                    np.where(rolls < BOSS_CHARGE_CHANCE + BOSS_GUARD_CHANCE, INTENT_GUARD, INTENT_ATTACK),
+                ),
+            )
+            charging = intent == INTENT_CHARGE
+            heavy = intent == INTENT_HEAVY
+            boss_guarding = intent == INTENT_GUARD
+        else:
+            intent = None
+            heavy = np.zeros(php.size, dtype=bool)
+            boss_guarding = heavy
+
+        actions = _choose_actions(policy, php, potions, heavy, is_boss)
+        live = ~done
+
+        running = live & (actions == ACTION_RUN)
+        if running.any():
+            fled = running & (rng.random(php.size) < ESCAPE_CHANCE)
+            result.escapes += int(fled.sum())
+            result.total_turns += turn * int(fled.sum())
+            done |= fled
+            live = ~done
+
+        defending = live & (actions == ACTION_DEFEND)
+        guarding = live & (actions == ACTION_GUARD)
+        bonus = np.where(guarding, GUARD_ATTACK_BONUS, bonus)
+
+        drinking = live & (actions == ACTION_POTION) & (potions > 0)
+        if drinking.any():
+            heal = np.minimum(POTION_HEAL, stats.max_hp - php)
+            php = np.where(drinking, php + heal, php)
+            potions = np.where(drinking, potions - 1, potions)
+            result.total_potions_used += int(drinking.sum())
+
+        attacking = live & (actions == ACTION_ATTACK)
+        if attacking.any():
+            damage = np.maximum(1, attack_base + bonus)
+            if is_boss:
+                guarded = np.maximum(1, (damage * guard_reduction).astype(np.int32))
+                damage = np.where(boss_guarding, guarded, damage)
+            ehp = np.where(attacking, ehp - damage, ehp)
+            bonus = np.where(attacking, 0, bonus)
+            if stats.offense_weapon:
+                bleeds = attacking & (rng.random(php.size) < BLEED_CHANCE_OFFENSE)
+                bleed = np.where(bleeds, BLEED_TURNS, bleed)
+            killed = attacking & (ehp <= 0)
+            result.wins += int(killed.sum())
+            result.total_hp_left_on_win += int(php[killed].sum())
+            result.total_turns += turn * int(killed.sum())
+            done |= killed
+            live = ~done
+
+        skipping = live & stunned
+        stunned = stunned & ~live
+        acting = live & ~skipping
+        if is_boss:
+            acting &= intent != INTENT_CHARGE
+            raw = np.maximum(1, base_damage) + np.where(enraged, enrage_bonus, 0)
+            raw = np.where(heavy, raw * charge_mult, raw)
+        else:
+            raw = np.full(php.size, max(1, base_damage), dtype=np.float64)
+        multiplier = np.where(defending, DEFEND_DAMAGE_MULT, 1.0)
+        multiplier = np.where(guarding, multiplier * GUARD_DAMAGE_MULT, multiplier)
+        taken = np.maximum(1, (raw * multiplier).astype(np.int32))
+        php = np.where(acting, php - taken, php)
+        stunning = acting & guarding
+        if stunning.any():
+            stunned |= stunning & (rng.random(php.size) < stun_chance)
+        fallen = acting & (php <= 0)
+        result.losses += int(fallen.sum())
+        result.total_turns += turn * int(fallen.sum())
+        done |= fallen
+
+        if done.any():
+            keep = ~done
+            php, ehp, potions, bonus = php[keep], ehp[keep], potions[keep], bonus[keep]
+            bleed, stunned, charging, enraged = bleed[keep], stunned[keep], charging[keep], enraged[keep]
+
+    result.unfinished = int(php.size)
+    result.total_turns += turn * result.unfinished
+    return result
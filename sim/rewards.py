@@ -0,0 +1,145 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from models import Player
+from systems.explore import (
+    BONUS_DROP_MIN_DEPTH,
+    REGION_CONQUEST_BONUS,
+    REGION_TABLE,
+    MonsterTemplate,
+    bonus_drop_allowed,
+    region_reward_multiplier,
+    region_table,
+)
+
+
+WinProbability = Callable[[MonsterTemplate], float]
+
+REWARD_CACHE_SIZE: int = 4096
+BOSS_REGION: str = "폐허 심층"
+
+
+@dataclass(frozen=True)
+class RewardMoments:
+    gold: float = 0.0
+    gold_var: float = 0.0
+    exp: float = 0.0
+    exp_var: float = 0.0
+    materials: float = 0.0
+    materials_var: float = 0.0
+    material_breakdown: Tuple[Tuple[str, float], ...] = ()
+
+    def __add__(self, other: "RewardMoments") -> "RewardMoments":
+        breakdown: Dict[str, float] = dict(self.material_breakdown)
+        for name, amount in other.material_breakdown:
+            breakdown[name] = breakdown.get(name, 0.0) + amount
+        return RewardMoments(
+            gold=self.gold + other.gold,
+            gold_var=self.gold_var + other.gold_var,
+            exp=self.exp + other.exp,
+            exp_var=self.exp_var + other.exp_var,
+            materials=self.materials + other.materials,
+            materials_var=self.materials_var + other.materials_var,
+            material_breakdown=tuple(breakdown.items()),
+        )
+
+
+@lru_cache(maxsize=REWARD_CACHE_SIZE)
+def turn_rewards(
+    region: str,
+    depth: int,
+    explore_bonus: float = 0.0,
+    conquered: bool = False,
+    win_probability: Optional[WinProbability] = None,
+) -> RewardMoments:
+    bonus = REGION_CONQUEST_BONUS.get(region) if conquered else None
+    table = region_table(region, explore_bonus, bonus)
+    multiplier = region_reward_multiplier(region, depth, explore_bonus)
+    share = table.encounter_chance / len(table.prototypes)
+
+    win_rate = gold = gold_sq = exp = exp_sq = 0.0
+    for template in table.prototypes:
+        chance = share * (1.0 if win_probability is None else win_probability(template))
+        gold_reward = max(1, int(template[4] * multiplier))
+        exp_reward = max(1, int(template[3] * multiplier))
+        win_rate += chance
+        gold += chance * gold_reward
+        gold_sq += chance * gold_reward * gold_reward
+        exp += chance * exp_reward
+        exp_sq += chance * exp_reward * exp_reward
+
+    breakdown: Dict[str, float] = {}
+    for name, threshold in table.drop_thresholds:
+        breakdown[name] = breakdown.get(name, 0.0) + win_rate * threshold
+    extra = bonus_drop_chance(region, depth)
+    for name in table.drop_names:
+        breakdown[name] = breakdown.get(name, 0.0) + win_rate * extra / len(table.drop_names)
+    drop_mean, drop_var = drop_moments(region, depth, explore_bonus, conquered)
+
+    materials = win_rate * drop_mean
+    return RewardMoments(
+        gold=gold,
+        gold_var=gold_sq - gold * gold,
+        exp=exp,
+        exp_var=exp_sq - exp * exp,
+        materials=materials,
+        materials_var=win_rate * (drop_var + drop_mean * drop_mean) - materials * materials,
+        material_breakdown=tuple(breakdown.items()),
+    )
+
+
+def bonus_drop_chance(region: str, depth: int) -> float:
+    if not bonus_drop_allowed(region, depth):
+        return 0.0
+    return min(1.0, 0.1 * max(0, depth - 1))
+
+
+def drop_moments(region: str, depth: int, explore_bonus: float = 0.0, conquered: bool = False) -> Tuple[float, float]:
+    bonus = REGION_CONQUEST_BONUS.get(region) if conquered else None
+    chances = [threshold for _, threshold in region_table(region, explore_bonus, bonus).drop_thresholds]
+    chances.append(bonus_drop_chance(region, depth))
+    return sum(chances), sum(chance * (1.0 - chance) for chance in chances)
+
+
+def cumulative_rewards(
+    region: str,
+    max_depth: int,
+    explore_bonus: float = 0.0,
+    conquered: bool = False,
+    win_probability: Optional[WinProbability] = None,
+) -> List[RewardMoments]:
+    if region == BOSS_REGION:
+        max_depth = min(max_depth, 1)
+    totals: List[RewardMoments] = []
+    running = RewardMoments()
+    for depth in range(1, max_depth + 1):
+        running = running + turn_rewards(region, depth, explore_bonus, conquered, win_probability)
+        totals.append(running)
+    return totals
+
+
+def expected_rewards(
+    player: Player,
+    region: str,
+    depth: int,
+    conquered: bool = False,
+    win_probability: Optional[WinProbability] = None,
+) -> RewardMoments:
+    return turn_rewards(region, depth, player.total_explore, conquered, win_probability)
+
+
+def reward_table(
+    player: Player,
+    max_depth: int = BONUS_DROP_MIN_DEPTH + 3,
+    conquered: Sequence[str] = (),
+    win_probability: Optional[WinProbability] = None,
+) -> Dict[Tuple[str, int], RewardMoments]:
+    table: Dict[Tuple[str, int], RewardMoments] = {}
+    for region in REGION_TABLE:
+        depths = 1 if region == BOSS_REGION else max_depth
+        for depth in range(1, depths + 1):
+            table[(region, depth)] = expected_rewards(
+                player, region, depth, region in conquered, win_probability
+            )
+    return table
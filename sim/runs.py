@@ -0,0 +1,144 @@
+import contextlib
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from main import run_game
+from models import EQUIPMENT_ITEMS, Player
+from systems.achievements import AchievementManager
+from systems.combat import GuardOnChargePolicy, PotionBelowThresholdPolicy
+from systems.crafting import craft_item, list_craftable
+from systems.explore import BOSS_TEMPLATE, LEVEL_UP_CHOICES, can_enter_boss
+from systems.shop import BASE_EQUIPMENT_STOCK, get_buy_price, merge_stock
+from systems.strategy import TOWN_EXPLORE, TOWN_QUIT, TOWN_REST, TOWN_SHOP, Strategy
+from systems.town import buy_item, purchase_equipment
+from utils.logging import LogBook
+
+
+MAX_EXPEDITIONS: int = 60
+BOT_POTION_TARGET: int = 4
+BOT_POTION_THRESHOLD: int = 8
+BOT_RETREAT_HP_RATIO: float = 0.5
+BOT_MAX_DEPTH: int = 4
+BOT_GOLD_RESERVE: int = 20
+BOT_REGIONS: Sequence[str] = ("초원", "동굴", "폐허")
+BOSS_REGION: str = "폐허 심층"
+
+
+@dataclass
+class RunSummary:
+    seed: int = 0
+    expeditions: int = 0
+    level: int = 1
+    level_curve: List[int] = field(default_factory=list)
+    gold_curve: List[int] = field(default_factory=list)
+    materials: Dict[str, int] = field(default_factory=dict)
+    conquests: List[str] = field(default_factory=list)
+    boss_kill_expedition: Optional[int] = None
+    deaths: int = 0
+
+
+class BotStrategy(Strategy):
+    def __init__(
+        self,
+        max_expeditions: int = MAX_EXPEDITIONS,
+        potion_target: int = BOT_POTION_TARGET,
+        retreat_hp_ratio: float = BOT_RETREAT_HP_RATIO,
+        max_depth: int = BOT_MAX_DEPTH,
+        stop_after_boss: bool = True,
+    ) -> None:
+        super().__init__(GuardOnChargePolicy(PotionBelowThresholdPolicy(BOT_POTION_THRESHOLD)))
+        self.max_expeditions = max_expeditions
+        self.potion_target = potion_target
+        self.retreat_hp_ratio = retreat_hp_ratio
+        self.max_depth = max_depth
+        self.stop_after_boss = stop_after_boss
+        self.summary = RunSummary()
+
+    def town_action(self, player: Player, logbook: LogBook) -> int:
+        summary = self.summary
+        if summary.deaths or summary.expeditions >= self.max_expeditions:
+            return TOWN_QUIT
+        if self.stop_after_boss and summary.boss_kill_expedition is not None:
+            return TOWN_QUIT
+        if player.hp < player.max_hp:
+            return TOWN_REST
+        if player.potions < self.potion_target and player.gold >= get_buy_price("포션"):
+            return TOWN_SHOP
+        return TOWN_EXPLORE
+
+    def shop(self, player: Player, logbook: LogBook, rotating_stock: Sequence[str]) -> None:
+        price = get_buy_price("포션")
+        while player.potions < self.potion_target and player.gold >= price:
+            buy_item(player, "포션", logbook)
+        for name in merge_stock(BASE_EQUIPMENT_STOCK, rotating_stock):
+            item = EQUIPMENT_ITEMS[name]
+            owned = player.weapons_owned if item.slot == "weapon" else player.armors_owned
+            equipped = player.weapon_item if item.slot == "weapon" else player.armor_item
+            if name in owned or player.gold - get_buy_price(name) < BOT_GOLD_RESERVE:
+                continue
+            if equipped and _gear_score(name) <= _gear_score(equipped):
+                continue
+            if purchase_equipment(player, logbook, name):
+                if item.slot == "weapon":
+                    player.weapon_item = name
+                else:
+                    player.armor_item = name
+
+    def choose_region(self, player: Player) -> str:
+        allowed, _ = can_enter_boss(player)
+        if allowed:
+            return BOSS_REGION
+        return BOT_REGIONS[min(len(BOT_REGIONS) - 1, (player.level - 1) // 2)]
+
+    def enter_true_ending(self, player: Player) -> bool:
+        return True
+
+    def continue_exploring(self, player: Player, region: str, depth: int) -> bool:
+        return depth < self.max_depth and player.hp > player.max_hp * self.retreat_hp_ratio
+
+    def choose_level_up(self, player: Player) -> str:
+        return LEVEL_UP_CHOICES[player.level % 2]
+
+    def merchant(self, player: Player, logbook: LogBook) -> None:
+        return None
+
+    def blacksmith(self, player: Player, logbook: LogBook) -> None:
+        craftable = list_craftable(player.materials)
+        if craftable:
+            craft_item(player, craftable[0], logbook)
+
+    def after_expedition(self, player: Player, logbook: LogBook) -> None:
+        summary = self.summary
+        summary.expeditions += 1
+        summary.level_curve.append(player.level)
+        summary.gold_curve.append(player.gold)
+        if player.hp <= 0:
+            summary.deaths += 1
+        if summary.boss_kill_expedition is None and player.world.has_killed(BOSS_TEMPLATE[0]):
+            summary.boss_kill_expedition = summary.expeditions
+
+
+def _gear_score(name: str) -> int:
+    item = EQUIPMENT_ITEMS[name]
+    return item.atk + item.defense
+
+
+def simulate_run(seed: int, strategy: Optional[BotStrategy] = None) -> RunSummary:
+    strategy = strategy or BotStrategy()
+    player = Player(name="bot")
+    logbook = LogBook(echo=False)
+    with open(os.devnull, "w", encoding="utf-8") as sink, contextlib.redirect_stdout(sink):
+        run_game(player, logbook, AchievementManager(None), strategy, random.Random(seed))
+    summary = strategy.summary
+    summary.seed = seed
+    summary.level = player.level
+    summary.materials = {name: count for name, count in player.materials.items() if count}
+    summary.conquests = sorted(player.world.conquered_regions)
+    return summary
+
+
+def simulate_runs(count: int, first_seed: int = 0) -> Iterator[RunSummary]:
+    for seed in range(first_seed, first_seed + count):
+        yield simulate_run(seed)
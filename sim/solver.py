@@ -0,0 +1,320 @@
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from models import Player
+from sim.montecarlo import CombatantStats, MonsterTemplate, combatant_stats
+from systems.combat import (
+    ACTION_DEFEND,
+    ACTION_GUARD,
+    ACTION_POTION,
+    ACTION_RUN,
+    BLEED_CHANCE_OFFENSE,
+    BLEED_TURNS,
+    BOSS_CHARGE_CHANCE,
+    BOSS_CHARGE_MULT,
+    BOSS_ENRAGE_BONUS,
+    BOSS_GUARD_CHANCE,
+    BOSS_GUARD_REDUCTION,
+    BOSS_NAME,
+    BOSS_STUN_RESIST_MULT,
+    ESCAPE_CHANCE,
+    GUARD_ATTACK_BONUS,
+    POTION_HEAL,
+    AlwaysAttackPolicy,
+    BattleView,
+    CombatPolicy,
+    ScriptedPolicy,
+    apply_bleed_tick,
+    apply_boss_guard,
+    apply_damage_reduction,
+    calculate_stun_chance,
+    is_boss_enraged,
+)
+
+
+# (player hp, enemy hp, potions, next attack bonus, enemy bleed turns, enemy stunned, boss charging)
+CombatKey = Tuple[int, int, int, int, int, bool, bool]
+# (win probability, escape probability, expected turns)
+StateValue = Tuple[float, float, float]
+# either the next CombatKey or a terminal (outcome, ...) tuple
+Transition = Tuple[float, Tuple]
+
+KEY_LENGTH: int = 7
+OUTCOME_WIN: str = "win"
+OUTCOME_ESCAPE: str = "escape"
+OUTCOME_LOSS: str = "loss"
+ESCAPED: Tuple[str] = (OUTCOME_ESCAPE,)
+DEFEATED: Tuple[str] = (OUTCOME_LOSS,)
+
+RECURSION_HEADROOM: int = 20000
+NORMAL_INTENTS: Tuple[Tuple[float, str], ...] = ((1.0, "attack"),)
+CHARGED_INTENTS: Tuple[Tuple[float, str], ...] = ((1.0, "heavy"),)
+BOSS_INTENTS: Tuple[Tuple[float, str], ...] = (
+    (BOSS_CHARGE_CHANCE, "charge"),
+    (BOSS_GUARD_CHANCE, "guard"),
+    (1.0 - BOSS_CHARGE_CHANCE - BOSS_GUARD_CHANCE, "attack"),
+)
+
+
+@dataclass
+class BattleSolution:
+    win_probability: float
+    escape_probability: float
+    loss_probability: float
+    expected_turns: float
+    states: int
+
+
+@dataclass
+class BattleOutcomes:
+    wins: Dict[Tuple[int, int], float]
+    escape_probability: float
+    loss_probability: float
+
+    @property
+    def win_probability(self) -> float:
+        return sum(self.wins.values())
+
+
+class BattleSolver:
+    def __init__(
+        self,
+        stats: CombatantStats,
+        template: MonsterTemplate,
+        policy: Optional[CombatPolicy] = None,
+        phase_two: bool = False,
+    ) -> None:
+        policy = policy or AlwaysAttackPolicy()
+        if isinstance(policy, ScriptedPolicy):
+            raise ValueError("ScriptedPolicy depends on turn history and cannot be solved exactly")
+        self.stats = stats
+        self.policy = policy
+        self.enemy_name = template[0]
+        self.enemy_max_hp = template[1]
+        self.enemy_atk = template[2]
+        self.is_boss = self.enemy_name == BOSS_NAME
+        self.charge_mult = BOSS_CHARGE_MULT * (1.3 if phase_two else 1.0)
+        self.enrage_bonus = BOSS_ENRAGE_BONUS + (1 if phase_two else 0)
+        self.guard_reduction = BOSS_GUARD_REDUCTION * (0.85 if phase_two else 1.0)
+        stun_chance = calculate_stun_chance(self.enemy_name)
+        if self.is_boss:
+            stun_chance *= BOSS_STUN_RESIST_MULT * (0.6 if phase_two else 1.0)
+        self.stun_chance = stun_chance
+        self.bleed_chance = BLEED_CHANCE_OFFENSE if stats.offense_weapon else 0.0
+        self.memo: Dict[CombatKey, StateValue] = {}
+        self.distributions: Dict[CombatKey, Tuple[Dict[Tuple[int, int], float], float]] = {}
+        self.decisions: Dict[Tuple[int, int, int, int, int, str, bool], int] = {}
+
+    def solve(self) -> BattleSolution:
+        start: CombatKey = (self.stats.hp, self.enemy_max_hp, self.stats.potions, 0, 0, False, False)
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, RECURSION_HEADROOM))
+        try:
+            win, escape, turns = self.value(start)
+        finally:
+            sys.setrecursionlimit(limit)
+        return BattleSolution(
+            win_probability=win,
+            escape_probability=escape,
+            loss_probability=max(0.0, 1.0 - win - escape),
+            expected_turns=turns,
+            states=len(self.memo),
+        )
+
+    def value(self, key: CombatKey) -> StateValue:
+        cached = self.memo.get(key)
+        if cached is not None:
+            return cached
+        win = escape = 0.0
+        turns = 1.0
+        for probability, outcome in self._transitions(key):
+            if len(outcome) == KEY_LENGTH:
+                next_win, next_escape, next_turns = self.value(outcome)
+                win += probability * next_win
+                escape += probability * next_escape
+                turns += probability * next_turns
+            elif outcome[0] == OUTCOME_WIN:
+                win += probability
+            elif outcome[0] == OUTCOME_ESCAPE:
+                escape += probability
+        value = (win, escape, turns)
+        self.memo[key] = value
+        return value
+
+    def outcomes(self, player_hp: int, potions: int) -> BattleOutcomes:
+        start: CombatKey = (player_hp, self.enemy_max_hp, potions, 0, 0, False, False)
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, RECURSION_HEADROOM))
+        try:
+            wins, escape = self.distribution(start)
+        finally:
+            sys.setrecursionlimit(limit)
+        win = sum(wins.values())
+        return BattleOutcomes(wins, escape, max(0.0, 1.0 - win - escape))
+
+    def distribution(self, key: CombatKey) -> Tuple[Dict[Tuple[int, int], float], float]:
+        cached = self.distributions.get(key)
+        if cached is not None:
+            return cached
+        wins: Dict[Tuple[int, int], float] = {}
+        escape = 0.0
+        for probability, outcome in self._transitions(key):
+            if len(outcome) == KEY_LENGTH:
+                next_wins, next_escape = self.distribution(outcome)
+                for end_state, chance in next_wins.items():
+                    wins[end_state] = wins.get(end_state, 0.0) + probability * chance
+                escape += probability * next_escape
+            elif outcome[0] == OUTCOME_WIN:
+                end_state = (outcome[1], outcome[2])
+                wins[end_state] = wins.get(end_state, 0.0) + probability
+            elif outcome[0] == OUTCOME_ESCAPE:
+                escape += probability
+        result = (wins, escape)
+        self.distributions[key] = result
+        return result
+
+    def _transitions(self, key: CombatKey) -> List[Transition]:
+        player_hp, enemy_hp, potions, bonus, bleed, stunned, charging = key
+        if bleed > 0:
+            enemy_hp, bleed = apply_bleed_tick(enemy_hp, bleed)
+            if enemy_hp <= 0:
+                return [(1.0, (OUTCOME_WIN, player_hp, potions))]
+        enraged = self.is_boss and is_boss_enraged(enemy_hp, self.enemy_max_hp)
+        transitions: List[Transition] = []
+        for intent_probability, intent in self._intents(charging):
+            action = self._choose(player_hp, enemy_hp, potions, bonus, bleed, intent, enraged)
+            if action == ACTION_RUN:
+                transitions.append((intent_probability * ESCAPE_CHANCE, ESCAPED))
+                self._enemy_turn(
+                    transitions, intent_probability * (1.0 - ESCAPE_CHANCE), player_hp, enemy_hp,
+                    potions, bonus, bleed, False, False, stunned, intent, enraged,
+                )
+                continue
+            if action == ACTION_DEFEND:
+                self._enemy_turn(
+                    transitions, intent_probability, player_hp, enemy_hp, potions, bonus, bleed,
+                    True, False, stunned, intent, enraged,
+                )
+                continue
+            if action == ACTION_GUARD:
+                self._enemy_turn(
+                    transitions, intent_probability, player_hp, enemy_hp, potions,
+                    GUARD_ATTACK_BONUS, bleed, False, True, stunned, intent, enraged,
+                )
+                continue
+            if action == ACTION_POTION:
+                healed_hp, left = player_hp, potions
+                if potions > 0:
+                    healed_hp = player_hp + min(POTION_HEAL, self.stats.max_hp - player_hp)
+                    left = potions - 1
+                self._enemy_turn(
+                    transitions, intent_probability, healed_hp, enemy_hp, left, bonus, bleed,
+                    False, False, stunned, intent, enraged,
+                )
+                continue
+            damage = max(1, self.stats.attack + bonus - self.enemy_atk // 4)
+            if self.is_boss and intent == "guard":
+                damage = apply_boss_guard(damage, self.guard_reduction)
+            hit_hp = enemy_hp - damage
+            if hit_hp <= 0:
+                transitions.append((intent_probability, (OUTCOME_WIN, player_hp, potions)))
+                continue
+            if self.bleed_chance > 0.0:
+                self._enemy_turn(
+                    transitions, intent_probability * self.bleed_chance, player_hp, hit_hp,
+                    potions, 0, BLEED_TURNS, False, False, stunned, intent, enraged,
+                )
+                self._enemy_turn(
+                    transitions, intent_probability * (1.0 - self.bleed_chance), player_hp,
+                    hit_hp, potions, 0, bleed, False, False, stunned, intent, enraged,
+                )
+            else:
+                self._enemy_turn(
+                    transitions, intent_probability, player_hp, hit_hp, potions, 0, bleed,
+                    False, False, stunned, intent, enraged,
+                )
+        return transitions
+
+    def _enemy_turn(
+        self,
+        transitions: List[Transition],
+        probability: float,
+        player_hp: int,
+        enemy_hp: int,
+        potions: int,
+        bonus: int,
+        bleed: int,
+        defending: bool,
+        guarding: bool,
+        stunned: bool,
+        intent: str,
+        enraged: bool,
+    ) -> None:
+        charging = intent == "charge"
+        if stunned or (self.is_boss and charging):
+            transitions.append((probability, (player_hp, enemy_hp, potions, bonus, bleed, False, charging)))
+            return
+        raw_damage = max(1, self.enemy_atk - self.stats.defense)
+        if self.is_boss:
+            raw_damage += self.enrage_bonus if enraged else 0
+            if intent == "heavy":
+                raw_damage *= self.charge_mult
+        player_hp -= apply_damage_reduction(raw_damage, defending, guarding)
+        if player_hp <= 0:
+            transitions.append((probability, DEFEATED))
+            return
+        if guarding and self.stun_chance > 0.0:
+            transitions.append(
+                (probability * self.stun_chance, (player_hp, enemy_hp, potions, bonus, bleed, True, charging))
+            )
+            probability *= 1.0 - self.stun_chance
+        transitions.append((probability, (player_hp, enemy_hp, potions, bonus, bleed, False, charging)))
+
+    def _choose(
+        self,
+        player_hp: int,
+        enemy_hp: int,
+        potions: int,
+        bonus: int,
+        bleed: int,
+        intent: str,
+        enraged: bool,
+    ) -> int:
+        decision_key = (player_hp, enemy_hp, potions, bonus, bleed, intent, enraged)
+        action = self.decisions.get(decision_key)
+        if action is None:
+            action = self.policy.choose(
+                BattleView(
+                    turn=0,
+                    player_hp=player_hp,
+                    player_max_hp=self.stats.max_hp,
+                    potions=potions,
+                    enemy_name=self.enemy_name,
+                    enemy_hp=enemy_hp,
+                    enemy_max_hp=self.enemy_max_hp,
+                    is_boss=self.is_boss,
+                    boss_intent=intent,
+                    boss_enraged=enraged,
+                    next_attack_bonus=bonus,
+                    enemy_bleed_turns=bleed,
+                )
+            )
+            self.decisions[decision_key] = action
+        return action
+
+    def _intents(self, charging: bool) -> Tuple[Tuple[float, str], ...]:
+        if not self.is_boss:
+            return NORMAL_INTENTS
+        if charging:
+            return CHARGED_INTENTS
+        return BOSS_INTENTS
+
+
+def solve_battle(
+    player: Player,
+    template: MonsterTemplate,
+    policy: Optional[CombatPolicy] = None,
+    phase_two: bool = False,
+) -> BattleSolution:
+    return BattleSolver(combatant_stats(player), template, policy, phase_two).solve()
@@ -0,0 +1,239 @@
+from dataclasses import astuple, dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from models import Player
+from sim.montecarlo import CombatantStats, combatant_stats
+from sim.rewards import BOSS_REGION, drop_moments
+from sim.runs import BotStrategy
+from sim.solver import BattleSolver
+from systems.combat import CombatPolicy
+from systems.explore import (
+    DEPTH_MULT_BASE,
+    DEPTH_MULT_MAX,
+    DEPTH_MULT_STEP,
+    REGION_CONQUEST_BONUS,
+    region_reward_multiplier,
+    region_table,
+)
+
+
+# (win transitions as (hp, potions, probability), loss probability) for one (hp, potions) start
+FightSummary = Tuple[List[Tuple[int, int, float]], float]
+
+STOP_MAX_DEPTH: int = 1 + round((DEPTH_MULT_MAX - DEPTH_MULT_BASE) / DEPTH_MULT_STEP)
+STOP_BISECT_STEPS: int = 30
+STOP_PENALTY_MAX: float = 1e7
+STOP_TABLE_CACHE_SIZE: int = 64
+BOT_MAX_RISK: float = 0.05
+
+
+@dataclass
+class StoppingTable:
+    region: str
+    max_depth: int
+    max_hp: int
+    max_potions: int
+    death_penalty: float
+    expected_reward: float
+    death_probability: float
+    decisions: List[List[List[bool]]]
+    values: List[List[List[float]]]
+
+    def should_continue(self, depth: int, hp: int, potions: int) -> bool:
+        if depth < 1 or depth >= self.max_depth or hp <= 0:
+            return False
+        return self.decisions[depth][min(hp, self.max_hp)][min(max(0, potions), self.max_potions)]
+
+    def value(self, depth: int, hp: int, potions: int) -> float:
+        if depth < 1 or depth > self.max_depth or hp <= 0:
+            return 0.0
+        return self.values[depth][min(hp, self.max_hp)][min(max(0, potions), self.max_potions)]
+
+
+class StoppingModel:
+    def __init__(
+        self,
+        stats: CombatantStats,
+        region: str,
+        max_depth: int = STOP_MAX_DEPTH,
+        policy: Optional[CombatPolicy] = None,
+        explore_bonus: float = 0.0,
+        conquered: bool = False,
+        exp_value: float = 0.0,
+        material_value: float = 0.0,
+    ) -> None:
+        bonus = REGION_CONQUEST_BONUS.get(region) if conquered else None
+        table = region_table(region, explore_bonus, bonus)
+        self.stats = stats
+        self.region = region
+        self.max_depth = 1 if region == BOSS_REGION else max(1, max_depth)
+        self.encounter_chance = table.encounter_chance
+        share = table.encounter_chance / len(table.prototypes)
+        solvers = [BattleSolver(stats, template, policy) for template in table.prototypes]
+
+        self.fights: List[List[FightSummary]] = [[([], 0.0)] * (stats.potions + 1)]
+        self.win_rates: List[List[List[float]]] = [[[0.0] * len(solvers)] * (stats.potions + 1)]
+        for hp in range(1, stats.max_hp + 1):
+            fight_row: List[FightSummary] = []
+            rate_row: List[List[float]] = []
+            for potions in range(stats.potions + 1):
+                merged: Dict[Tuple[int, int], float] = {}
+                rates: List[float] = []
+                loss = 0.0
+                for solver in solvers:
+                    outcome = solver.outcomes(hp, potions)
+                    for end_state, chance in outcome.wins.items():
+                        merged[end_state] = merged.get(end_state, 0.0) + share * chance
+                    rates.append(share * outcome.win_probability)
+                    loss += share * outcome.loss_probability
+                fight_row.append(([(h, p, chance) for (h, p), chance in merged.items()], loss))
+                rate_row.append(rates)
+            self.fights.append(fight_row)
+            self.win_rates.append(rate_row)
+
+        self.rewards: List[List[float]] = [[]]
+        for depth in range(1, self.max_depth + 1):
+            multiplier = region_reward_multiplier(region, depth, explore_bonus)
+            drops = drop_moments(region, depth, explore_bonus, conquered)[0]
+            self.rewards.append(
+                [
+                    max(1, int(template[4] * multiplier))
+                    + exp_value * max(1, int(template[3] * multiplier))
+                    + material_value * drops
+                    for template in table.prototypes
+                ]
+            )
+
+    def solve(self, penalty: float) -> StoppingTable:
+        max_hp = self.stats.max_hp
+        max_potions = self.stats.potions
+        quiet = 1.0 - self.encounter_chance
+        empty = [[0.0] * (max_potions + 1) for _ in range(max_hp + 1)]
+        values: List[List[List[float]]] = [empty] * (self.max_depth + 1)
+        deaths: List[List[List[float]]] = [empty] * (self.max_depth + 1)
+        decisions: List[List[List[bool]]] = [
+            [[False] * (max_potions + 1) for _ in range(max_hp + 1)] for _ in range(self.max_depth + 1)
+        ]
+        for depth in range(self.max_depth - 1, 0, -1):
+            next_values = values[depth + 1]
+            next_deaths = deaths[depth + 1]
+            rewards = self.rewards[depth + 1]
+            depth_values = [[0.0] * (max_potions + 1) for _ in range(max_hp + 1)]
+            depth_deaths = [[0.0] * (max_potions + 1) for _ in range(max_hp + 1)]
+            for hp in range(1, max_hp + 1):
+                for potions in range(max_potions + 1):
+                    score, death = self._play(
+                        hp, potions, rewards, next_values, next_deaths, quiet, penalty
+                    )
+                    if score > 0.0:
+                        decisions[depth][hp][potions] = True
+                        depth_values[hp][potions] = score
+                        depth_deaths[hp][potions] = death
+            values[depth] = depth_values
+            deaths[depth] = depth_deaths
+
+        score, death = self._play(
+            self.stats.hp, max_potions, self.rewards[1], values[1], deaths[1], quiet, penalty
+        )
+        return StoppingTable(
+            region=self.region,
+            max_depth=self.max_depth,
+            max_hp=max_hp,
+            max_potions=max_potions,
+            death_penalty=penalty,
+            expected_reward=score + penalty * death,
+            death_probability=death,
+            decisions=decisions,
+            values=values,
+        )
+
+    def _play(
+        self,
+        hp: int,
+        potions: int,
+        rewards: List[float],
+        next_values: List[List[float]],
+        next_deaths: List[List[float]],
+        quiet: float,
+        penalty: float,
+    ) -> Tuple[float, float]:
+        wins, loss = self.fights[hp][potions]
+        gain = quiet * next_values[hp][potions]
+        death = loss + quiet * next_deaths[hp][potions]
+        for rate, reward in zip(self.win_rates[hp][potions], rewards):
+            gain += rate * reward
+        for end_hp, end_potions, chance in wins:
+            gain += chance * next_values[end_hp][end_potions]
+            death += chance * next_deaths[end_hp][end_potions]
+        return gain - penalty * loss, death
+
+
+def constrained_table(model: StoppingModel, max_risk: float) -> StoppingTable:
+    table = model.solve(0.0)
+    if table.death_probability <= max_risk:
+        return table
+    low, high = 0.0, 1.0
+    best = model.solve(high)
+    while best.death_probability > max_risk and high < STOP_PENALTY_MAX:
+        low, high = high, high * 2.0
+        best = model.solve(high)
+    for _ in range(STOP_BISECT_STEPS):
+        middle = (low + high) / 2.0
+        candidate = model.solve(middle)
+        if candidate.death_probability <= max_risk:
+            high, best = middle, candidate
+        else:
+            low = middle
+    return best
+
+
+def stopping_table(
+    player: Player,
+    region: str,
+    max_risk: float = 1.0,
+    max_depth: int = STOP_MAX_DEPTH,
+    policy: Optional[CombatPolicy] = None,
+    conquered: bool = False,
+    exp_value: float = 0.0,
+    material_value: float = 0.0,
+) -> StoppingTable:
+    model = StoppingModel(
+        combatant_stats(player),
+        region,
+        max_depth,
+        policy,
+        player.total_explore,
+        conquered,
+        exp_value,
+        material_value,
+    )
+    return constrained_table(model, max_risk)
+
+
+@lru_cache(maxsize=STOP_TABLE_CACHE_SIZE)
+def bot_stopping_table(
+    region: str, stats: Tuple, explore_bonus: float, max_risk: float, max_depth: int
+) -> StoppingTable:
+    policy = BotStrategy().combat_policy
+    model = StoppingModel(CombatantStats(*stats), region, max_depth, policy, explore_bonus)
+    return constrained_table(model, max_risk)
+
+
+class StoppingBotStrategy(BotStrategy):
+    def __init__(self, max_risk: float = BOT_MAX_RISK, max_depth: int = STOP_MAX_DEPTH, **kwargs) -> None:
+        super().__init__(max_depth=max_depth, **kwargs)
+        self.max_risk = max_risk
+        self.table: Optional[StoppingTable] = None
+
+    def choose_region(self, player: Player) -> str:
+        region = super().choose_region(player)
+        self.table = bot_stopping_table(
+            region, astuple(combatant_stats(player)), player.total_explore, self.max_risk, self.max_depth
+        )
+        return region
+
+    def continue_exploring(self, player: Player, region: str, depth: int) -> bool:
+        if self.table is None or self.table.region != region:
+            return super().continue_exploring(player, region, depth)
+        return self.table.should_continue(depth, player.hp, player.potions)
@@ -1,9 +1,11 @@
 ﻿import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Set
+from typing import Callable, Dict, List, Optional, Set
 
-from utils.logging import LogBook, log_print
+from utils.events import EventKind, LogEvent
+from utils.io import JOURNAL_COMPACT_LIMIT, Journal, atomic_write_text, dump_json, journal_path
+from utils.logging import LogBook, LogCursor, log_print
 
 
 @dataclass
@@ -22,40 +24,62 @@ ACHIEVEMENT_DEFS: List[Achievement] = [
 
 
 class AchievementManager:
-    def __init__(self, storage_path: Path) -> None:
+    def __init__(self, storage_path: Optional[Path]) -> None:
         self.storage_path = storage_path
         self.unlocked: Set[str] = set()
-        self.last_log_index = 0
+        self._journal: Optional[Journal] = Journal(journal_path(storage_path)) if storage_path is not None else None
+        self._cursor: LogCursor[LogEvent] = LogCursor(events=True)
+        self._bleed_seen = False
+        self._charge_seen = False
+        self._handlers: Dict[EventKind, Callable[[LogBook], None]] = {
+            EventKind.BLEED_TICK: self._on_bleed,
+            EventKind.BOSS_CHARGE: self._on_boss_charge,
+            EventKind.CRAFTED: self._on_crafted,
+            EventKind.ENEMY_STUNNED: self._on_enemy_stunned,
+            EventKind.VICTORY: self._on_victory,
+            EventKind.BOSS_DEFEATED: self._on_boss_defeated,
+            EventKind.TRUE_ENDING_CLEAR: self._on_true_ending_clear,
+        }
         self._load()
 
     def process(self, logbook: LogBook) -> None:
-        new_lines = logbook.entries[self.last_log_index :]
-        bleed_seen = False
-        charge_seen = False
-        for line in new_lines:
-            if "출혈로" in line:
-                bleed_seen = True
-            if "힘을 모으기 시작합니다" in line:
-                charge_seen = True
-            if "제작 완료:" in line:
-                self.unlock("first_craft", logbook)
-            if "기절해 움직이지 못합니다" in line and charge_seen:
-                self.unlock("stun_block_charge", logbook)
-            if "전투 승리!" in line and bleed_seen:
-                self.unlock("bleed_kill", logbook)
-                bleed_seen = False
-            if "폐허의 왕을 쓰러뜨렸습니다" in line:
-                self.unlock("first_boss_clear", logbook)
-            if "TRUE_ENDING_CLEAR" in line:
-                self.unlock("true_ending_clear", logbook)
-        self.last_log_index = len(logbook.entries)
+        self._bleed_seen = False
+        self._charge_seen = False
+        for event in self._cursor.read(logbook):
+            handler = self._handlers.get(event.kind)
+            if handler:
+                handler(logbook)
+
+    def _on_bleed(self, logbook: LogBook) -> None:
+        self._bleed_seen = True
+
+    def _on_boss_charge(self, logbook: LogBook) -> None:
+        self._charge_seen = True
+
+    def _on_crafted(self, logbook: LogBook) -> None:
+        self.unlock("first_craft", logbook)
+
+    def _on_enemy_stunned(self, logbook: LogBook) -> None:
+        if self._charge_seen:
+            self.unlock("stun_block_charge", logbook)
+
+    def _on_victory(self, logbook: LogBook) -> None:
+        if self._bleed_seen:
+            self.unlock("bleed_kill", logbook)
+            self._bleed_seen = False
+
+    def _on_boss_defeated(self, logbook: LogBook) -> None:
+        self.unlock("first_boss_clear", logbook)
+
+    def _on_true_ending_clear(self, logbook: LogBook) -> None:
+        self.unlock("true_ending_clear", logbook)
 
     def unlock(self, achievement_id: str, logbook: LogBook) -> None:
         if achievement_id in self.unlocked:
             return
         self.unlocked.add(achievement_id)
         log_print(logbook, f"업적 달성: {self._get_description(achievement_id)}")
-        self._save()
+        self._record(achievement_id)
 
     def _get_description(self, achievement_id: str) -> str:
         for achievement in ACHIEVEMENT_DEFS:
@@ -64,20 +88,31 @@ class AchievementManager:
         return achievement_id
 
     def _load(self) -> None:
-        if not self.storage_path.exists():
+        if self.storage_path is None or self._journal is None:
             return
-        try:
-            data = json.loads(self.storage_path.read_text(encoding="utf-8"))
-            if isinstance(data, list):
-                self.unlocked = set(str(item) for item in data)
-        except json.JSONDecodeError:
-            self.unlocked = set()
+        if self.storage_path.exists():
+            try:
+                data = json.loads(self.storage_path.read_text(encoding="utf-8"))
+                if isinstance(data, list):
+                    self.unlocked = set(str(item) for item in data)
+            except json.JSONDecodeError:
+                self.unlocked = set()
+        for record in self._journal.read():
+            if isinstance(record, dict) and "unlock" in record:
+                self.unlocked.add(str(record["unlock"]))
+
+    def _record(self, achievement_id: str) -> None:
+        if self._journal is None:
+            return
+        self._journal.append({"unlock": achievement_id})
+        if self._journal.entries >= JOURNAL_COMPACT_LIMIT:
+            self._save()
 
     def _save(self) -> None:
-        self.storage_path.write_text(
-            json.dumps(sorted(self.unlocked), ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        if self.storage_path is None or self._journal is None:
+            return
+        atomic_write_text(self.storage_path, dump_json(sorted(self.unlocked)))
+        self._journal.clear()
 
     def save(self) -> None:
         self._save()
@@ -1,9 +1,12 @@
 ﻿import random
-from typing import Iterator, Tuple
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
 
-from models import Enemy, Player, get_equipment_bonus
+from models import Enemy, Player
+from utils.events import EventKind
 from utils.io import safe_int
-from utils.logging import LogBook, log_print
+from utils.logging import LogBook, log_format, log_print
 
 
 DEFEND_DAMAGE_MULT: float = 0.5
@@ -19,196 +22,414 @@ BOSS_ENRAGE_THRESHOLD: float = 0.3
 BOSS_ENRAGE_BONUS: int = 2
 BOSS_GUARD_REDUCTION: float = 0.5
 BOSS_STUN_RESIST_MULT: float = 0.35
+BOSS_CHARGE_CHANCE: float = 0.25
+BOSS_GUARD_CHANCE: float = 0.25
+ESCAPE_CHANCE: float = 0.5
+POTION_HEAL: int = 8
+
+PLAYER_BLEED_LOG: str = "출혈로 {} 피해를 받았다."
+ENEMY_BLEED_LOG: str = "{}이(가) 출혈로 피해를 입습니다."
+HP_STATUS_LOG: str = "{} HP: {} | 내 HP: {}"
+ENEMY_STUNNED_LOG: str = "{}이(가) 기절해 움직이지 못합니다."
+ENEMY_STUN_APPLIED_LOG: str = "{}이(가) 잠시 기절합니다."
+PLAYER_HIT_LOG: str = "{}에게 {} 피해!"
+ENEMY_HIT_LOG: str = "{}의 공격! {} 피해를 받았다."
+POTION_HEAL_LOG: str = "포션을 사용해 체력 {} 회복!"
+
+ACTION_ATTACK: int = 1
+ACTION_DEFEND: int = 2
+ACTION_POTION: int = 3
+ACTION_RUN: int = 4
+ACTION_GUARD: int = 5
+
+
+@dataclass
+class BattleView:
+    turn: int
+    player_hp: int
+    player_max_hp: int
+    potions: int
+    enemy_name: str
+    enemy_hp: int
+    enemy_max_hp: int
+    is_boss: bool
+    boss_intent: str
+    boss_enraged: bool
+    next_attack_bonus: int
+    enemy_bleed_turns: int
+
+
+@dataclass
+class BattleResult:
+    winner: str
+    turns: int = 0
+    damage_dealt: int = 0
+    damage_taken: int = 0
+    potions_used: int = 0
+    statuses: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def won(self) -> bool:
+        return self.winner == "player"
+
+    @property
+    def escaped(self) -> bool:
+        return self.winner == "none"
+
+
+STEP_CONTINUE: int = 0
+STEP_PLAYER_DOWN: int = 1
+STEP_ENEMY_DOWN: int = 2
+STEP_ESCAPED: int = 3
+
+
+class CombatState:
+    __slots__ = (
+        "rng",
+        "turn",
+        "player_name",
+        "player_hp",
+        "player_max_hp",
+        "player_attack",
+        "player_defense",
+        "offense_weapon",
+        "potions",
+        "enemy_name",
+        "enemy_hp",
+        "enemy_max_hp",
+        "enemy_atk",
+        "is_boss",
+        "boss_intent",
+        "boss_enraged",
+        "boss_charging",
+        "boss_guarding",
+        "boss_charge_mult",
+        "boss_enrage_bonus",
+        "boss_guard_reduction",
+        "stun_chance",
+        "next_attack_bonus",
+        "defending",
+        "guarding",
+        "player_bleed_turns",
+        "enemy_bleed_turns",
+        "player_stunned",
+        "enemy_stunned",
+        "damage_dealt",
+        "damage_taken",
+        "potions_used",
+        "statuses",
+    )
 
+    def __init__(
+        self,
+        player: Player,
+        enemy: Enemy,
+        phase_two: bool = False,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.rng = rng or random
+        self.turn = 0
+        self.player_name = player.name
+        self.player_hp = player.hp
+        self.player_max_hp = player.max_hp
+        self.player_attack = player.total_atk
+        self.player_defense = player.total_defense
+        self.offense_weapon = player.weapon_tag == "OFFENSE"
+        self.potions = player.potions
+        self.enemy_name = enemy.name
+        self.enemy_hp = enemy.hp
+        self.enemy_max_hp = enemy.hp
+        self.enemy_atk = enemy.atk
+        self.is_boss = enemy.name == BOSS_NAME
+        self.boss_intent = "attack"
+        self.boss_enraged = False
+        self.boss_charging = False
+        self.boss_guarding = False
+        self.boss_charge_mult = BOSS_CHARGE_MULT * (1.3 if phase_two else 1.0)
+        self.boss_enrage_bonus = BOSS_ENRAGE_BONUS + (1 if phase_two else 0)
+        self.boss_guard_reduction = BOSS_GUARD_REDUCTION * (0.85 if phase_two else 1.0)
+        self.stun_chance = calculate_stun_chance(enemy.name)
+        if self.is_boss:
+            self.stun_chance *= BOSS_STUN_RESIST_MULT * (0.6 if phase_two else 1.0)
+        self.next_attack_bonus = 0
+        self.defending = False
+        self.guarding = False
+        self.player_bleed_turns = 0
+        self.enemy_bleed_turns = 0
+        self.player_stunned = False
+        self.enemy_stunned = False
+        self.damage_dealt = 0
+        self.damage_taken = 0
+        self.potions_used = 0
+        self.statuses: Dict[str, int] = {}
+
+    def result(self, status: int) -> "BattleResult":
+        if status == STEP_ENEMY_DOWN:
+            winner = "player"
+        elif status == STEP_ESCAPED:
+            winner = "none"
+        else:
+            winner = "enemy"
+        return BattleResult(
+            winner=winner,
+            turns=self.turn,
+            damage_dealt=self.damage_dealt,
+            damage_taken=self.damage_taken,
+            potions_used=self.potions_used,
+            statuses=self.statuses,
+        )
 
-def battle(player: Player, enemy: Enemy, logbook: LogBook, phase_two: bool = False) -> bool:
-    defending = False
-    guarding = False
-    next_attack_bonus = 0
-    boss_charging = False
-    boss_guarding = False
-    boss_enraged = False
-    boss_max_hp = enemy.hp
-    boss_intent = "attack"
-    player_bleed_turns = 0
-    enemy_bleed_turns = 0
-    player_stunned = False
-    enemy_stunned = False
-    boss_charge_mult = BOSS_CHARGE_MULT * (1.3 if phase_two else 1.0)
-    boss_enrage_bonus = BOSS_ENRAGE_BONUS + (1 if phase_two else 0)
-    boss_guard_reduction = BOSS_GUARD_REDUCTION * (0.85 if phase_two else 1.0)
-    boss_stun_mult = BOSS_STUN_RESIST_MULT * (0.6 if phase_two else 1.0)
-
-    while enemy.hp > 0 and player.hp > 0:
-        if player_bleed_turns > 0:
-            player.hp, player_bleed_turns = apply_bleed_tick(
-                player.hp, player_bleed_turns
-            )
-            log_print(logbook, f"출혈로 {BLEED_DAMAGE} 피해를 받았다.")
-            if player.hp <= 0:
-                break
-
-        if enemy_bleed_turns > 0:
-            enemy.hp, enemy_bleed_turns = apply_bleed_tick(enemy.hp, enemy_bleed_turns)
-            log_print(logbook, f"{enemy.name}이(가) 출혈로 피해를 입습니다.")
-            if enemy.hp <= 0:
-                break
-
-        log_print(logbook, f"{enemy.name} HP: {enemy.hp} | 내 HP: {player.hp}")
-        if enemy.name == BOSS_NAME:
-            if not boss_enraged and is_boss_enraged(enemy.hp, boss_max_hp):
-                boss_enraged = True
-                log_print(logbook, "폐허의 왕이 분노합니다!")
-            boss_intent, boss_charging, boss_guarding = boss_intent_state(
-                boss_charging
-            )
-            if boss_intent == "charge":
-                log_print(logbook, "폐허의 왕이 힘을 모으기 시작합니다.")
-            elif boss_intent == "guard":
-                log_print(logbook, "폐허의 왕이 방어 태세를 갖춥니다.")
-            elif boss_intent == "heavy":
-                log_print(logbook, "강력한 일격이 예고됩니다.")
 
-        if player_stunned:
-            log_print(logbook, "기절 상태로 행동하지 못했습니다.")
-            player_stunned = False
-        else:
-            print("1) 공격 2) 방어 3) 포션 4) 도망 5) 가드")
-            choice = safe_int("> ", 1, 5)
-
-            escaped = False
-            for line, defending, escaped, guarding, next_attack_bonus, bleed_applied in (
-                player_action_logs(
-                    player,
-                    enemy,
-                    choice,
-                    defending,
-                    guarding,
-                    next_attack_bonus,
-                    boss_guarding,
-                    boss_guard_reduction,
-                )
-            ):
-                log_print(logbook, line)
-            if bleed_applied:
-                enemy_bleed_turns = BLEED_TURNS
-            if escaped:
-                return False
-            if enemy.hp <= 0:
-                break
-
-        if enemy_stunned:
-            log_print(logbook, f"{enemy.name}이(가) 기절해 움직이지 못합니다.")
-            enemy_stunned = False
-        else:
-            last_damage = 0
-            attacked = False
-            for line, damage, did_attack in enemy_action_logs(
-                player,
-                enemy,
-                defending,
-                guarding,
-                boss_intent,
-                boss_enraged,
-                boss_charge_mult,
-                boss_enrage_bonus,
-            ):
-                log_print(logbook, line)
-                last_damage = damage
-                attacked = did_attack
-            if guarding and attacked and last_damage > 0:
-                stun_chance = calculate_stun_chance(enemy.name)
-                if enemy.name == BOSS_NAME:
-                    stun_chance *= boss_stun_mult
-                if random.random() < stun_chance:
-                    enemy_stunned = True
-                    log_print(logbook, f"{enemy.name}이(가) 잠시 기절합니다.")
-
-    return enemy.hp <= 0
-
-
-def player_action_logs(
-    player: Player,
-    enemy: Enemy,
-    action: int,
-    defending: bool,
-    guarding: bool,
-    next_attack_bonus: int,
-    boss_guarding: bool,
-    boss_guard_reduction: float = BOSS_GUARD_REDUCTION,
-) -> Iterator[Tuple[str, bool, bool, bool, int, bool]]:
-    bleed_applied = False
-    if action == 4:
-        if random.random() < 0.5:
-            yield "무사히 도망쳤습니다.", False, True, False, next_attack_bonus, False
-            return
-        yield "도망 실패!", False, False, False, next_attack_bonus, False
-        return
-
-    if action == 2:
-        yield "방어 자세를 취합니다.", True, False, False, next_attack_bonus, False
-        return
-
-    if action == 5:
-        yield "가드로 공격을 대비합니다.", False, False, True, GUARD_ATTACK_BONUS, False
-        return
-
-    if action == 3:
-        if player.potions > 0:
-            player.potions -= 1
-            heal = min(8, player.max_hp - player.hp)
-            player.hp += heal
-            yield (
-                f"포션을 사용해 체력 {heal} 회복!",
-                False,
-                False,
-                False,
-                next_attack_bonus,
-                False,
-            )
-        else:
-            yield "포션이 없습니다.", False, False, False, next_attack_bonus, False
-        return
+PolicyView = Union[BattleView, CombatState]
 
-    atk_bonus, _, _ = get_equipment_bonus(player)
-    damage = max(
-        1,
-        player.atk + player.weapon_level + atk_bonus + next_attack_bonus - enemy.atk // 4,
-    )
-    if boss_guarding:
-        damage = apply_boss_guard(damage, boss_guard_reduction)
-    enemy.hp -= damage
-    if player.weapon_tag == "OFFENSE" and random.random() < BLEED_CHANCE_OFFENSE:
-        bleed_applied = True
-    yield f"{enemy.name}에게 {damage} 피해!", False, False, False, 0, bleed_applied
+
+class CombatPolicy(ABC):
+    @abstractmethod
+    def choose(self, view: PolicyView) -> int:
+        ...
+
+
+class AlwaysAttackPolicy(CombatPolicy):
+    def choose(self, view: PolicyView) -> int:
+        return ACTION_ATTACK
+
+
+class GuardOnChargePolicy(CombatPolicy):
+    def __init__(self, fallback: Optional[CombatPolicy] = None) -> None:
+        self.fallback = fallback or AlwaysAttackPolicy()
+
+    def choose(self, view: PolicyView) -> int:
+        if view.is_boss and view.boss_intent == "heavy":
+            return ACTION_GUARD
+        return self.fallback.choose(view)
 
 
-def enemy_action_logs(
+class PotionBelowThresholdPolicy(CombatPolicy):
+    def __init__(self, threshold: int, fallback: Optional[CombatPolicy] = None) -> None:
+        self.threshold = threshold
+        self.fallback = fallback or AlwaysAttackPolicy()
+
+    def choose(self, view: PolicyView) -> int:
+        if view.potions > 0 and view.player_hp <= self.threshold:
+            return ACTION_POTION
+        return self.fallback.choose(view)
+
+
+class ScriptedPolicy(CombatPolicy):
+    def __init__(self, actions: Sequence[int], fallback: Optional[CombatPolicy] = None) -> None:
+        self.actions = list(actions)
+        self.fallback = fallback or AlwaysAttackPolicy()
+        self._index = 0
+
+    def choose(self, view: PolicyView) -> int:
+        if self._index < len(self.actions):
+            action = self.actions[self._index]
+            self._index += 1
+            return action
+        return self.fallback.choose(view)
+
+
+class CallbackPolicy(CombatPolicy):
+    def __init__(self, callback: Callable[[PolicyView], int]) -> None:
+        self.callback = callback
+
+    def choose(self, view: PolicyView) -> int:
+        return self.callback(view)
+
+
+class InteractivePolicy(CombatPolicy):
+    def choose(self, view: PolicyView) -> int:
+        print("1) 공격 2) 방어 3) 포션 4) 도망 5) 가드")
+        return safe_int("> ", 1, 5)
+
+
+def battle(player: Player, enemy: Enemy, logbook: LogBook, phase_two: bool = False) -> bool:
+    return run_battle(player, enemy, InteractivePolicy(), logbook, phase_two).won
+
+
+def run_battle(
     player: Player,
     enemy: Enemy,
-    defending: bool,
-    guarding: bool,
-    boss_intent: str,
-    boss_enraged: bool,
-    charge_mult: float = BOSS_CHARGE_MULT,
-    enrage_bonus: int = BOSS_ENRAGE_BONUS,
-) -> Iterator[Tuple[str, int, bool]]:
-    if enemy.name == BOSS_NAME and boss_intent == "charge":
-        yield "폐허의 왕이 힘을 응축하고 있습니다.", 0, False
-        return
-    _, def_bonus, _ = get_equipment_bonus(player)
-    raw_damage = max(1, enemy.atk - player.defense - player.armor_level - def_bonus)
-    if enemy.name == BOSS_NAME:
-        raw_damage += enrage_bonus if boss_enraged else 0
-        if boss_intent == "heavy":
-            raw_damage *= charge_mult
-    damage = apply_damage_reduction(raw_damage, defending, guarding)
-    player.hp -= damage
-    yield f"{enemy.name}의 공격! {damage} 피해를 받았다.", damage, True
-
-
-def boss_intent_state(charging: bool) -> Tuple[str, bool, bool]:
-    intent = resolve_boss_intent(charging, random.random())
+    policy: CombatPolicy,
+    logbook: Optional[LogBook] = None,
+    phase_two: bool = False,
+    rng: Optional[random.Random] = None,
+) -> BattleResult:
+    state = CombatState(player, enemy, phase_two, rng)
+    status = fight(state, policy, logbook)
+    player.hp = state.player_hp
+    player.potions = state.potions
+    enemy.hp = state.enemy_hp
+    return state.result(status)
+
+
+def fight(state: CombatState, policy: CombatPolicy, logbook: Optional[LogBook] = None) -> int:
+    if state.enemy_hp <= 0:
+        return STEP_ENEMY_DOWN
+    if state.player_hp <= 0:
+        return STEP_PLAYER_DOWN
+    while True:
+        status = begin_turn(state, logbook)
+        if status:
+            return status
+        if state.player_stunned:
+            if logbook is not None:
+                log_print(logbook, "기절 상태로 행동하지 못했습니다.")
+            state.player_stunned = False
+        else:
+            status = player_step(state, policy.choose(state), logbook)
+            if status:
+                return status
+        status = enemy_step(state, logbook)
+        if status:
+            return status
+
+
+def begin_turn(state: CombatState, logbook: Optional[LogBook] = None) -> int:
+    state.turn += 1
+    if state.player_bleed_turns > 0:
+        hp_after = max(0, state.player_hp - BLEED_DAMAGE)
+        state.damage_taken += state.player_hp - hp_after
+        state.player_hp = hp_after
+        state.player_bleed_turns -= 1
+        _count_status(state.statuses, "player_bleed_tick")
+        if logbook is not None:
+            log_format(logbook, PLAYER_BLEED_LOG, (BLEED_DAMAGE,))
+            logbook.emit(EventKind.BLEED_TICK, state.player_name, BLEED_DAMAGE)
+        if hp_after <= 0:
+            return STEP_PLAYER_DOWN
+
+    if state.enemy_bleed_turns > 0:
+        hp_after = max(0, state.enemy_hp - BLEED_DAMAGE)
+        state.damage_dealt += state.enemy_hp - hp_after
+        state.enemy_hp = hp_after
+        state.enemy_bleed_turns -= 1
+        _count_status(state.statuses, "enemy_bleed_tick")
+        if logbook is not None:
+            log_format(logbook, ENEMY_BLEED_LOG, (state.enemy_name,))
+            logbook.emit(EventKind.BLEED_TICK, state.enemy_name, BLEED_DAMAGE)
+        if hp_after <= 0:
+            return STEP_ENEMY_DOWN
+
+    if logbook is not None:
+        log_format(logbook, HP_STATUS_LOG, (state.enemy_name, state.enemy_hp, state.player_hp))
+    if state.is_boss:
+        if not state.boss_enraged and is_boss_enraged(state.enemy_hp, state.enemy_max_hp):
+            state.boss_enraged = True
+            _count_status(state.statuses, "boss_enraged")
+            if logbook is not None:
+                log_print(logbook, "폐허의 왕이 분노합니다!")
+        intent = resolve_boss_intent(state.boss_charging, state.rng.random())
+        state.boss_intent = intent
+        state.boss_charging = intent == "charge"
+        state.boss_guarding = intent == "guard"
+        if intent == "charge":
+            _count_status(state.statuses, "boss_charge")
+            if logbook is not None:
+                log_print(logbook, "폐허의 왕이 힘을 모으기 시작합니다.")
+                logbook.emit(EventKind.BOSS_CHARGE, state.enemy_name)
+        elif intent == "guard":
+            _count_status(state.statuses, "boss_guard")
+            if logbook is not None:
+                log_print(logbook, "폐허의 왕이 방어 태세를 갖춥니다.")
+        elif intent == "heavy":
+            _count_status(state.statuses, "boss_heavy")
+            if logbook is not None:
+                log_print(logbook, "강력한 일격이 예고됩니다.")
+    return STEP_CONTINUE
+
+
+def player_step(state: CombatState, action: int, logbook: Optional[LogBook] = None) -> int:
+    state.defending = False
+    state.guarding = False
+    if action == ACTION_RUN:
+        if state.rng.random() < ESCAPE_CHANCE:
+            if logbook is not None:
+                log_format(logbook, "무사히 도망쳤습니다.")
+            return STEP_ESCAPED
+        if logbook is not None:
+            log_format(logbook, "도망 실패!")
+        return STEP_CONTINUE
+
+    if action == ACTION_DEFEND:
+        state.defending = True
+        if logbook is not None:
+            log_format(logbook, "방어 자세를 취합니다.")
+        return STEP_CONTINUE
+
+    if action == ACTION_GUARD:
+        state.guarding = True
+        state.next_attack_bonus = GUARD_ATTACK_BONUS
+        if logbook is not None:
+            log_format(logbook, "가드로 공격을 대비합니다.")
+        return STEP_CONTINUE
+
+    if action == ACTION_POTION:
+        if state.potions > 0:
+            state.potions -= 1
+            state.potions_used += 1
+            heal = min(POTION_HEAL, state.player_max_hp - state.player_hp)
+            state.player_hp += heal
+            if logbook is not None:
+                log_format(logbook, POTION_HEAL_LOG, (heal,))
+        elif logbook is not None:
+            log_format(logbook, "포션이 없습니다.")
+        return STEP_CONTINUE
+
+    damage = max(1, state.player_attack + state.next_attack_bonus - state.enemy_atk // 4)
+    if state.boss_guarding:
+        damage = apply_boss_guard(damage, state.boss_guard_reduction)
+    state.enemy_hp -= damage
+    state.damage_dealt += damage
+    state.next_attack_bonus = 0
+    if state.offense_weapon and state.rng.random() < BLEED_CHANCE_OFFENSE:
+        state.enemy_bleed_turns = BLEED_TURNS
+        _count_status(state.statuses, "bleed_applied")
+    if logbook is not None:
+        log_format(logbook, PLAYER_HIT_LOG, (state.enemy_name, damage))
+    if state.enemy_hp <= 0:
+        return STEP_ENEMY_DOWN
+    return STEP_CONTINUE
+
+
+def enemy_step(state: CombatState, logbook: Optional[LogBook] = None) -> int:
+    if state.enemy_stunned:
+        if logbook is not None:
+            log_format(logbook, ENEMY_STUNNED_LOG, (state.enemy_name,))
+            logbook.emit(EventKind.ENEMY_STUNNED, state.enemy_name)
+        state.enemy_stunned = False
+        return STEP_CONTINUE
+
+    if state.is_boss and state.boss_intent == "charge":
+        if logbook is not None:
+            log_format(logbook, "폐허의 왕이 힘을 응축하고 있습니다.")
+        return STEP_CONTINUE
+    raw_damage = max(1, state.enemy_atk - state.player_defense)
+    if state.is_boss:
+        raw_damage += state.boss_enrage_bonus if state.boss_enraged else 0
+        if state.boss_intent == "heavy":
+            raw_damage *= state.boss_charge_mult
+    damage = apply_damage_reduction(raw_damage, state.defending, state.guarding)
+    state.player_hp -= damage
+    state.damage_taken += damage
+    if logbook is not None:
+        log_format(logbook, ENEMY_HIT_LOG, (state.enemy_name, damage))
+    if state.guarding and state.rng.random() < state.stun_chance:
+        state.enemy_stunned = True
+        _count_status(state.statuses, "enemy_stunned")
+        if logbook is not None:
+            log_format(logbook, ENEMY_STUN_APPLIED_LOG, (state.enemy_name,))
+    if state.player_hp <= 0:
+        return STEP_PLAYER_DOWN
+    return STEP_CONTINUE
+
+
+def _count_status(statuses: Dict[str, int], status: str) -> None:
+    statuses[status] = statuses.get(status, 0) + 1
+
+
+def boss_intent_state(charging: bool, rng: Optional[random.Random] = None) -> Tuple[str, bool, bool]:
+    intent = resolve_boss_intent(charging, (rng or random).random())
     if intent == "charge":
         return intent, True, False
     if intent == "guard":
@@ -221,9 +442,9 @@ def boss_intent_state(charging: bool) -> Tuple[str, bool, bool]:
 def resolve_boss_intent(charging: bool, roll: float) -> str:
     if charging:
         return "heavy"
-    if roll < 0.25:
+    if roll < BOSS_CHARGE_CHANCE:
         return "charge"
-    if roll < 0.5:
+    if roll < BOSS_CHARGE_CHANCE + BOSS_GUARD_CHANCE:
         return "guard"
     return "attack"
 
@@ -1,14 +1,101 @@
-from typing import Dict, List
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Set, Tuple
 
-from models import CRAFT_RECIPES, EQUIPMENT_ITEMS, Equipment, Player
+from models import CRAFT_RECIPES, EQUIPMENT_ITEMS, Equipment, MaterialBag, Player
+from systems.dex import discover_equipment
+from utils.events import EventKind
 from utils.logging import LogBook, log_print
 
 
+RecipeIndex = Dict[str, Tuple[Tuple[str, int], ...]]
+
+CRAFTED_LOG: str = "제작 완료: {}"
+
+
+@dataclass
+class CraftBatchResult:
+    crafted: Dict[str, int] = field(default_factory=dict)
+    consumed: Dict[str, int] = field(default_factory=dict)
+    missing: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing
+
+    @property
+    def total(self) -> int:
+        return sum(self.crafted.values())
+
+
+@lru_cache(maxsize=None)
+def recipe_index() -> RecipeIndex:
+    index: Dict[str, List[Tuple[str, int]]] = {}
+    for item_name, recipe in CRAFT_RECIPES.items():
+        for material, count in recipe.items():
+            index.setdefault(material, []).append((item_name, count))
+    return {material: tuple(entries) for material, entries in index.items()}
+
+
+@lru_cache(maxsize=None)
+def recipe_order() -> Dict[str, int]:
+    return {item_name: position for position, item_name in enumerate(CRAFT_RECIPES)}
+
+
+class CraftTracker:
+    def __init__(self, materials: Dict[str, int]) -> None:
+        self.index = recipe_index()
+        self.order = recipe_order()
+        self.missing: Dict[str, int] = {}
+        self.craftable: Set[str] = set()
+        for item_name, recipe in CRAFT_RECIPES.items():
+            missing = sum(max(0, count - materials.get(name, 0)) for name, count in recipe.items())
+            self.missing[item_name] = missing
+            if missing == 0:
+                self.craftable.add(item_name)
+
+    def material_changed(self, name: str, old: int, new: int) -> None:
+        for item_name, count in self.index.get(name, ()):
+            delta = max(0, count - new) - max(0, count - old)
+            if not delta:
+                continue
+            missing = self.missing[item_name] + delta
+            self.missing[item_name] = missing
+            if missing == 0:
+                self.craftable.add(item_name)
+            else:
+                self.craftable.discard(item_name)
+
+    def is_craftable(self, item_name: str) -> bool:
+        return item_name in self.craftable
+
+    def craftable_items(self) -> List[str]:
+        return sorted(self.craftable, key=self.order.__getitem__)
+
+
+def craft_tracker(materials: MaterialBag) -> CraftTracker:
+    for listener in materials.listeners:
+        if isinstance(listener, CraftTracker):
+            return listener
+    tracker = CraftTracker(materials)
+    materials.subscribe(tracker)
+    return tracker
+
+
 def can_craft(materials: Dict[str, int], recipe: Dict[str, int]) -> bool:
     return all(materials.get(name, 0) >= count for name, count in recipe.items())
 
 
+def is_craftable(materials: Dict[str, int], item_name: str) -> bool:
+    if isinstance(materials, MaterialBag):
+        return craft_tracker(materials).is_craftable(item_name)
+    recipe = CRAFT_RECIPES.get(item_name)
+    return bool(recipe) and can_craft(materials, recipe)
+
+
 def list_craftable(materials: Dict[str, int]) -> List[str]:
+    if isinstance(materials, MaterialBag):
+        return craft_tracker(materials).craftable_items()
     craftable: List[str] = []
     for item_name, recipe in CRAFT_RECIPES.items():
         if can_craft(materials, recipe):
@@ -24,22 +111,70 @@ def get_equipment(item_name: str) -> Equipment:
     return EQUIPMENT_ITEMS[item_name]
 
 
+def missing_materials(materials: Dict[str, int], requirements: Mapping[str, int]) -> Dict[str, int]:
+    return {
+        name: count - materials.get(name, 0)
+        for name, count in requirements.items()
+        if materials.get(name, 0) < count
+    }
+
+
+def take_materials(materials: Dict[str, int], requirements: Mapping[str, int]) -> bool:
+    if missing_materials(materials, requirements):
+        return False
+    for name, count in requirements.items():
+        if count:
+            materials[name] -= count
+    return True
+
+
+def batch_requirements(orders: Mapping[str, int]) -> Dict[str, int]:
+    requirements: Dict[str, int] = {}
+    for item_name, count in orders.items():
+        recipe = CRAFT_RECIPES.get(item_name)
+        if recipe is None:
+            raise ValueError(f"Unknown recipe: {item_name}")
+        for material, amount in recipe.items():
+            requirements[material] = requirements.get(material, 0) + amount * count
+    return requirements
+
+
+def craft_batch(player: Player, orders: Mapping[str, int], logbook: LogBook) -> CraftBatchResult:
+    orders = {item_name: count for item_name, count in orders.items() if count > 0}
+    requirements = batch_requirements(orders)
+    missing = missing_materials(player.materials, requirements)
+    if missing:
+        log_print(logbook, "재료가 부족합니다.")
+        return CraftBatchResult(missing=missing)
+    take_materials(player.materials, requirements)
+    for item_name, count in orders.items():
+        item = EQUIPMENT_ITEMS[item_name]
+        if item.slot == "weapon":
+            player.weapons_owned.extend([item.name] * count)
+            if not player.weapon_item:
+                player.weapon_item = item.name
+        else:
+            player.armors_owned.extend([item.name] * count)
+            if not player.armor_item:
+                player.armor_item = item.name
+    if orders:
+        summary = ", ".join(name if count == 1 else f"{name} x{count}" for name, count in orders.items())
+        log_print(logbook, CRAFTED_LOG.format(summary))
+    for item_name, count in orders.items():
+        logbook.emit(EventKind.CRAFTED, item_name, count)
+        discover_equipment(player, logbook, item_name)
+    return CraftBatchResult(crafted=orders, consumed=requirements)
+
+
+def craft_items(player: Player, item_names: Iterable[str], logbook: LogBook) -> CraftBatchResult:
+    orders: Dict[str, int] = {}
+    for item_name in item_names:
+        orders[item_name] = orders.get(item_name, 0) + 1
+    return craft_batch(player, orders, logbook)
+
+
 def craft_item(player: Player, item_name: str, logbook: LogBook) -> bool:
-    recipe = CRAFT_RECIPES.get(item_name)
-    if not recipe or not can_craft(player.materials, recipe):
+    if item_name not in CRAFT_RECIPES:
         log_print(logbook, "재료가 부족합니다.")
         return False
-    for material, count in recipe.items():
-        player.materials[material] -= count
-    item = EQUIPMENT_ITEMS[item_name]
-    if item.slot == "weapon":
-        player.weapons_owned.append(item.name)
-        if not player.weapon_item:
-            player.weapon_item = item.name
-    else:
-        player.armors_owned.append(item.name)
-        if not player.armor_item:
-            player.armor_item = item.name
-    log_print(logbook, f"제작 완료: {item.name}")
-    logbook.add(f"DISCOVER_EQUIP:{item.name}")
-    return True
+    return craft_batch(player, {item_name: 1}, logbook).ok
@@ -1,13 +1,15 @@
 from typing import Iterable, Set, Tuple
 
 from models import EQUIPMENT_ITEMS, MONSTER_LIST, Player
-from utils.logging import LogBook, log_print
+from utils.events import GOLD_DEX, EventKind
+from utils.logging import LogBook, LogCursor, log_print
 
 
 MATERIAL_PREFIX: str = "DISCOVER_MATERIAL:"
 EQUIP_PREFIX: str = "DISCOVER_EQUIP:"
 MONSTER_PREFIX: str = "DISCOVER_MONSTER:"
 BOSS_PREFIX: str = "KILL_BOSS:"
+REWARD_PREFIX: str = "DEX_REWARD:"
 MATERIAL_REWARD_LOG: str = "도감 보상: 재료 도감 완성"
 MATERIAL_REWARD_GOLD: int = 8
 EQUIPMENT_REWARD_LOG: str = "도감 보상: 장비 도감 완성"
@@ -24,9 +26,12 @@ class DexManager:
         self.materials: Set[str] = set(materials or [])
         self.equipment: Set[str] = set(equipment or [])
         self.monsters: Set[str] = set(monsters or [])
+        self._cursor: LogCursor[str] = LogCursor(
+            prefixes=(MATERIAL_PREFIX, EQUIP_PREFIX, MONSTER_PREFIX, BOSS_PREFIX)
+        )
 
     def process(self, logbook: LogBook) -> None:
-        for line in logbook.entries:
+        for line in self._cursor.read(logbook):
             self._apply_line(line)
 
     def _apply_line(self, line: str) -> None:
@@ -48,11 +53,22 @@ class DexManager:
         self.materials = set(materials)
         self.equipment = set(equipment)
         self.monsters = set(monsters)
+        self._cursor.reset()
 
     def get_state(self) -> Tuple[Set[str], Set[str], Set[str]]:
         return self.materials, self.equipment, self.monsters
 
 
+def discover_material(player: Player, logbook: LogBook, name: str) -> None:
+    player.world.discover_material(name)
+    logbook.add(f"{MATERIAL_PREFIX}{name}")
+
+
+def discover_equipment(player: Player, logbook: LogBook, name: str) -> None:
+    player.world.discover_equipment(name)
+    logbook.add(f"{EQUIP_PREFIX}{name}")
+
+
 def build_material_catalog(player: Player) -> Iterable[str]:
     return list(player.materials.keys())
 
@@ -68,30 +84,34 @@ def build_monster_catalog() -> Iterable[str]:
 def apply_material_completion_reward(
     player: Player, dex_manager: DexManager, logbook: LogBook
 ) -> None:
-    if any(MATERIAL_REWARD_LOG in line for line in logbook.entries):
+    if logbook.has_marker(f"{REWARD_PREFIX}MATERIAL"):
         return
     catalog = set(build_material_catalog(player))
     if not catalog:
         return
     if catalog.issubset(dex_manager.materials):
         player.gold += MATERIAL_REWARD_GOLD
+        logbook.emit(EventKind.GOLD_GAINED, GOLD_DEX, MATERIAL_REWARD_GOLD)
         log_print(
             logbook,
             f"{MATERIAL_REWARD_LOG} (+{MATERIAL_REWARD_GOLD} 골드)",
         )
+        logbook.add(f"{REWARD_PREFIX}MATERIAL")
 
 
 def apply_equipment_completion_reward(
     player: Player, dex_manager: DexManager, logbook: LogBook
 ) -> None:
-    if any(EQUIPMENT_REWARD_LOG in line for line in logbook.entries):
+    if logbook.has_marker(f"{REWARD_PREFIX}EQUIPMENT"):
         return
     catalog = set(build_equipment_catalog())
     if not catalog:
         return
     if catalog.issubset(dex_manager.equipment):
         player.gold += EQUIPMENT_REWARD_GOLD
+        logbook.emit(EventKind.GOLD_GAINED, GOLD_DEX, EQUIPMENT_REWARD_GOLD)
         log_print(
             logbook,
             f"{EQUIPMENT_REWARD_LOG} (+{EQUIPMENT_REWARD_GOLD} 골드)",
         )
+        logbook.add(f"{REWARD_PREFIX}EQUIPMENT")
@@ -1,12 +1,34 @@
 import asyncio
 import random
-from typing import Dict, List, Optional, Tuple
-
-from models import DROP_TABLE, Enemy, EQUIPMENT_ITEMS, MONSTER_TEMPLATES, Player, get_equipment_bonus
-from systems.combat import battle
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from models import (
+    DROP_TABLE,
+    EQUIPMENT_ITEMS,
+    MATERIAL_NAMES,
+    MONSTER_TEMPLATES,
+    Enemy,
+    Player,
+    WorldState,
+)
+from systems.combat import run_battle
+from systems.dex import discover_material
+from systems.strategy import InteractiveStrategy, Strategy
 from systems.town import blacksmith_event, merchant_event
+from utils.events import GOLD_COMBAT, EventKind
 from utils.io import safe_int
-from utils.logging import LogBook, log_print
+from utils.logging import LogBook, log_format, log_print
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+MonsterTemplate = Tuple[str, int, int, int, int, str, str]
 
 
 REGION_TABLE: Dict[str, Dict[str, float]] = {
@@ -49,7 +71,7 @@ REGION_DROPS: Dict[str, List[Tuple[str, float]]] = {
     "폐허 심층": [("왕의 심장석", 0.8), ("심연의 잔재", 0.5)],
 }
 
-REGION_MONSTERS: Dict[str, List[Tuple[str, int, int, int, int, str, str]]] = {
+REGION_MONSTERS: Dict[str, List[MonsterTemplate]] = {
     "초원": MONSTER_TEMPLATES,
     "동굴": [
         ("석굴 박쥐", 11, 4, 6, 4, "날카로운 울음으로 혼을 흔든다", "깃털 조각"),
@@ -68,7 +90,7 @@ REGION_MONSTERS: Dict[str, List[Tuple[str, int, int, int, int, str, str]]] = {
     ],
 }
 
-BOSS_TEMPLATE: Tuple[str, int, int, int, int, str, str] = (
+BOSS_TEMPLATE: MonsterTemplate = (
     "폐허의 왕",
     28,
     9,
@@ -78,6 +100,15 @@ BOSS_TEMPLATE: Tuple[str, int, int, int, int, str, str] = (
     "왕의 심장석",
 )
 
+TRUE_ENDING_REGIONS: Tuple[str, ...] = ("초원", "동굴", "폐허")
+TRUE_ENDING_DEX_RATIO: float = 0.8
+# (log fragment, ending line) in priority order
+BOSS_TACTICS_LINES: Tuple[Tuple[str, str], ...] = (
+    ("??? ??? ?????.", "??? ?? ?? ???? ??? ?????."),
+    ("??", "??? ??? ??? ??????."),
+    ("??", "??? ??? ??? ??????."),
+)
+
 BOSS_ENTRY_LEVEL: int = 6
 BOSS_ENTRY_GEAR: int = 2
 BOSS_ENTRY_POTIONS: int = 4
@@ -92,9 +123,31 @@ LEVEL_UP_DEF_GAIN: int = 1
 LEVEL_UP_HP_GAIN: int = 5
 LEVEL_UP_EXPLORE_GAIN: float = 0.05
 
+ENCOUNTER_LOG: str = "{}을(를) 만났다!{}"
+VICTORY_LOG: str = "전투 승리! 경험치 {}, 골드 {} 획득!"
+TROPHY_LOG: str = "전리품 획득: {}"
+LEVEL_UP_LOG: str = "레벨업! 현재 레벨 {}."
+MATERIAL_GAINED_LOG: str = "재료 획득: {} +1"
 
-def explore_intro(logbook: LogBook) -> None:
-    line = random.choice(
+REGION_TABLE_CACHE_SIZE: int = 256
+EVENT_NONE: int = 0
+EVENT_MERCHANT: int = 1
+EVENT_BLACKSMITH: int = 2
+EVENT_NAMES: Tuple[str, ...] = ("none", "merchant", "blacksmith")
+
+_TURN_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+@dataclass
+class TurnBatch:
+    encounters: Sequence[Any]
+    monsters: Sequence[Any]
+    drops: Sequence[Any]
+    events: Sequence[Any]
+
+
+def explore_intro(logbook: LogBook, rng: Optional[random.Random] = None) -> None:
+    line = (rng or random).choice(
         [
             "먼지와 풀내음이 섞인 바람이 스친다.",
             "갑옷이 부딪히며 작은 쇳소리가 난다.",
@@ -122,20 +175,25 @@ def select_region(player: Player) -> str:
 
 
 def reward_multiplier(region: str, depth: int, player: Player) -> float:
+    return region_reward_multiplier(region, depth, get_explore_bonus_total(player))
+
+
+def region_reward_multiplier(region: str, depth: int, explore_bonus: float) -> float:
     base = REGION_REWARD.get(region, 1.0)
     depth_bonus = DEPTH_MULT_BASE + DEPTH_MULT_STEP * max(0, depth - 1)
     depth_bonus = min(depth_bonus, DEPTH_MULT_MAX)
-    explore_bonus = 1.0 + get_explore_bonus_total(player)
-    return base * depth_bonus * explore_bonus
+    return base * depth_bonus * (1.0 + explore_bonus)
 
 
-def maybe_add_bonus_drop(region: str, depth: int, drops: List[str]) -> None:
+def maybe_add_bonus_drop(
+    region: str, depth: int, drops: List[str], rng: Optional[random.Random] = None
+) -> None:
     if not bonus_drop_allowed(region, depth):
         return
+    rng = rng or random
     bonus_chance = 0.1 * max(0, depth - 1)
-    if random.random() < bonus_chance:
-        table = REGION_DROPS.get(region, DROP_TABLE)
-        drops.append(random.choice([name for name, _ in table]))
+    if rng.random() < bonus_chance:
+        drops.append(rng.choice(region_table(region).drop_names))
 
 
 def should_continue(region: str, depth: int) -> bool:
@@ -163,111 +221,215 @@ def can_enter_boss(player: Player) -> Tuple[bool, str]:
 def bonus_drop_allowed(region: str, depth: int) -> bool:
     return region in BONUS_DROP_ALLOWED_REGIONS and depth >= BONUS_DROP_MIN_DEPTH
 
-def is_region_conquered(logbook: LogBook, region: str) -> bool:
-    marker = f"{CONQUEST_LOG_PREFIX}{region}"
-    return marker in logbook.entries
-
-def get_conquest_bonus(region: str, logbook: LogBook) -> Optional[Tuple[str, float]]:
-    if is_region_conquered(logbook, region):
+def world_conquest_bonus(world: WorldState, region: str) -> Optional[Tuple[str, float]]:
+    if world.is_conquered(region):
         return REGION_CONQUEST_BONUS.get(region)
     return None
 
 
-def true_ending_ready(player: Player, logbook: LogBook) -> bool:
-    conquered = all(
-        is_region_conquered(logbook, region) for region in ("초원", "동굴", "폐허")
-    )
-    if not conquered:
-        return False
-    materials_found = {
-        line[len("DISCOVER_MATERIAL:") :].strip()
-        for line in logbook.entries
-        if line.startswith("DISCOVER_MATERIAL:")
-    }
-    equipment_found = {
-        line[len("DISCOVER_EQUIP:") :].strip()
-        for line in logbook.entries
-        if line.startswith("DISCOVER_EQUIP:")
-    }
-    total = len(player.materials) + len(EQUIPMENT_ITEMS)
-    found = len(materials_found) + len(equipment_found)
-    dex_ratio = found / total if total else 0.0
-    boss_cleared = any(
-        line == "KILL_BOSS:폐허의 왕" for line in logbook.entries
+def true_ending_ready(player: Player) -> bool:
+    world = player.world
+    return (
+        all(world.is_conquered(region) for region in TRUE_ENDING_REGIONS)
+        and world.dex_ratio >= TRUE_ENDING_DEX_RATIO
+        and world.has_killed(BOSS_TEMPLATE[0])
     )
-    return dex_ratio >= 0.8 and boss_cleared
 
 
-async def roll_encounter(region: str) -> Optional[Enemy]:
-    await asyncio.sleep(0.05)
-    chance = REGION_TABLE[region]["encounter"]
-    if random.random() < chance:
-        if region == "폐허 심층":
-            name, hp, atk, exp_reward, gold_reward, desc, trophy = BOSS_TEMPLATE
+class RegionTable:
+    __slots__ = (
+        "region",
+        "encounter_chance",
+        "is_boss_region",
+        "prototypes",
+        "drop_names",
+        "drop_thresholds",
+        "blacksmith_cutoff",
+        "merchant_cutoff",
+    )
+
+    def __init__(self, region: str, explore_bonus: float = 0.0, bonus: Optional[Tuple[str, float]] = None) -> None:
+        events = REGION_TABLE[region]
+        table = REGION_DROPS.get(region, DROP_TABLE)
+        self.region = region
+        self.encounter_chance = events["encounter"]
+        self.is_boss_region = region == "폐허 심층"
+        if self.is_boss_region:
+            self.prototypes: Tuple[MonsterTemplate, ...] = (BOSS_TEMPLATE,)
         else:
-            name, hp, atk, exp_reward, gold_reward, desc, trophy = random.choice(
-                REGION_MONSTERS[region]
-            )
-        return Enemy(
-            name=name,
-            hp=hp,
-            atk=atk,
-            exp_reward=exp_reward,
-            gold_reward=gold_reward,
-            description=desc,
-            trophy=trophy,
+            self.prototypes = tuple(REGION_MONSTERS.get(region, ()))
+        self.drop_names: Tuple[str, ...] = tuple(name for name, _ in table)
+        thresholds = [(name, min(0.95, chance + explore_bonus)) for name, chance in table]
+        if bonus:
+            thresholds.append((bonus[0], min(0.95, bonus[1])))
+        self.drop_thresholds: Tuple[Tuple[str, float], ...] = tuple(thresholds)
+        self.blacksmith_cutoff = events["blacksmith"]
+        self.merchant_cutoff = events["merchant"]
+
+    def encounter(self, rng: Optional[random.Random] = None) -> Optional[Enemy]:
+        rng = rng or random
+        if rng.random() >= self.encounter_chance:
+            return None
+        if self.is_boss_region:
+            return Enemy(*self.prototypes[0])
+        return Enemy(*rng.choice(self.prototypes))
+
+    def drops(self, rng: Optional[random.Random] = None) -> List[str]:
+        roll = (rng or random).random
+        return [name for name, threshold in self.drop_thresholds if roll() < threshold]
+
+    def event(self, rng: Optional[random.Random] = None) -> str:
+        roll = (rng or random).random()
+        if roll < self.blacksmith_cutoff:
+            return "blacksmith"
+        if roll < self.merchant_cutoff:
+            return "merchant"
+        return "none"
+
+    def roll(self, rng: Optional[random.Random] = None) -> Tuple[Optional[Enemy], List[str], str]:
+        enemy = self.encounter(rng)
+        return enemy, self.drops(rng), self.event(rng)
+
+    def sample_turns(self, count: int, rng: Optional[random.Random] = None) -> List[Tuple[Optional[Enemy], List[str], str]]:
+        return [self.roll(rng) for _ in range(count)]
+
+    def sample_batch(self, count: int, seed: Optional[int] = None) -> TurnBatch:
+        if np is None:
+            rng = random.Random(seed)
+            encounters = [rng.random() < self.encounter_chance for _ in range(count)]
+            monsters = [rng.randrange(len(self.prototypes)) for _ in range(count)]
+            drops = [[rng.random() < threshold for _, threshold in self.drop_thresholds] for _ in range(count)]
+            events = [self._event_code(rng.random()) for _ in range(count)]
+            return TurnBatch(encounters, monsters, drops, events)
+        generator = np.random.default_rng(seed)
+        thresholds = np.array([threshold for _, threshold in self.drop_thresholds])
+        event_rolls = generator.random(count)
+        events = np.where(
+            event_rolls < self.blacksmith_cutoff,
+            EVENT_BLACKSMITH,
+            np.where(event_rolls < self.merchant_cutoff, EVENT_MERCHANT, EVENT_NONE),
+        )
+        return TurnBatch(
+            encounters=generator.random(count) < self.encounter_chance,
+            monsters=generator.integers(0, len(self.prototypes), count),
+            drops=generator.random((count, len(thresholds))) < thresholds,
+            events=events,
         )
-    return None
 
+    def _event_code(self, roll: float) -> int:
+        if roll < self.blacksmith_cutoff:
+            return EVENT_BLACKSMITH
+        if roll < self.merchant_cutoff:
+            return EVENT_MERCHANT
+        return EVENT_NONE
 
-async def roll_drops(region: str, explore_bonus: float, bonus: Optional[Tuple[str, float]] = None) -> List[str]:
-    await asyncio.sleep(0.05)
-    drops: List[str] = []
-    for name, chance in REGION_DROPS.get(region, DROP_TABLE):
-        adjusted = min(0.95, chance + explore_bonus)
-        if random.random() < adjusted:
-            drops.append(name)
-    if bonus:
-        bonus_name, bonus_chance = bonus
-        adjusted = min(0.95, bonus_chance)
-        if random.random() < adjusted:
-            drops.append(bonus_name)
-    return drops
-
-
-async def roll_event(region: str) -> str:
-    await asyncio.sleep(0.05)
-    roll = random.random()
-    if roll < REGION_TABLE[region]["blacksmith"]:
-        return "blacksmith"
-    if roll < REGION_TABLE[region]["merchant"]:
-        return "merchant"
-    return "none"
-
-
-async def resolve_explore_turn(region: str, explore_bonus: float, bonus: Optional[Tuple[str, float]] = None) -> Tuple[Optional[Enemy], List[str], str]:
-    results = await asyncio.gather(
-        roll_encounter(region),
-        roll_drops(region, explore_bonus, bonus),
-        roll_event(region),
-    )
-    return results[0], results[1], results[2]
 
+@lru_cache(maxsize=REGION_TABLE_CACHE_SIZE)
+def region_table(region: str, explore_bonus: float = 0.0, bonus: Optional[Tuple[str, float]] = None) -> RegionTable:
+    return RegionTable(region, explore_bonus, bonus)
 
-def exploration(player: Player, logbook: LogBook) -> None:
+
+def encounter_for(region: str, rng: Optional[random.Random] = None) -> Optional[Enemy]:
+    return region_table(region).encounter(rng)
+
+
+def drops_for(
+    region: str,
+    explore_bonus: float,
+    bonus: Optional[Tuple[str, float]] = None,
+    rng: Optional[random.Random] = None,
+) -> List[str]:
+    return region_table(region, explore_bonus, bonus).drops(rng)
+
+
+def event_for(region: str, rng: Optional[random.Random] = None) -> str:
+    return region_table(region).event(rng)
+
+
+def resolve_turn(
+    region: str,
+    explore_bonus: float,
+    bonus: Optional[Tuple[str, float]] = None,
+    rng: Optional[random.Random] = None,
+) -> Tuple[Optional[Enemy], List[str], str]:
+    return region_table(region, explore_bonus, bonus).roll(rng)
+
+
+async def roll_encounter(region: str, delay: float = 0.0, rng: Optional[random.Random] = None) -> Optional[Enemy]:
+    if delay > 0:
+        await asyncio.sleep(delay)
+    return encounter_for(region, rng)
+
+
+async def roll_drops(
+    region: str,
+    explore_bonus: float,
+    bonus: Optional[Tuple[str, float]] = None,
+    delay: float = 0.0,
+    rng: Optional[random.Random] = None,
+) -> List[str]:
+    if delay > 0:
+        await asyncio.sleep(delay)
+    return drops_for(region, explore_bonus, bonus, rng)
+
+
+async def roll_event(region: str, delay: float = 0.0, rng: Optional[random.Random] = None) -> str:
+    if delay > 0:
+        await asyncio.sleep(delay)
+    return event_for(region, rng)
+
+
+async def resolve_explore_turn(
+    region: str,
+    explore_bonus: float,
+    bonus: Optional[Tuple[str, float]] = None,
+    delay: float = 0.0,
+    rng: Optional[random.Random] = None,
+) -> Tuple[Optional[Enemy], List[str], str]:
+    if delay > 0:
+        await asyncio.sleep(delay)
+    return resolve_turn(region, explore_bonus, bonus, rng)
+
+
+def turn_loop() -> asyncio.AbstractEventLoop:
+    global _TURN_LOOP
+    if _TURN_LOOP is None or _TURN_LOOP.is_closed():
+        _TURN_LOOP = asyncio.new_event_loop()
+    return _TURN_LOOP
+
+
+def run_explore_turn(
+    region: str,
+    explore_bonus: float,
+    bonus: Optional[Tuple[str, float]] = None,
+    delay: float = 0.0,
+    rng: Optional[random.Random] = None,
+) -> Tuple[Optional[Enemy], List[str], str]:
+    if delay <= 0:
+        return resolve_turn(region, explore_bonus, bonus, rng)
+    return turn_loop().run_until_complete(resolve_explore_turn(region, explore_bonus, bonus, delay, rng))
+
+
+def exploration(
+    player: Player,
+    logbook: LogBook,
+    strategy: Optional[Strategy] = None,
+    rng: Optional[random.Random] = None,
+) -> None:
+    strategy = strategy or InteractiveStrategy()
+    world = player.world
     log_print(logbook, "탐험을 시작합니다...")
-    explore_intro(logbook)
-    region = select_region(player)
+    explore_intro(logbook, rng)
+    region = strategy.choose_region(player)
 
     log_print(logbook, REGION_TRAITS.get(region, ""))
     true_ending_active = False
-    if region == "폐허 심층" and true_ending_ready(player, logbook):
+    if region == "폐허 심층" and true_ending_ready(player):
         log_print(logbook, "균열이 열린다.")
-        if "TRUE_ENDING_UNLOCKED" not in logbook.entries:
+        if not world.true_ending_unlocked:
+            world.true_ending_unlocked = True
             logbook.add("TRUE_ENDING_UNLOCKED")
-        print("1) 진엔딩 전투 진입 2) 철수")
-        choice = safe_int("> ", 1, 2)
-        if choice == 2:
+        if not strategy.enter_true_ending(player):
             log_print(logbook, "균열 앞에서 물러섭니다.")
             log_print(logbook, "마을로 돌아갑니다...")
             return
@@ -278,19 +440,21 @@ def exploration(player: Player, logbook: LogBook) -> None:
 
     depth = 1
     while True:
-        enemy, drops, event = asyncio.run(
-            resolve_explore_turn(region, get_explore_bonus_total(player), get_conquest_bonus(region, logbook))
+        if strategy.turn_delay > 0:
+            time.sleep(strategy.turn_delay)
+        enemy, drops, event = resolve_turn(
+            region, get_explore_bonus_total(player), world_conquest_bonus(world, region), rng
         )
-        maybe_add_bonus_drop(region, depth, drops)
+        maybe_add_bonus_drop(region, depth, drops, rng)
         multiplier = reward_multiplier(region, depth, player)
 
         if enemy is None:
             log_print(logbook, "주변이 조용합니다. 전투가 발생하지 않았습니다.")
         else:
             detail = f" - {enemy.description}" if enemy.description else ""
-            log_print(logbook, f"{enemy.name}을(를) 만났다!{detail}")
+            log_format(logbook, ENCOUNTER_LOG, (enemy.name, detail))
             logbook.add(f"DISCOVER_MONSTER:{enemy.name}")
-            won = battle(player, enemy, logbook)
+            won = run_battle(player, enemy, strategy.combat_policy, logbook, rng=rng).won
             if won:
                 if region == "폐허 심층" and true_ending_active:
                     log_print(logbook, "균열이 갈라지며 폐허의 왕이 다시 일어선다.")
@@ -303,7 +467,9 @@ def exploration(player: Player, logbook: LogBook) -> None:
                         description=enemy.description,
                         trophy=enemy.trophy,
                     )
-                    won = battle(player, phase_enemy, logbook, phase_two=True)
+                    won = run_battle(
+                        player, phase_enemy, strategy.combat_policy, logbook, phase_two=True, rng=rng
+                    ).won
                     if not won:
                         log_print(logbook, "패배했습니다. 마을로 돌아갑니다.")
                         break
@@ -311,16 +477,15 @@ def exploration(player: Player, logbook: LogBook) -> None:
                 gold_reward = max(1, int(enemy.gold_reward * multiplier))
                 player.exp += exp_reward
                 player.gold += gold_reward
-                log_print(
-                    logbook,
-                    f"전투 승리! 경험치 {exp_reward}, 골드 {gold_reward} 획득!",
-                )
-                apply_level_up(player, logbook)
+                logbook.emit(EventKind.GOLD_GAINED, GOLD_COMBAT, gold_reward)
+                log_format(logbook, VICTORY_LOG, (exp_reward, gold_reward))
+                logbook.emit(EventKind.VICTORY, enemy.name)
+                apply_level_up(player, logbook, strategy)
                 apply_drops(player, drops, logbook)
                 if (
                     region in MINIBOSS_BY_REGION
                     and enemy.name == MINIBOSS_BY_REGION[region]
-                    and not is_region_conquered(logbook, region)
+                    and world.conquer(region)
                 ):
                     if region == "초원":
                         log_print(
@@ -339,16 +504,20 @@ def exploration(player: Player, logbook: LogBook) -> None:
                         )
                     logbook.add(f"{CONQUEST_LOG_PREFIX}{region}")
                 if enemy.trophy:
-                    log_print(logbook, f"전리품 획득: {enemy.trophy}")
+                    log_format(logbook, TROPHY_LOG, (enemy.trophy,))
                 if region == "폐허 심층":
+                    world.record_boss_kill(enemy.name)
                     logbook.add(f"KILL_BOSS:{enemy.name}")
                     if true_ending_active:
+                        world.true_ending_cleared = True
                         logbook.add("TRUE_ENDING_CLEAR")
+                        logbook.emit(EventKind.TRUE_ENDING_CLEAR, enemy.name)
                         log_print(logbook, "진엔딩: 균열이 닫히며 남은 잔재가 사라집니다.")
                         log_print(logbook, "진엔딩: 더 이상 어둠의 잔향이 남지 않습니다.")
                         log_print(logbook, "진엔딩: 마을에는 새로운 평온이 찾아옵니다.")
                     else:
                         log_print(logbook, "폐허의 왕을 쓰러뜨렸습니다. 새로운 엔딩이 열립니다.")
+                        logbook.emit(EventKind.BOSS_DEFEATED, enemy.name)
                         boss_ending(logbook, player)
                     break
             else:
@@ -356,15 +525,15 @@ def exploration(player: Player, logbook: LogBook) -> None:
                 break
 
         if event == "merchant":
-            merchant_event(player, logbook)
+            merchant_event(player, logbook, strategy)
         elif event == "blacksmith":
-            blacksmith_event(player, logbook)
+            blacksmith_event(player, logbook, strategy)
 
         if player.hp <= 0:
             break
         if region == "폐허 심층":
             break
-        if not should_continue(region, depth):
+        if not strategy.continue_exploring(player, region, depth):
             break
         log_print(logbook, "더 깊이 들어갑니다...")
         depth += 1
@@ -373,29 +542,20 @@ def exploration(player: Player, logbook: LogBook) -> None:
 
 
 def boss_ending(logbook: LogBook, player: Player) -> None:
-    materials_found = {
-        line[len("DISCOVER_MATERIAL:") :].strip()
-        for line in logbook.entries
-        if line.startswith("DISCOVER_MATERIAL:")
-    }
-    equipment_found = {
-        line[len("DISCOVER_EQUIP:") :].strip()
-        for line in logbook.entries
-        if line.startswith("DISCOVER_EQUIP:")
-    }
-    material_complete = set(player.materials.keys()).issubset(materials_found)
-    equipment_complete = set(EQUIPMENT_ITEMS.keys()).issubset(equipment_found)
+    material_complete = len(player.world.discovered_materials) == len(MATERIAL_NAMES)
+    equipment_complete = len(player.world.discovered_equipment) == len(EQUIPMENT_ITEMS)
     if player.weapon_tag == player.armor_tag:
         build_line = f"??? {player.weapon_tag}? ?? ??? ?????."
     else:
         build_line = f"??? {player.weapon_tag}? {player.armor_tag} ???? ?? ?????."
-    tactics_line = ""
-    if any("??? ??? ?????." in line for line in logbook.entries):
-        tactics_line = "??? ?? ?? ???? ??? ?????."
-    elif any("??" in line for line in logbook.entries):
-        tactics_line = "??? ??? ??? ??????."
-    elif any("??" in line for line in logbook.entries):
-        tactics_line = "??? ??? ??? ??????."
+    found = [False] * len(BOSS_TACTICS_LINES)
+    for line in logbook.lines():
+        for index, (pattern, _) in enumerate(BOSS_TACTICS_LINES):
+            if not found[index] and pattern in line:
+                found[index] = True
+        if found[0]:
+            break
+    tactics_line = next((text for (_, text), hit in zip(BOSS_TACTICS_LINES, found) if hit), "")
     dex_line = "??? ??? ??? ???? ???." if material_complete and equipment_complete else "?? ?? ??? ??? ?????."
     ending_lines = [
         "??: ??? ?? ???? ??? ???.",
@@ -412,23 +572,29 @@ def next_level_exp(level: int) -> int:
     return 10 + (level - 1) * 6
 
 
-def apply_level_up(player: Player, logbook: LogBook) -> None:
+def apply_level_up(player: Player, logbook: LogBook, strategy: Optional[Strategy] = None) -> None:
     while player.exp >= next_level_exp(player.level):
         player.exp -= next_level_exp(player.level)
         player.level += 1
         player.hp = player.max_hp
-        log_print(logbook, f"레벨업! 현재 레벨 {player.level}.")
-        apply_level_up_choice(player, logbook)
+        log_format(logbook, LEVEL_UP_LOG, (player.level,))
+        if strategy is None:
+            apply_level_up_choice(player, logbook)
+        else:
+            apply_level_up_selection(player, strategy.choose_level_up(player), logbook)
 
 
 def apply_level_up_choice(player: Player, logbook: LogBook) -> None:
+    apply_level_up_selection(player, prompt_level_up_choice(), logbook)
+
+
+def prompt_level_up_choice() -> str:
     print("레벨업 선택지를 고르세요.")
     print("1) 공격형")
     print("2) 생존형")
     print("3) 탐험형")
     choice = safe_int("> ", 1, 3)
-    selected = LEVEL_UP_CHOICES[choice - 1]
-    apply_level_up_selection(player, selected, logbook)
+    return LEVEL_UP_CHOICES[choice - 1]
 
 
 def apply_level_up_selection(player: Player, selection: str, logbook: LogBook) -> None:
@@ -446,15 +612,15 @@ def apply_level_up_selection(player: Player, selection: str, logbook: LogBook) -
 
 
 def get_explore_bonus_total(player: Player) -> float:
-    _, _, equip_bonus = get_equipment_bonus(player)
-    return player.explore_bonus + equip_bonus
+    return player.total_explore
 
 
 def apply_drops(player: Player, drops: List[str], logbook: LogBook) -> None:
     if drops:
         for item in drops:
             player.materials[item] += 1
-            log_print(logbook, f"재료 획득: {item} +1")
-            logbook.add(f"DISCOVER_MATERIAL:{item}")
+            log_format(logbook, MATERIAL_GAINED_LOG, (item,))
+            logbook.emit(EventKind.MATERIAL_GAINED, item)
+            discover_material(player, logbook, item)
     else:
         log_print(logbook, "재료를 획득하지 못했습니다.")
@@ -0,0 +1,170 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import product
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from models import BOSS_MATERIALS, CRAFT_RECIPES, ITEM_SHOP_PRICES, Player
+from systems.explore import REGION_CONQUEST_BONUS, REGION_DROPS, region_table
+
+
+# material -> (region, expected drops per explore turn)
+MaterialSources = Dict[str, Tuple[str, float]]
+
+PLAN_CACHE_SIZE: int = 1024
+PLAN_TURN_COST: float = 3.0
+
+
+@dataclass(frozen=True)
+class MaterialPlan:
+    material: str
+    needed: int
+    buy: int = 0
+    farm: int = 0
+    region: Optional[str] = None
+    turns_per_unit: float = 0.0
+    locked: bool = False
+
+
+@dataclass(frozen=True)
+class CraftPlan:
+    target: str
+    steps: Tuple[MaterialPlan, ...]
+    gold_cost: int
+    expected_turns: float
+    region_turns: Tuple[Tuple[str, float], ...]
+    boss_materials: Tuple[str, ...]
+
+    @property
+    def ready(self) -> bool:
+        return all(step.needed == 0 for step in self.steps)
+
+    @property
+    def feasible(self) -> bool:
+        return not any(step.locked for step in self.steps)
+
+    @property
+    def cost(self) -> float:
+        if not self.feasible:
+            return float("inf")
+        return self.gold_cost + PLAN_TURN_COST * self.expected_turns
+
+
+def buy_price(material: str) -> Optional[int]:
+    if material == "포션":
+        return None
+    return ITEM_SHOP_PRICES.get(material)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def material_sources(explore_bonus: float = 0.0, conquered: FrozenSet[str] = frozenset()) -> MaterialSources:
+    sources: MaterialSources = {}
+    for region in REGION_DROPS:
+        bonus = REGION_CONQUEST_BONUS.get(region) if region in conquered else None
+        table = region_table(region, explore_bonus, bonus)
+        for material, chance in table.drop_thresholds:
+            if material in BOSS_MATERIALS:
+                continue
+            rate = table.encounter_chance * chance
+            if rate > sources.get(material, ("", 0.0))[1]:
+                sources[material] = (region, rate)
+    return sources
+
+
+def conquest_region(material: str) -> Optional[str]:
+    for region, (bonus_material, _) in REGION_CONQUEST_BONUS.items():
+        if bonus_material == material:
+            return region
+    return None
+
+
+def plan_craft(
+    target: str,
+    materials: Dict[str, int],
+    gold: int,
+    explore_bonus: float = 0.0,
+    conquered: Iterable[str] = (),
+) -> CraftPlan:
+    recipe = CRAFT_RECIPES[target]
+    missing = tuple(
+        (material, max(0, count - materials.get(material, 0))) for material, count in recipe.items()
+    )
+    budget = sum((buy_price(name) or 0) * count for name, count in missing)
+    return _plan(target, missing, min(max(0, gold), budget), explore_bonus, frozenset(conquered))
+
+
+def plan_for_player(player: Player, target: str) -> CraftPlan:
+    return plan_craft(
+        target, player.materials, player.gold, player.total_explore, player.world.conquered_regions
+    )
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _plan(
+    target: str,
+    missing: Tuple[Tuple[str, int], ...],
+    budget: int,
+    explore_bonus: float,
+    conquered: FrozenSet[str],
+) -> CraftPlan:
+    sources = material_sources(explore_bonus, conquered)
+    choices: List[range] = []
+    for material, count in missing:
+        price = buy_price(material)
+        if price is None:
+            choices.append(range(0, 1))
+        elif material not in sources:
+            choices.append(range(count, count + 1))
+        else:
+            choices.append(range(0, count + 1))
+
+    best: Optional[Tuple[float, int, Tuple[int, ...]]] = None
+    for buys in product(*choices):
+        gold_cost = _gold_cost(missing, buys)
+        if gold_cost > budget:
+            continue
+        score = gold_cost + PLAN_TURN_COST * sum(_region_turns(missing, buys, sources).values())
+        if best is None or (score, gold_cost) < best[:2]:
+            best = (score, gold_cost, buys)
+    buys = best[2] if best is not None else tuple(choice.start for choice in choices)
+
+    steps: List[MaterialPlan] = []
+    for (material, count), bought in zip(missing, buys):
+        farm = count - bought
+        region, rate = sources.get(material, (conquest_region(material), 0.0))
+        steps.append(
+            MaterialPlan(
+                material=material,
+                needed=count,
+                buy=bought,
+                farm=farm,
+                region=region if farm else None,
+                turns_per_unit=1.0 / rate if farm and rate else 0.0,
+                locked=bool(farm) and not rate,
+            )
+        )
+    region_turns = _region_turns(missing, buys, sources)
+    return CraftPlan(
+        target=target,
+        steps=tuple(steps),
+        gold_cost=_gold_cost(missing, buys),
+        expected_turns=sum(region_turns.values(), 0.0),
+        region_turns=tuple(sorted(region_turns.items())),
+        boss_materials=tuple(material for material, _ in missing if material in BOSS_MATERIALS),
+    )
+
+
+def _gold_cost(missing: Tuple[Tuple[str, int], ...], buys: Tuple[int, ...]) -> int:
+    return sum((buy_price(material) or 0) * bought for (material, _), bought in zip(missing, buys))
+
+
+def _region_turns(
+    missing: Tuple[Tuple[str, int], ...], buys: Tuple[int, ...], sources: MaterialSources
+) -> Dict[str, float]:
+    turns: Dict[str, float] = {}
+    for (material, count), bought in zip(missing, buys):
+        farm = count - bought
+        if farm <= 0 or material not in sources:
+            continue
+        region, rate = sources[material]
+        turns[region] = max(turns.get(region, 0.0), farm / rate)
+    return turns
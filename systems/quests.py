@@ -3,7 +3,9 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
 from models import Player
-from utils.logging import LogBook, log_print
+from systems.dex import discover_material
+from utils.events import GOLD_QUEST, EventKind, LogEvent
+from utils.logging import LogBook, LogCursor, log_print
 
 
 @dataclass
@@ -27,22 +29,30 @@ QUEST_POOL: List[Quest] = [
 ]
 
 
+QUEST_EVENT_KEYS: Dict[EventKind, str] = {
+    EventKind.VICTORY: "victory",
+    EventKind.MATERIAL_GAINED: "material",
+    EventKind.MERCHANT_MET: "merchant",
+    EventKind.CRAFTED: "craft",
+}
+
+
 class QuestManager:
     def __init__(self, quests: Optional[List[Quest]] = None) -> None:
         self.active_quests: List[Quest] = quests or []
-        self.last_log_index = 0
+        self._cursor: LogCursor[LogEvent] = LogCursor(events=True)
 
-    def activate_run_quests(self, logbook: LogBook) -> None:
+    def activate_run_quests(self, logbook: LogBook, rng: Optional[random.Random] = None) -> None:
         if self.active_quests:
             return
         count = min(3, len(QUEST_POOL))
-        self.active_quests = [self._clone(quest) for quest in random.sample(QUEST_POOL, count)]
+        sampled = (rng or random).sample(QUEST_POOL, count)
+        self.active_quests = [self._clone(quest) for quest in sampled]
         for quest in self.active_quests:
             log_print(logbook, f"퀘스트 활성화: {quest.description}")
 
     def process(self, logbook: LogBook, player: Player) -> None:
-        new_lines = logbook.entries[self.last_log_index :]
-        counters = self._count_events(new_lines)
+        counters = self._count_events(self._cursor.read(logbook))
         for quest in self.active_quests:
             if quest.completed:
                 continue
@@ -50,32 +60,27 @@ class QuestManager:
             if quest.progress >= quest.target:
                 quest.completed = True
                 self._apply_reward(quest, player, logbook)
-        self.last_log_index = len(logbook.entries)
 
     def _apply_reward(self, quest: Quest, player: Player, logbook: LogBook) -> None:
         log_print(logbook, f"퀘스트 완료: {quest.description}")
         if quest.reward_gold:
             player.gold += quest.reward_gold
+            logbook.emit(EventKind.GOLD_GAINED, GOLD_QUEST, quest.reward_gold)
             log_print(logbook, f"보상: 골드 {quest.reward_gold}")
         if quest.reward_material:
             name, count = quest.reward_material
             player.materials[name] += count
             log_print(logbook, f"보상: {name} {count}개")
-            logbook.add(f"DISCOVER_MATERIAL:{name}")
+            discover_material(player, logbook, name)
         if quest.reward_log:
             log_print(logbook, quest.reward_log)
 
-    def _count_events(self, lines: List[str]) -> Dict[str, int]:
-        counters = {"victory": 0, "material": 0, "merchant": 0, "craft": 0}
-        for line in lines:
-            if "전투 승리!" in line:
-                counters["victory"] += 1
-            if "재료 획득:" in line:
-                counters["material"] += 1
-            if "상인을 만났습니다" in line:
-                counters["merchant"] += 1
-            if "제작 완료:" in line:
-                counters["craft"] += 1
+    def _count_events(self, events: List[LogEvent]) -> Dict[str, int]:
+        counters = {key: 0 for key in QUEST_EVENT_KEYS.values()}
+        for event in events:
+            key = QUEST_EVENT_KEYS.get(event.kind)
+            if key:
+                counters[key] += event.amount
         return counters
 
     def _clone(self, quest: Quest) -> Quest:
@@ -1,14 +1,74 @@
 import json
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
-from models import Player
+from models import MaterialBag, Player, WorldState
 from systems.achievements import AchievementManager
 from systems.dex import DexManager
+from systems.save_binary import (
+    BINARY_SAVE_SUFFIX,
+    decode_save,
+    encode_save,
+    is_binary_save,
+    read_binary_section,
+)
+from utils.io import JOURNAL_COMPACT_LIMIT, Journal, atomic_write_bytes, dump_json, journal_path
 from utils.logging import LogBook, log_print
 
 
+SaveData = Dict[str, Any]
+KeyPath = List[str]
+FileSignature = Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]
+
 SAVE_PATH = Path("savegame.json")
+SAVE_VERSION: str = "2.0"
+DEFAULT_PROGRESS: Dict[str, Any] = {"location": "town", "last_region": None, "depth": 0}
+PLAYER_SAVE_FIELDS: Tuple[str, ...] = (
+    "name",
+    "level",
+    "exp",
+    "max_hp",
+    "hp",
+    "atk",
+    "defense",
+    "gold",
+    "potions",
+    "weapon_level",
+    "armor_level",
+    "weapon_tag",
+    "armor_tag",
+    "weapon_item",
+    "armor_item",
+    "weapons_owned",
+    "armors_owned",
+    "explore_bonus",
+)
+WORLD_SAVE_FIELDS: Tuple[str, ...] = (
+    "conquered_regions",
+    "boss_kills",
+    "true_ending_unlocked",
+    "true_ending_cleared",
+    "blacksmith_visits",
+    "discovered_materials",
+    "discovered_equipment",
+)
+DEX_SAVE_FIELDS: Tuple[str, ...] = ("materials", "equipment", "monsters")
+
+
+def save_sources(
+    player: Player,
+    achievements: AchievementManager,
+    dex_manager: DexManager,
+    progress: Optional[Dict[str, Any]] = None,
+) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+    for key in PLAYER_SAVE_FIELDS:
+        yield ("player", key), getattr(player, key)
+    for key in WORLD_SAVE_FIELDS:
+        yield ("world", key), getattr(player.world, key)
+    yield ("progress",), progress or DEFAULT_PROGRESS
+    yield ("achievements",), achievements.unlocked
+    for key in DEX_SAVE_FIELDS:
+        yield ("dex", key), getattr(dex_manager, key)
 
 
 def build_save_data(
@@ -17,37 +77,31 @@ def build_save_data(
     dex_manager: DexManager,
     progress: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
-    return {
-        "version": "2.0",
-        "player": {
-            "name": player.name,
-            "level": player.level,
-            "exp": player.exp,
-            "max_hp": player.max_hp,
-            "hp": player.hp,
-            "atk": player.atk,
-            "defense": player.defense,
-            "gold": player.gold,
-            "potions": player.potions,
-            "weapon_level": player.weapon_level,
-            "armor_level": player.armor_level,
-            "weapon_tag": player.weapon_tag,
-            "armor_tag": player.armor_tag,
-            "weapon_item": player.weapon_item,
-            "armor_item": player.armor_item,
-            "weapons_owned": player.weapons_owned,
-            "armors_owned": player.armors_owned,
-            "explore_bonus": player.explore_bonus,
-            "materials": player.materials,
-        },
-        "progress": progress or {"location": "town", "last_region": None, "depth": 0},
-        "achievements": sorted(achievements.unlocked),
-        "dex": {
-            "materials": sorted(dex_manager.materials),
-            "equipment": sorted(dex_manager.equipment),
-            "monsters": sorted(dex_manager.monsters),
-        },
-    }
+    data: SaveData = {"version": SAVE_VERSION, "player": {}}
+    for path, value in save_sources(player, achievements, dex_manager, progress):
+        node = data
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = _serialized(value)
+    # materials are tracked per name through the bag listener, not as a save source
+    data["player"]["materials"] = dict(player.materials)
+    return data
+
+
+def _serialized(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def _shadow(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return set(value)
+    return _serialized(value)
 
 
 def apply_save_data(
@@ -85,6 +139,7 @@ def apply_save_data(
         for key, value in materials.items():
             player.materials[str(key)] = int(value)
     player.hp = max(1, min(player.hp, player.max_hp))
+    player.world = load_world_state(data.get("world", {}))
 
     achievements_list = data.get("achievements", [])
     if isinstance(achievements_list, list):
@@ -101,10 +156,269 @@ def apply_save_data(
                 [str(item) for item in equipment],
                 [str(item) for item in monsters],
             )
+            world_data = data.get("world")
+            if not isinstance(world_data, dict) or "discovered_materials" not in world_data:
+                for name in dex_manager.materials:
+                    player.world.discover_material(name)
+                for name in dex_manager.equipment:
+                    player.world.discover_equipment(name)
 
     log_print(logbook, "저장 데이터를 불러왔습니다. 마을에서 다시 시작합니다.")
 
 
+def load_world_state(world_data: Any) -> WorldState:
+    world = WorldState()
+    if not isinstance(world_data, dict):
+        return world
+    regions = world_data.get("conquered_regions", [])
+    if isinstance(regions, list):
+        world.conquered_regions = {str(region) for region in regions}
+    boss_kills = world_data.get("boss_kills", {})
+    if isinstance(boss_kills, dict):
+        world.boss_kills = {str(name): int(count) for name, count in boss_kills.items()}
+    world.true_ending_unlocked = bool(world_data.get("true_ending_unlocked", False))
+    world.true_ending_cleared = bool(world_data.get("true_ending_cleared", False))
+    world.blacksmith_visits = int(world_data.get("blacksmith_visits", 0))
+    materials = world_data.get("discovered_materials", [])
+    if isinstance(materials, list):
+        for name in materials:
+            world.discover_material(str(name))
+    equipment = world_data.get("discovered_equipment", [])
+    if isinstance(equipment, list):
+        for name in equipment:
+            world.discover_equipment(str(name))
+    return world
+
+
+def diff_save_data(
+    old: SaveData, new: SaveData, prefix: Tuple[str, ...] = ()
+) -> Tuple[List[Tuple[KeyPath, Any]], List[KeyPath]]:
+    changed: List[Tuple[KeyPath, Any]] = []
+    removed: List[KeyPath] = [[*prefix, key] for key in old if key not in new]
+    for key, value in new.items():
+        before = old.get(key)
+        if isinstance(value, dict) and isinstance(before, dict):
+            nested_changed, nested_removed = diff_save_data(before, value, (*prefix, key))
+            changed.extend(nested_changed)
+            removed.extend(nested_removed)
+        elif key not in old or before != value:
+            changed.append(([*prefix, key], value))
+    return changed, removed
+
+
+def apply_save_delta(data: SaveData, record: Any) -> None:
+    if not isinstance(record, dict):
+        return
+    for path, value in record.get("set", []):
+        node = data
+        for key in path[:-1]:
+            if not isinstance(node.get(key), dict):
+                node[key] = {}
+            node = node[key]
+        node[path[-1]] = value
+    for path in record.get("del", []):
+        node = data
+        for key in path[:-1]:
+            node = node.get(key, {})
+        if isinstance(node, dict):
+            node.pop(path[-1], None)
+
+
+class SaveTracker:
+    def __init__(
+        self,
+        player: Player,
+        achievements: AchievementManager,
+        dex_manager: DexManager,
+        progress: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.player = player
+        self.achievements = achievements
+        self.dex_manager = dex_manager
+        self.shadow: Dict[Tuple[str, ...], Any] = {
+            path: _shadow(value) for path, value in save_sources(player, achievements, dex_manager, progress)
+        }
+        self.materials: Optional[MaterialBag] = None
+        self.dirty: Set[str] = set()
+        self._watch_materials()
+
+    def watches(self, player: Player, achievements: AchievementManager, dex_manager: DexManager) -> bool:
+        return self.player is player and self.achievements is achievements and self.dex_manager is dex_manager
+
+    def material_changed(self, name: str, old: int, new: int) -> None:
+        self.dirty.add(name)
+
+    def collect(
+        self, state: SaveData, progress: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Tuple[KeyPath, Any]], List[KeyPath]]:
+        changed: List[Tuple[KeyPath, Any]] = []
+        removed: List[KeyPath] = []
+        for path, value in save_sources(self.player, self.achievements, self.dex_manager, progress):
+            if path not in self.shadow or self.shadow[path] != value:
+                self.shadow[path] = _shadow(value)
+                changed.append((list(path), _serialized(value)))
+
+        materials = self.player.materials
+        saved = state.get("player", {}).get("materials", {})
+        if materials is self.materials:
+            names = self.dirty
+        else:
+            self._watch_materials()
+            names = set(materials) | set(saved)
+        for name in names:
+            if name not in materials:
+                if name in saved:
+                    removed.append(["player", "materials", name])
+            elif saved.get(name) != materials[name]:
+                changed.append((["player", "materials", name], materials[name]))
+        self.dirty = set()
+        return changed, removed
+
+    def close(self) -> None:
+        if self.materials is not None and self in self.materials.listeners:
+            self.materials.listeners.remove(self)
+        self.materials = None
+
+    def _watch_materials(self) -> None:
+        self.close()
+        self.materials = self.player.materials
+        self.materials.subscribe(self)
+
+
+class SaveStore:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.journal = Journal(journal_path(path))
+        self.state: Optional[SaveData] = None
+        self.tracker: Optional[SaveTracker] = None
+        self._signature: Optional[FileSignature] = None
+
+    def read(self) -> Optional[SaveData]:
+        self.state = None
+        self._drop_tracker()
+        if not self.path.exists() and not self.journal.path.exists():
+            self.journal.entries = 0
+            self._signature = self._current_signature()
+            return None
+        data: Any = read_snapshot(self.path) if self.path.exists() else {}
+        if not isinstance(data, dict):
+            return data
+        for record in self.journal.read():
+            apply_save_delta(data, record)
+        self.state = data
+        self._signature = self._current_signature()
+        return data
+
+    def save(
+        self,
+        player: Player,
+        achievements: AchievementManager,
+        dex_manager: DexManager,
+        progress: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self._refresh()
+        tracker = self.tracker
+        if self.state is None or tracker is None or not tracker.watches(player, achievements, dex_manager):
+            self.write(build_save_data(player, achievements, dex_manager, progress))
+            self.tracker = SaveTracker(player, achievements, dex_manager, progress)
+            return
+        self._append(*tracker.collect(self.state, progress))
+
+    def write(self, data: SaveData) -> None:
+        snapshot: SaveData = json.loads(dump_json(data))
+        self._refresh()
+        self._drop_tracker()
+        if self.state is None:
+            self.compact(snapshot)
+            return
+        self._append(*diff_save_data(self.state, snapshot))
+
+    def compact(self, data: Optional[SaveData] = None) -> None:
+        if data is not None:
+            # the new snapshot does not derive from the journal on disk, so retire it first
+            self.journal.clear()
+            self._drop_tracker()
+            self.state = data
+        if self.state is None:
+            return
+        atomic_write_bytes(self.path, encode_snapshot(self.path, self.state))
+        self.journal.clear()
+        self._signature = self._current_signature()
+
+    def _append(self, changed: List[Tuple[KeyPath, Any]], removed: List[KeyPath]) -> None:
+        if (changed or removed) and self.state is not None:
+            record = {"set": changed, "del": removed}
+            self.journal.append(record)
+            apply_save_delta(self.state, record)
+            if self.journal.entries >= JOURNAL_COMPACT_LIMIT:
+                self.compact()
+                return
+        self._signature = self._current_signature()
+
+    def _refresh(self) -> None:
+        if self._signature == self._current_signature():
+            return
+        try:
+            self.read()
+        except (OSError, ValueError):
+            self.state = None
+
+    def _drop_tracker(self) -> None:
+        if self.tracker is not None:
+            self.tracker.close()
+        self.tracker = None
+
+    def _current_signature(self) -> FileSignature:
+        return _file_signature(self.path), _file_signature(self.journal.path)
+
+
+def read_snapshot(path: Path) -> Any:
+    raw = path.read_bytes()
+    if is_binary_save(raw):
+        return decode_save(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def encode_snapshot(path: Path, data: SaveData) -> bytes:
+    if path.suffix == BINARY_SAVE_SUFFIX:
+        return encode_save(data)
+    return dump_json(data).encode("utf-8")
+
+
+def read_save_section(path: Path, key: str) -> Any:
+    store = save_store(path)
+    if path.suffix != BINARY_SAVE_SUFFIX or store.journal.path.exists():
+        data = store.read()
+        return data.get(key) if isinstance(data, dict) else None
+    return read_binary_section(path, key)
+
+
+def convert_save(source: Path, target: Path) -> None:
+    data = save_store(source).read()
+    if not isinstance(data, dict):
+        raise ValueError(f"{source} is not a save file")
+    save_store(target).compact(json.loads(dump_json(data)))
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+_STORES: Dict[Path, SaveStore] = {}
+
+
+def save_store(path: Path = SAVE_PATH) -> SaveStore:
+    path = path.resolve()
+    store = _STORES.get(path)
+    if store is None:
+        store = _STORES[path] = SaveStore(path)
+    return store
+
+
 def save_game(
     player: Player,
     achievements: AchievementManager,
@@ -112,8 +426,7 @@ def save_game(
     logbook: LogBook,
     path: Path = SAVE_PATH,
 ) -> None:
-    data = build_save_data(player, achievements, dex_manager)
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    save_store(path).save(player, achievements, dex_manager)
     log_print(logbook, "게임을 저장했습니다.")
 
 
@@ -124,15 +437,14 @@ def load_game(
     logbook: LogBook,
     path: Path = SAVE_PATH,
 ) -> bool:
-    if not path.exists():
-        log_print(logbook, "저장 파일이 없습니다.")
-        return False
     try:
-        raw = path.read_text(encoding="utf-8")
-        data = json.loads(raw)
-    except (OSError, json.JSONDecodeError):
+        data = save_store(path).read()
+    except (OSError, ValueError):
         log_print(logbook, "저장 파일을 읽을 수 없습니다.")
         return False
+    if data is None:
+        log_print(logbook, "저장 파일이 없습니다.")
+        return False
     if not isinstance(data, dict):
         log_print(logbook, "저장 파일 형식이 올바르지 않습니다.")
         return False
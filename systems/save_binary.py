@@ -0,0 +1,395 @@
+import json
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from models import EQUIPMENT_ITEMS, MATERIAL_NAMES, MONSTER_LIST, Player, WorldState
+from systems.achievements import ACHIEVEMENT_DEFS
+
+
+SaveData = Dict[str, Any]
+
+BINARY_MAGIC: bytes = b"RPGS"
+BINARY_FORMAT_VERSION: int = 1
+BINARY_SAVE_SUFFIX: str = ".sav"
+HEADER_FORMAT: str = "<4sHH"
+DIRECTORY_FORMAT: str = "<4sII"
+NAME_ESCAPE: int = 0xFFFF
+
+# ids are positions in these tuples, so they may only ever grow at the end
+MATERIAL_IDS: Tuple[str, ...] = MATERIAL_NAMES
+EQUIPMENT_IDS: Tuple[str, ...] = tuple(EQUIPMENT_ITEMS)
+MONSTER_IDS: Tuple[str, ...] = MONSTER_LIST
+ACHIEVEMENT_IDS: Tuple[str, ...] = tuple(achievement.achievement_id for achievement in ACHIEVEMENT_DEFS)
+
+PLAYER_INT_FIELDS: Tuple[str, ...] = (
+    "level",
+    "exp",
+    "max_hp",
+    "hp",
+    "atk",
+    "defense",
+    "gold",
+    "potions",
+    "weapon_level",
+    "armor_level",
+)
+PLAYER_TEXT_FIELDS: Tuple[str, ...] = ("name", "weapon_tag", "armor_tag", "weapon_item", "armor_item")
+PLAYER_KEYS: Tuple[str, ...] = (
+    "name",
+    "level",
+    "exp",
+    "max_hp",
+    "hp",
+    "atk",
+    "defense",
+    "gold",
+    "potions",
+    "weapon_level",
+    "armor_level",
+    "weapon_tag",
+    "armor_tag",
+    "weapon_item",
+    "armor_item",
+    "weapons_owned",
+    "armors_owned",
+    "explore_bonus",
+    "materials",
+)
+WORLD_KEYS: Tuple[str, ...] = (
+    "conquered_regions",
+    "boss_kills",
+    "true_ending_unlocked",
+    "true_ending_cleared",
+    "blacksmith_visits",
+    "discovered_materials",
+    "discovered_equipment",
+)
+DEX_KEYS: Tuple[str, ...] = ("materials", "equipment", "monsters")
+
+
+@lru_cache(maxsize=None)
+def catalog_index(catalog: Tuple[str, ...]) -> Dict[str, int]:
+    return {name: index for index, name in enumerate(catalog)}
+
+
+@lru_cache(maxsize=256)
+def _struct(fmt: str) -> struct.Struct:
+    return struct.Struct("<" + fmt)
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    def pack(self, fmt: str, *values: Any) -> None:
+        self.buffer += _struct(fmt).pack(*values)
+
+    def text(self, value: str) -> None:
+        data = value.encode("utf-8")
+        self.pack("I", len(data))
+        self.buffer += data
+
+    def texts(self, values: Sequence[str]) -> None:
+        self.pack("I", len(values))
+        for value in values:
+            self.text(value)
+
+    def names(self, values: Sequence[str], catalog: Tuple[str, ...]) -> None:
+        index = catalog_index(catalog)
+        ids = [index.get(value, NAME_ESCAPE) for value in values]
+        self.pack("I", len(ids))
+        self.pack(f"{len(ids)}H", *ids)
+        self.texts([value for value, position in zip(values, ids) if position == NAME_ESCAPE])
+
+    def counts(self, values: Dict[str, int], catalog: Tuple[str, ...]) -> None:
+        self.names(list(values), catalog)
+        self.pack(f"{len(values)}q", *values.values())
+
+    def bitset(self, values: Iterable[str], catalog: Tuple[str, ...]) -> None:
+        index = catalog_index(catalog)
+        bits = bytearray((len(catalog) + 7) // 8)
+        extras: List[str] = []
+        for value in values:
+            position = index.get(value)
+            if position is None:
+                extras.append(value)
+            else:
+                bits[position >> 3] |= 1 << (position & 7)
+        self.pack("H", len(bits))
+        self.buffer += bits
+        self.texts(extras)
+
+
+class _Reader:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt: str) -> Tuple[Any, ...]:
+        layout = _struct(fmt)
+        try:
+            values = layout.unpack_from(self.data, self.offset)
+        except struct.error as exc:
+            raise ValueError("truncated binary save section") from exc
+        self.offset += layout.size
+        return values
+
+    def text(self) -> str:
+        (length,) = self.unpack("I")
+        start = self.offset
+        self.offset += length
+        if self.offset > len(self.data):
+            raise ValueError("truncated text field")
+        return bytes(self.data[start : self.offset]).decode("utf-8")
+
+    def texts(self) -> List[str]:
+        (count,) = self.unpack("I")
+        return [self.text() for _ in range(count)]
+
+    def names(self, catalog: Tuple[str, ...]) -> List[str]:
+        (count,) = self.unpack("I")
+        ids = self.unpack(f"{count}H")
+        extras = iter(self.texts())
+        try:
+            return [next(extras) if index == NAME_ESCAPE else catalog[index] for index in ids]
+        except (IndexError, StopIteration) as exc:
+            raise ValueError("invalid catalog id in binary save") from exc
+
+    def counts(self, catalog: Tuple[str, ...]) -> Dict[str, int]:
+        names = self.names(catalog)
+        return dict(zip(names, self.unpack(f"{len(names)}q")))
+
+    def bitset(self, catalog: Tuple[str, ...]) -> List[str]:
+        (size,) = self.unpack("H")
+        mask = int.from_bytes(self.data[self.offset : self.offset + size], "little")
+        self.offset += size
+        limit = min(len(catalog), mask.bit_length())
+        values = [catalog[position] for position in range(limit) if mask >> position & 1]
+        return sorted(values + self.texts())
+
+
+def _section(data: SaveData, key: str, keys: Tuple[str, ...], defaults: SaveData) -> SaveData:
+    section = data[key]
+    unknown = set(section) - set(keys)
+    if unknown:
+        raise ValueError(f"{key} section has fields outside the save layout: {sorted(unknown)}")
+    return {**defaults, **section}
+
+
+def _player_defaults() -> SaveData:
+    player = Player(name="")
+    defaults = {key: getattr(player, key) for key in PLAYER_KEYS}
+    defaults["materials"] = dict(player.materials)
+    return defaults
+
+
+def _world_defaults(data: SaveData) -> SaveData:
+    world = WorldState()
+    defaults = {key: getattr(world, key) for key in WORLD_KEYS}
+    dex = data.get("dex")
+    if isinstance(dex, dict) and "discovered_materials" not in data["world"]:
+        # load_game rebuilds discoveries from the dex for saves that predate them
+        defaults["discovered_materials"] = dex.get("materials", [])
+        defaults["discovered_equipment"] = sorted(
+            set(data["world"].get("discovered_equipment", [])) | set(dex.get("equipment", []))
+        )
+    return defaults
+
+
+def _encode_meta(data: SaveData, writer: _Writer) -> None:
+    writer.text(str(data["version"]))
+
+
+def _decode_meta(reader: _Reader) -> SaveData:
+    return {"version": reader.text()}
+
+
+def _encode_player(data: SaveData, writer: _Writer) -> None:
+    player = _section(data, "player", PLAYER_KEYS, _player_defaults())
+    writer.pack("q" * len(PLAYER_INT_FIELDS), *(player[key] for key in PLAYER_INT_FIELDS))
+    writer.pack("d", player["explore_bonus"])
+    for key in PLAYER_TEXT_FIELDS:
+        writer.text(player[key])
+    writer.names(player["weapons_owned"], EQUIPMENT_IDS)
+    writer.names(player["armors_owned"], EQUIPMENT_IDS)
+    writer.counts(player["materials"], MATERIAL_IDS)
+
+
+def _decode_player(reader: _Reader) -> SaveData:
+    stats = reader.unpack("q" * len(PLAYER_INT_FIELDS))
+    player: Dict[str, Any] = dict(zip(PLAYER_INT_FIELDS, stats))
+    player["explore_bonus"] = reader.unpack("d")[0]
+    for key in PLAYER_TEXT_FIELDS:
+        player[key] = reader.text()
+    player["weapons_owned"] = reader.names(EQUIPMENT_IDS)
+    player["armors_owned"] = reader.names(EQUIPMENT_IDS)
+    player["materials"] = reader.counts(MATERIAL_IDS)
+    return {"player": {key: player[key] for key in PLAYER_KEYS}}
+
+
+def _encode_world(data: SaveData, writer: _Writer) -> None:
+    world = _section(data, "world", WORLD_KEYS, _world_defaults(data))
+    writer.texts(world["conquered_regions"])
+    writer.counts(world["boss_kills"], MONSTER_IDS)
+    writer.pack("??q", world["true_ending_unlocked"], world["true_ending_cleared"], world["blacksmith_visits"])
+    writer.bitset(world["discovered_materials"], MATERIAL_IDS)
+    writer.bitset(world["discovered_equipment"], EQUIPMENT_IDS)
+
+
+def _decode_world(reader: _Reader) -> SaveData:
+    world: Dict[str, Any] = {
+        "conquered_regions": reader.texts(),
+        "boss_kills": reader.counts(MONSTER_IDS),
+    }
+    unlocked, cleared, visits = reader.unpack("??q")
+    world["true_ending_unlocked"] = unlocked
+    world["true_ending_cleared"] = cleared
+    world["blacksmith_visits"] = visits
+    world["discovered_materials"] = reader.bitset(MATERIAL_IDS)
+    world["discovered_equipment"] = reader.bitset(EQUIPMENT_IDS)
+    return {"world": world}
+
+
+def _encode_progress(data: SaveData, writer: _Writer) -> None:
+    writer.text(json.dumps(data["progress"], ensure_ascii=False, separators=(",", ":")))
+
+
+def _decode_progress(reader: _Reader) -> SaveData:
+    return {"progress": json.loads(reader.text())}
+
+
+def _encode_achievements(data: SaveData, writer: _Writer) -> None:
+    writer.bitset(data["achievements"], ACHIEVEMENT_IDS)
+
+
+def _decode_achievements(reader: _Reader) -> SaveData:
+    return {"achievements": reader.bitset(ACHIEVEMENT_IDS)}
+
+
+def _encode_dex(data: SaveData, writer: _Writer) -> None:
+    dex = _section(data, "dex", DEX_KEYS, dict.fromkeys(DEX_KEYS, []))
+    writer.bitset(dex["materials"], MATERIAL_IDS)
+    writer.bitset(dex["equipment"], EQUIPMENT_IDS)
+    writer.bitset(dex["monsters"], MONSTER_IDS)
+
+
+def _decode_dex(reader: _Reader) -> SaveData:
+    return {
+        "dex": {
+            "materials": reader.bitset(MATERIAL_IDS),
+            "equipment": reader.bitset(EQUIPMENT_IDS),
+            "monsters": reader.bitset(MONSTER_IDS),
+        }
+    }
+
+
+# save key -> (section tag, encoder, decoder), in file order
+SECTIONS: Dict[str, Tuple[bytes, Callable[[SaveData, _Writer], None], Callable[[_Reader], SaveData]]] = {
+    "version": (b"META", _encode_meta, _decode_meta),
+    "player": (b"PLYR", _encode_player, _decode_player),
+    "world": (b"WRLD", _encode_world, _decode_world),
+    "progress": (b"PROG", _encode_progress, _decode_progress),
+    "achievements": (b"ACHV", _encode_achievements, _decode_achievements),
+    "dex": (b"DEX ", _encode_dex, _decode_dex),
+}
+
+
+def encode_save(data: SaveData) -> bytes:
+    unknown = set(data) - set(SECTIONS)
+    if unknown:
+        raise ValueError(f"no binary section for save keys: {sorted(unknown)}")
+    bodies: List[Tuple[bytes, bytes]] = []
+    for key, (tag, encode, _) in SECTIONS.items():
+        if key in data:
+            writer = _Writer()
+            encode(data, writer)
+            bodies.append((tag, bytes(writer.buffer)))
+
+    offset = struct.calcsize(HEADER_FORMAT) + struct.calcsize(DIRECTORY_FORMAT) * len(bodies)
+    header = bytearray(struct.pack(HEADER_FORMAT, BINARY_MAGIC, BINARY_FORMAT_VERSION, len(bodies)))
+    for tag, body in bodies:
+        header += struct.pack(DIRECTORY_FORMAT, tag, offset, len(body))
+        offset += len(body)
+    return bytes(header) + b"".join(body for _, body in bodies)
+
+
+def is_binary_save(raw: bytes) -> bool:
+    return raw[: len(BINARY_MAGIC)] == BINARY_MAGIC
+
+
+def read_directory(head: bytes) -> Tuple[int, Dict[bytes, Tuple[int, int]]]:
+    header_size = struct.calcsize(HEADER_FORMAT)
+    entry_size = struct.calcsize(DIRECTORY_FORMAT)
+    if len(head) < header_size:
+        raise ValueError("truncated binary save header")
+    magic, version, count = struct.unpack_from(HEADER_FORMAT, head, 0)
+    if magic != BINARY_MAGIC:
+        raise ValueError("not a binary save file")
+    if version > BINARY_FORMAT_VERSION:
+        raise ValueError(f"unsupported binary save version {version}")
+    if len(head) < header_size + entry_size * count:
+        raise ValueError("truncated binary save directory")
+    directory: Dict[bytes, Tuple[int, int]] = {}
+    for index in range(count):
+        tag, offset, length = struct.unpack_from(DIRECTORY_FORMAT, head, header_size + entry_size * index)
+        directory[tag] = (offset, length)
+    return header_size + entry_size * count, directory
+
+
+def decode_section(key: str, body: bytes) -> SaveData:
+    return SECTIONS[key][2](_Reader(body))
+
+
+class BinarySave:
+    def __init__(self, raw: bytes) -> None:
+        self.raw = memoryview(raw)
+        _, self.directory = read_directory(raw)
+        for offset, length in self.directory.values():
+            if offset + length > len(raw):
+                raise ValueError("truncated binary save section")
+        self._sections: Dict[str, SaveData] = {}
+
+    def section(self, key: str) -> Optional[SaveData]:
+        if key not in self._sections:
+            tag = SECTIONS[key][0]
+            if tag not in self.directory:
+                return None
+            offset, length = self.directory[tag]
+            self._sections[key] = decode_section(key, self.raw[offset : offset + length])
+        return self._sections[key]
+
+    def get(self, key: str) -> Any:
+        section = self.section(key)
+        return None if section is None else section[key]
+
+    def to_dict(self) -> SaveData:
+        data: SaveData = {}
+        for key in SECTIONS:
+            section = self.section(key)
+            if section is not None:
+                data.update(section)
+        return data
+
+
+def decode_save(raw: bytes) -> SaveData:
+    return BinarySave(raw).to_dict()
+
+
+def read_binary_section(path: Path, key: str) -> Any:
+    with path.open("rb") as handle:
+        head = handle.read(struct.calcsize(HEADER_FORMAT))
+        if len(head) == struct.calcsize(HEADER_FORMAT):
+            count = struct.unpack_from(HEADER_FORMAT, head, 0)[2]
+            head += handle.read(struct.calcsize(DIRECTORY_FORMAT) * count)
+        _, directory = read_directory(head)
+        tag = SECTIONS[key][0]
+        if tag not in directory:
+            return None
+        offset, length = directory[tag]
+        handle.seek(offset)
+        body = handle.read(length)
+    if len(body) != length:
+        raise ValueError("truncated binary save section")
+    return decode_section(key, body)[key]
@@ -1,6 +1,9 @@
 import random
-from typing import Dict, List, Sequence
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 
+import models
 from models import (
     BUILD_TAGS,
     CRAFT_RECIPES,
@@ -24,24 +27,61 @@ BASE_EQUIPMENT_STOCK: List[str] = [
 ]
 
 
+@dataclass(frozen=True)
+class ShopCatalog:
+    version: int
+    tag_items: Mapping[str, Tuple[str, ...]]
+    tag_positions: Mapping[str, int]
+    buy_prices: Mapping[str, int]
+    sell_prices: Mapping[str, int]
+
+    @classmethod
+    def build(cls, version: int) -> "ShopCatalog":
+        tag_items: Dict[str, List[str]] = {tag: [] for tag in BUILD_TAGS}
+        tag_positions: Dict[str, int] = {}
+        for name, item in EQUIPMENT_ITEMS.items():
+            if is_shop_tier(name):
+                items = tag_items.setdefault(item.tag, [])
+                tag_positions[name] = len(items)
+                items.append(name)
+        buy_prices = dict(EQUIPMENT_SHOP_PRICES)
+        buy_prices.update(ITEM_SHOP_PRICES)
+        sell_prices: Dict[str, int] = {}
+        for name, recipe in CRAFT_RECIPES.items():
+            sell_prices[name] = max(1, int(_recipe_material_total(recipe) * RECIPE_SELL_RATE))
+        for name in ITEM_SHOP_PRICES:
+            if name != "포션":
+                sell_prices[name] = MATERIAL_SELL_PRICE
+        for name, price in EQUIPMENT_SHOP_PRICES.items():
+            sell_prices[name] = max(1, int(price * LIST_SELL_RATE))
+        return cls(
+            version=version,
+            tag_items=MappingProxyType({tag: tuple(items) for tag, items in tag_items.items()}),
+            tag_positions=MappingProxyType(tag_positions),
+            buy_prices=MappingProxyType(buy_prices),
+            sell_prices=MappingProxyType(sell_prices),
+        )
+
+
+_CATALOG: Optional[ShopCatalog] = None
+
+
+def shop_catalog() -> ShopCatalog:
+    global _CATALOG
+    if _CATALOG is None or _CATALOG.version != models.CONTENT_VERSION:
+        _CATALOG = ShopCatalog.build(models.CONTENT_VERSION)
+    return _CATALOG
+
+
 def get_buy_price(item_name: str) -> int:
-    if item_name in ITEM_SHOP_PRICES:
-        return ITEM_SHOP_PRICES[item_name]
-    if item_name in EQUIPMENT_SHOP_PRICES:
-        return EQUIPMENT_SHOP_PRICES[item_name]
-    raise ValueError(f"Unknown item for buy price: {item_name}")
+    price = shop_catalog().buy_prices.get(item_name)
+    if price is None:
+        raise ValueError(f"Unknown item for buy price: {item_name}")
+    return price
 
 
 def get_sell_price(item_name: str) -> int:
-    if item_name in EQUIPMENT_SHOP_PRICES:
-        return max(1, int(EQUIPMENT_SHOP_PRICES[item_name] * LIST_SELL_RATE))
-    if item_name in ITEM_SHOP_PRICES and item_name != "포션":
-        return MATERIAL_SELL_PRICE
-    recipe = CRAFT_RECIPES.get(item_name)
-    if not recipe:
-        return 1
-    total = _recipe_material_total(recipe)
-    return max(1, int(total * RECIPE_SELL_RATE))
+    return shop_catalog().sell_prices.get(item_name, 1)
 
 
 def is_shop_tier(item_name: str) -> bool:
@@ -53,22 +93,21 @@ def build_rotating_stock(
     base_stock: Sequence[str],
     previous: Sequence[str] | None = None,
 ) -> List[str]:
+    catalog = shop_catalog()
+    previous_by_tag: Dict[str, str] = {}
+    for name in previous or ():
+        previous_by_tag.setdefault(EQUIPMENT_ITEMS[name].tag, name)
     rotating: List[str] = []
     for tag in BUILD_TAGS:
-        candidates = [
-            name
-            for name, item in EQUIPMENT_ITEMS.items()
-            if item.tag == tag and is_shop_tier(name)
-        ]
-        if previous:
-            prev_item = next(
-                (name for name in previous if EQUIPMENT_ITEMS[name].tag == tag), ""
-            )
-            if prev_item in candidates and len(candidates) > 1:
-                candidates = [name for name in candidates if name != prev_item]
+        candidates = catalog.tag_items.get(tag, ())
         if not candidates:
             continue
-        rotating.append(rng.choice(candidates))
+        skipped = catalog.tag_positions.get(previous_by_tag.get(tag, ""))
+        if skipped is None or len(candidates) == 1:
+            rotating.append(rng.choice(candidates))
+            continue
+        index = rng.choice(range(len(candidates) - 1))
+        rotating.append(candidates[index + 1 if index >= skipped else index])
     return rotating
 
 
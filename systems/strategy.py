@@ -0,0 +1,117 @@
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+from models import Player
+from systems.combat import CombatPolicy, InteractivePolicy
+from utils.io import safe_int
+from utils.logging import LogBook
+
+
+TURN_DELAY: float = 0.05
+
+TOWN_SHOP: int = 1
+TOWN_INVENTORY: int = 2
+TOWN_EQUIPMENT: int = 3
+TOWN_REST: int = 4
+TOWN_EXPLORE: int = 5
+TOWN_STATUS: int = 6
+TOWN_DEX: int = 7
+TOWN_REPLAY: int = 8
+TOWN_SAVE: int = 9
+TOWN_LOAD: int = 10
+TOWN_QUIT: int = 11
+
+
+class Strategy(ABC):
+    def __init__(self, combat_policy: CombatPolicy, turn_delay: float = 0.0) -> None:
+        self.combat_policy = combat_policy
+        self.turn_delay = turn_delay
+
+    @abstractmethod
+    def town_action(self, player: Player, logbook: LogBook) -> int:
+        ...
+
+    @abstractmethod
+    def shop(self, player: Player, logbook: LogBook, rotating_stock: Sequence[str]) -> None:
+        ...
+
+    @abstractmethod
+    def choose_region(self, player: Player) -> str:
+        ...
+
+    @abstractmethod
+    def enter_true_ending(self, player: Player) -> bool:
+        ...
+
+    @abstractmethod
+    def continue_exploring(self, player: Player, region: str, depth: int) -> bool:
+        ...
+
+    @abstractmethod
+    def choose_level_up(self, player: Player) -> str:
+        ...
+
+    @abstractmethod
+    def merchant(self, player: Player, logbook: LogBook) -> None:
+        ...
+
+    @abstractmethod
+    def blacksmith(self, player: Player, logbook: LogBook) -> None:
+        ...
+
+    def after_expedition(self, player: Player, logbook: LogBook) -> None:
+        return None
+
+
+class InteractiveStrategy(Strategy):
+    def __init__(self) -> None:
+        super().__init__(InteractivePolicy(), TURN_DELAY)
+
+    def town_action(self, player: Player, logbook: LogBook) -> int:
+        print("\n[마을]")
+        print("1) 상점")
+        print("2) 인벤토리")
+        print("3) 장비")
+        print("4) 휴식")
+        print("5) 탐험 출발")
+        print("6) 상태")
+        print("7) 도감 보기")
+        print("8) 로그 리플레이")
+        print("9) 저장")
+        print("10) 불러오기")
+        print("11) 종료")
+        return safe_int("> ", 1, 11)
+
+    def shop(self, player: Player, logbook: LogBook, rotating_stock: Sequence[str]) -> None:
+        from systems.town import shop_menu
+
+        shop_menu(player, logbook, rotating_stock)
+
+    def choose_region(self, player: Player) -> str:
+        from systems.explore import select_region
+
+        return select_region(player)
+
+    def enter_true_ending(self, player: Player) -> bool:
+        print("1) 진엔딩 전투 진입 2) 철수")
+        return safe_int("> ", 1, 2) == 1
+
+    def continue_exploring(self, player: Player, region: str, depth: int) -> bool:
+        from systems.explore import should_continue
+
+        return should_continue(region, depth)
+
+    def choose_level_up(self, player: Player) -> str:
+        from systems.explore import prompt_level_up_choice
+
+        return prompt_level_up_choice()
+
+    def merchant(self, player: Player, logbook: LogBook) -> None:
+        from systems.town import merchant_menu
+
+        merchant_menu(player, logbook)
+
+    def blacksmith(self, player: Player, logbook: LogBook) -> None:
+        from systems.town import blacksmith_menu
+
+        blacksmith_menu(player, logbook)
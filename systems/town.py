@@ -1,6 +1,7 @@
 ﻿
 import random
-from typing import List, Sequence
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
 
 from models import (
     BLACKSMITH_RECIPES,
@@ -19,6 +20,8 @@ from systems.dex import (
     build_equipment_catalog,
     build_material_catalog,
     build_monster_catalog,
+    discover_equipment,
+    discover_material,
 )
 from systems.shop import (
     BASE_EQUIPMENT_STOCK,
@@ -28,8 +31,23 @@ from systems.shop import (
     merge_stock,
 )
 from systems.quests import QuestManager
-from systems.crafting import can_craft, craft_item, get_equipment, list_all_recipes
+from systems.crafting import craft_item, craft_tracker, get_equipment, list_all_recipes, take_materials
 from systems.save import load_game, save_game
+from systems.strategy import (
+    TOWN_DEX,
+    TOWN_EQUIPMENT,
+    TOWN_EXPLORE,
+    TOWN_INVENTORY,
+    TOWN_LOAD,
+    TOWN_REPLAY,
+    TOWN_REST,
+    TOWN_SAVE,
+    TOWN_SHOP,
+    TOWN_STATUS,
+    InteractiveStrategy,
+    Strategy,
+)
+from utils.events import GOLD_EQUIPMENT, GOLD_MATERIAL, GOLD_POTION, GOLD_SALE, EventKind
 from utils.io import safe_int
 from utils.logging import LogBook, log_print
 
@@ -43,6 +61,20 @@ def show_status(player: Player) -> None:
     print(f"방어: {player.defense} (방어구 +{player.armor_level})")
     print(f"골드: {player.gold}")
     print(f"포션: {player.potions}")
+    show_progress(player)
+
+
+def show_progress(player: Player) -> None:
+    from systems.explore import BOSS_TEMPLATE, TRUE_ENDING_REGIONS, true_ending_ready
+
+    world = player.world
+    boss = "처치" if world.has_killed(BOSS_TEMPLATE[0]) else "미처치"
+    ready = "충족" if true_ending_ready(player) else "미충족"
+    print(f"도감 진행률: {world.dex_ratio:.0%}")
+    conquered = sum(world.is_conquered(region) for region in TRUE_ENDING_REGIONS)
+    print(f"정복 지역: {conquered}/{len(TRUE_ENDING_REGIONS)}")
+    print(f"폐허의 왕: {boss}")
+    print(f"진엔딩 조건: {ready}")
 
 
 def show_inventory(player: Player) -> None:
@@ -80,7 +112,7 @@ def show_dex(player: Player, dex_manager: DexManager, logbook: LogBook) -> None:
     for name in monsters:
         status = "발견" if name in dex_manager.monsters else "미발견"
         print(f"- {name}: {status}")
-    true_ending = "달성" if "TRUE_ENDING_CLEAR" in logbook.entries else "미달성"
+    true_ending = "달성" if player.world.true_ending_cleared else "미달성"
     print(f"\n진엔딩 기록: {true_ending}")
 
 
@@ -95,25 +127,27 @@ def shop_menu(player: Player, logbook: LogBook, rotating_stock: Sequence[str]) -
         print("6) 나가기")
         choice = safe_int("> ", 1, 6)
         if choice == 1:
-            buy_item(player, "포션")
+            buy_item(player, "포션", logbook)
         elif choice == 2:
             buy_materials(player, logbook)
         elif choice == 3:
-            sell_materials(player)
+            sell_materials(player, logbook)
         elif choice == 4:
             buy_equipment(player, logbook, rotating_stock)
         elif choice == 5:
-            sell_equipment(player)
+            sell_equipment(player, logbook)
         else:
             break
 
 
-def buy_item(player: Player, item: str) -> None:
+def buy_item(player: Player, item: str, logbook: Optional[LogBook] = None) -> None:
     cost = get_buy_price(item)
     if player.gold < cost:
         print("골드가 부족합니다.")
         return
     player.gold -= cost
+    if logbook is not None:
+        logbook.emit(EventKind.GOLD_SPENT, GOLD_POTION, cost)
     player.potions += 1
     print("포션을 구매했습니다.")
 
@@ -133,12 +167,13 @@ def buy_materials(player: Player, logbook: LogBook) -> None:
         print("골드가 부족합니다.")
         return
     player.gold -= cost
+    logbook.emit(EventKind.GOLD_SPENT, GOLD_MATERIAL, cost)
     player.materials[material] += 1
     print(f"{material}을(를) 구매했습니다.")
-    logbook.add(f"DISCOVER_MATERIAL:{material}")
+    discover_material(player, logbook, material)
 
 
-def sell_materials(player: Player) -> None:
+def sell_materials(player: Player, logbook: Optional[LogBook] = None) -> None:
     materials = list_materials_for_shop()
     print("\n판매할 재료를 선택하세요.")
     for index, name in enumerate(materials, start=1):
@@ -152,33 +187,46 @@ def sell_materials(player: Player) -> None:
         print("재료가 부족합니다.")
         return
     player.materials[material] -= 1
-    player.gold += get_sell_price(material)
+    price = get_sell_price(material)
+    player.gold += price
+    if logbook is not None:
+        logbook.emit(EventKind.GOLD_GAINED, GOLD_SALE, price)
     print(f"{material}을(를) 판매했습니다.")
 
 
-def merchant_event(player: Player, logbook: LogBook) -> None:
+def merchant_event(player: Player, logbook: LogBook, strategy: Optional[Strategy] = None) -> None:
     log_print(logbook, "탐험 중 상인을 만났습니다.")
+    logbook.emit(EventKind.MERCHANT_MET)
     log_print(logbook, "낡은 수레가 덜컹이며 멈춘다.")
+    (strategy or InteractiveStrategy()).merchant(player, logbook)
+
+
+def merchant_menu(player: Player, logbook: LogBook) -> None:
     while True:
         print("1) 구매 2) 판매 3) 나가기")
         choice = safe_int("> ", 1, 3)
         if choice == 1:
             buy_materials(player, logbook)
         elif choice == 2:
-            sell_materials(player)
+            sell_materials(player, logbook)
         else:
             break
 
 
-def blacksmith_event(player: Player, logbook: LogBook) -> None:
+def blacksmith_event(player: Player, logbook: LogBook, strategy: Optional[Strategy] = None) -> None:
     log_print(logbook, "희귀한 대장장이를 만났습니다!")
     log_print(logbook, "쇳불이 튀고 망치 소리가 울린다.")
-    visit_count = sum(1 for line in logbook.entries if line == "BLACKSMITH_VISIT")
+    visit_count = player.world.blacksmith_visits
     if visit_count == 0:
         log_print(logbook, "처음 보는 얼굴이군. 이 불꽃은 오래 남는다.")
     elif visit_count == 2:
         log_print(logbook, "또 왔군. 네가 지나온 길이 망치에 남아 있다.")
+    player.world.blacksmith_visits += 1
     logbook.add("BLACKSMITH_VISIT")
+    (strategy or InteractiveStrategy()).blacksmith(player, logbook)
+
+
+def blacksmith_menu(player: Player, logbook: LogBook) -> None:
     print("1) 무기 성향 변경")
     print("2) 방어구 성향 변경")
     print("3) 특수 장비 제작")
@@ -196,12 +244,9 @@ def blacksmith_event(player: Player, logbook: LogBook) -> None:
 
 
 def craft_equipment(player: Player, recipe_name: str) -> None:
-    recipe = BLACKSMITH_RECIPES[recipe_name]
-    if any(player.materials[name] < count for name, count in recipe.items()):
+    if not take_materials(player.materials, BLACKSMITH_RECIPES[recipe_name]):
         print("재료가 부족합니다.")
         return
-    for name, count in recipe.items():
-        player.materials[name] -= count
     if recipe_name == "무기 강화":
         player.weapon_level += 1
     else:
@@ -240,21 +285,28 @@ def buy_equipment(player: Player, logbook: LogBook, rotating_stock: Sequence[str
     if choice == len(items) + 1:
         return
     selected = items[choice - 1]
-    price = get_buy_price(selected)
-    if player.gold < price:
+    if not purchase_equipment(player, logbook, selected):
         print("골드가 부족합니다.")
         return
+    print(f"{selected}을(를) 구매했습니다.")
+
+
+def purchase_equipment(player: Player, logbook: LogBook, name: str) -> bool:
+    price = get_buy_price(name)
+    if player.gold < price:
+        return False
     player.gold -= price
-    item = EQUIPMENT_ITEMS[selected]
+    logbook.emit(EventKind.GOLD_SPENT, GOLD_EQUIPMENT, price)
+    item = EQUIPMENT_ITEMS[name]
     if item.slot == "weapon":
         player.weapons_owned.append(item.name)
     else:
         player.armors_owned.append(item.name)
-    print(f"{item.name}을(를) 구매했습니다.")
-    logbook.add(f"DISCOVER_EQUIP:{item.name}")
+    discover_equipment(player, logbook, item.name)
+    return True
 
 
-def sell_equipment(player: Player) -> None:
+def sell_equipment(player: Player, logbook: Optional[LogBook] = None) -> None:
     owned_items = [("weapon", name) for name in player.weapons_owned] + [
         ("armor", name) for name in player.armors_owned
     ]
@@ -296,6 +348,8 @@ def sell_equipment(player: Player) -> None:
         if player.armor_item == selected:
             player.armor_item = ""
     player.gold += price
+    if logbook is not None:
+        logbook.emit(EventKind.GOLD_GAINED, GOLD_SALE, price)
     print(f"{selected}을(를) 판매했습니다.")
 
 
@@ -313,22 +367,30 @@ def choose_build_tag(player: Player, slot: str) -> None:
         print(f"방어구 성향이 {tag}(으)로 설정되었습니다.")
 
 
+@lru_cache(maxsize=None)
+def recipe_listing() -> Tuple[Tuple[str, str, str], ...]:
+    listing = []
+    for name in list_all_recipes():
+        item = get_equipment(name)
+        materials = ", ".join(f"{mat}x{count}" for mat, count in CRAFT_RECIPES[name].items())
+        line = f"{item.name} [{item.slot}] +ATK {item.atk} +DEF {item.defense} +EXP {item.explore} ({materials})"
+        listing.append((name, line, item.description))
+    return tuple(listing)
+
+
 def craft_special_item(player: Player, logbook: LogBook) -> None:
-    recipes = list_all_recipes()
-    if not recipes:
+    listing = recipe_listing()
+    if not listing:
         print("제작할 수 있는 장비가 없습니다.")
         return
+    recipes = [name for name, _, _ in listing]
+    tracker = craft_tracker(player.materials)
     print("\n제작 장비 목록:")
-    for index, name in enumerate(recipes, start=1):
-        item = get_equipment(name)
-        recipe = CRAFT_RECIPES[name]
-        materials = ", ".join(f"{mat}x{count}" for mat, count in recipe.items())
-        status = "가능" if can_craft(player.materials, recipe) else "재료 부족"
-        print(
-            f"{index}) {item.name} [{item.slot}] +ATK {item.atk} +DEF {item.defense} +EXP {item.explore} ({materials}) [{status}]"
-        )
-        if item.description:
-            print(f"   {item.description}")
+    for index, (name, line, description) in enumerate(listing, start=1):
+        status = "가능" if tracker.is_craftable(name) else "재료 부족"
+        print(f"{index}) {line} [{status}]")
+        if description:
+            print(f"   {description}")
     print(f"{len(recipes) + 1}) 취소")
     choice = safe_int("> ", 1, len(recipes) + 1)
     if choice == len(recipes) + 1:
@@ -336,19 +398,36 @@ def craft_special_item(player: Player, logbook: LogBook) -> None:
     selected = recipes[choice - 1]
     recipe = CRAFT_RECIPES[selected]
     if any(material in BOSS_MATERIALS for material in recipe):
-        if "BLACKSMITH_BOSS_MATERIAL" not in logbook.entries:
+        if not logbook.has_marker("BLACKSMITH_BOSS_MATERIAL"):
             log_print(logbook, "보스의 잔재로구나. 이 불꽃이 달라진다.")
             logbook.add("BLACKSMITH_BOSS_MATERIAL")
-    if not can_craft(player.materials, recipe):
+    if not tracker.is_craftable(selected):
         print("재료가 부족합니다.")
+        show_craft_plan(player, selected)
         return
     if craft_item(player, selected, logbook):
         if EQUIPMENT_TIERS.get(selected, 1) == 3:
-            if "BLACKSMITH_TIER3_FORGE" not in logbook.entries:
+            if not logbook.has_marker("BLACKSMITH_TIER3_FORGE"):
                 log_print(logbook, "이런 칼날은 두 번 만들지 않는다.")
                 logbook.add("BLACKSMITH_TIER3_FORGE")
 
 
+def show_craft_plan(player: Player, target: str) -> None:
+    from systems.planner import plan_for_player
+
+    plan = plan_for_player(player, target)
+    print(f"제작 계획: 골드 {plan.gold_cost} 사용, 예상 탐험 {plan.expected_turns:.1f}턴")
+    for step in plan.steps:
+        if step.buy:
+            print(f"- {step.material} x{step.buy}: 상점 구매")
+        if step.locked:
+            print(f"- {step.material} x{step.farm}: {step.region} 정복 후 획득 가능")
+        elif step.farm:
+            print(f"- {step.material} x{step.farm}: {step.region} 탐험 (개당 약 {step.turns_per_unit:.1f}턴)")
+    if plan.boss_materials:
+        print(f"- 보스 재료 필요: {', '.join(plan.boss_materials)}")
+
+
 def equip_special_item(player: Player) -> None:
     print("\n장비 슬롯을 선택하세요.")
     print("1) 무기")
@@ -391,65 +470,57 @@ def town_menu(
     quest_manager: QuestManager,
     achievement_manager: AchievementManager,
     dex_manager: DexManager,
+    strategy: Optional[Strategy] = None,
+    rng: Optional[random.Random] = None,
 ) -> None:
-    rng = random.Random()
-    rotating_stock = build_rotating_stock(rng, BASE_EQUIPMENT_STOCK)
+    strategy = strategy or InteractiveStrategy()
+    stock_rng = rng or random.Random()
+    rotating_stock = build_rotating_stock(stock_rng, BASE_EQUIPMENT_STOCK)
     while True:
-        print("\n[마을]")
-        print("1) 상점")
-        print("2) 인벤토리")
-        print("3) 장비")
-        print("4) 휴식")
-        print("5) 탐험 출발")
-        print("6) 상태")
-        print("7) 도감 보기")
-        print("8) 로그 리플레이")
-        print("9) 저장")
-        print("10) 불러오기")
-        print("11) 종료")
-        choice = safe_int("> ", 1, 11)
-        if choice == 1:
-            shop_menu(player, logbook, rotating_stock)
+        choice = strategy.town_action(player, logbook)
+        if choice == TOWN_SHOP:
+            strategy.shop(player, logbook, rotating_stock)
             dex_manager.process(logbook)
             apply_material_completion_reward(player, dex_manager, logbook)
             apply_equipment_completion_reward(player, dex_manager, logbook)
-        elif choice == 2:
+        elif choice == TOWN_INVENTORY:
             show_inventory(player)
-        elif choice == 3:
+        elif choice == TOWN_EQUIPMENT:
             show_equipment(player)
-        elif choice == 4:
+        elif choice == TOWN_REST:
             rest(player)
-        elif choice == 5:
+        elif choice == TOWN_EXPLORE:
             from systems.explore import exploration
 
-            exploration(player, logbook)
+            exploration(player, logbook, strategy, rng)
             quest_manager.process(logbook, player)
             achievement_manager.process(logbook)
             dex_manager.process(logbook)
             apply_material_completion_reward(player, dex_manager, logbook)
             apply_equipment_completion_reward(player, dex_manager, logbook)
             rotating_stock = build_rotating_stock(
-                rng, BASE_EQUIPMENT_STOCK, rotating_stock
+                stock_rng, BASE_EQUIPMENT_STOCK, rotating_stock
             )
+            strategy.after_expedition(player, logbook)
             if player.hp <= 0:
                 print("쓰러졌습니다. 게임 오버.")
                 break
-        elif choice == 6:
+        elif choice == TOWN_STATUS:
             show_status(player)
-        elif choice == 7:
+        elif choice == TOWN_DEX:
             show_dex(player, dex_manager, logbook)
-        elif choice == 8:
+        elif choice == TOWN_REPLAY:
             replay_logs(logbook)
-        elif choice == 9:
+        elif choice == TOWN_SAVE:
             save_game(player, achievement_manager, dex_manager, logbook)
-        elif choice == 10:
+        elif choice == TOWN_LOAD:
             if load_game(player, achievement_manager, dex_manager, logbook):
                 quest_manager.active_quests = []
-                quest_manager.activate_run_quests(logbook)
+                quest_manager.activate_run_quests(logbook, rng)
                 apply_material_completion_reward(player, dex_manager, logbook)
                 apply_equipment_completion_reward(player, dex_manager, logbook)
                 rotating_stock = build_rotating_stock(
-                    rng, BASE_EQUIPMENT_STOCK, rotating_stock
+                    stock_rng, BASE_EQUIPMENT_STOCK, rotating_stock
                 )
         else:
             print("게임을 종료합니다.")
@@ -1,8 +1,13 @@
 ﻿import asyncio
+import contextlib
+import copy
+import io
+import json
 import random
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from models import (
     BOSS_MATERIALS,
@@ -10,25 +15,62 @@ from models import (
     CRAFT_RECIPES,
     EQUIPMENT_ITEMS,
     EQUIPMENT_TIERS,
+    MATERIAL_NAMES,
     Enemy,
+    MaterialBag,
     Player,
+    WorldState,
     get_equipment_bonus,
 )
-from systems import explore
+from sim import montecarlo
+from sim.economy import GOLD_BALANCE, simulate_economy, simulate_economy_run
+from sim.farm import farm_runs, run_seed
+from sim.rewards import cumulative_rewards, turn_rewards
+from sim.runs import BotStrategy, simulate_run
+from sim.solver import solve_battle
+from sim.stopping import StoppingModel, constrained_table, stopping_table
+from systems import explore, shop
 from systems.achievements import AchievementManager
 from systems.combat import (
+    ACTION_ATTACK,
+    ACTION_GUARD,
     BOSS_NAME,
+    STEP_CONTINUE,
+    STEP_ENEMY_DOWN,
+    AlwaysAttackPolicy,
+    CallbackPolicy,
+    CombatPolicy,
+    CombatState,
+    GuardOnChargePolicy,
+    PotionBelowThresholdPolicy,
     apply_bleed_tick,
     apply_damage_reduction,
     calculate_stun_chance,
+    battle,
+    enemy_step,
     is_boss_enraged,
+    player_step,
     resolve_boss_intent,
+    run_battle,
 )
-from systems.crafting import craft_item, list_craftable
+from systems.crafting import craft_batch, craft_item, craft_items, list_craftable
 from systems.dex import DexManager
+from systems.planner import plan_craft
 from systems.quests import Quest, QuestManager
-from systems.save import load_game, save_game
+from systems.save import (
+    build_save_data,
+    convert_save,
+    load_game,
+    read_save_section,
+    save_game,
+    save_store,
+)
+from systems.save_binary import decode_save, encode_save
 from systems.shop import BASE_EQUIPMENT_STOCK, build_rotating_stock, get_sell_price
+from systems.strategy import InteractiveStrategy, Strategy
+from systems.town import show_status
+from utils.events import GOLD_COMBAT, GOLD_POTION, EventKind
+from utils.io import JOURNAL_COMPACT_LIMIT, journal_path
 from utils.logging import LogBook
 
 
@@ -47,6 +89,80 @@ class TestCoreSystems(unittest.TestCase):
         logbook.add("second")
         self.assertEqual(list(logbook.replay()), ["first", "second"])
 
+    def test_logbook_marker_index(self) -> None:
+        logbook = LogBook()
+        logbook.extend(["DISCOVER_MATERIAL:약초", "BLACKSMITH_VISIT", "BLACKSMITH_VISIT"])
+        logbook.add("DISCOVER_MATERIAL:철")
+        self.assertTrue(logbook.has_marker("DISCOVER_MATERIAL:철"))
+        self.assertTrue(logbook.has_marker("BLACKSMITH_VISIT"))
+        self.assertFalse(logbook.has_marker("TRUE_ENDING_CLEAR"))
+
+    def test_region_conquest_lookup(self) -> None:
+        world = WorldState()
+        self.assertIsNone(explore.world_conquest_bonus(world, "초원"))
+        world.conquer("초원")
+        self.assertTrue(world.is_conquered("초원"))
+        self.assertEqual(explore.world_conquest_bonus(world, "초원"), ("초원의 정수", 0.15))
+
+    def test_bounded_logbook_spills_to_segments(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            logbook = LogBook(max_entries=4, spill_dir=Path(tmp_dir), segment_lines=3)
+            lines = [f"line {index}" for index in range(10)]
+            logbook.extend(lines)
+            logbook.add(f"{explore.CONQUEST_LOG_PREFIX}동굴")
+            self.assertLessEqual(len(logbook.entries), 4)
+            self.assertEqual(len(logbook), 11)
+            self.assertEqual(list(logbook.replay()), lines + [f"{explore.CONQUEST_LOG_PREFIX}동굴"])
+            self.assertTrue(logbook.has_marker(f"{explore.CONQUEST_LOG_PREFIX}동굴"))
+
+    def test_bounded_logbook_subscribers_resync_from_segments(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            logbook = LogBook(max_entries=4, spill_dir=Path(tmp_dir), segment_lines=3, echo=False)
+            idle = logbook.subscribe()
+            markers = logbook.subscribe(prefixes=(explore.CONQUEST_LOG_PREFIX,))
+            events = logbook.subscribe_events()
+            lines = [f"line {index}" for index in range(20)]
+            logbook.extend(lines[:10])
+            logbook.add(f"{explore.CONQUEST_LOG_PREFIX}동굴")
+            logbook.extend(lines[10:])
+            for index in range(25):
+                logbook.emit(EventKind.VICTORY, str(index))
+            self.assertLessEqual(len(idle._pending), 4)
+            self.assertLessEqual(len(logbook.events), 4)
+            self.assertEqual(idle.drain(), lines[:10] + [f"{explore.CONQUEST_LOG_PREFIX}동굴"] + lines[10:])
+            self.assertEqual(markers.drain(), [f"{explore.CONQUEST_LOG_PREFIX}동굴"])
+            self.assertEqual([event.subject for event in events.drain()], [str(index) for index in range(25)])
+            late = logbook.subscribe_events()
+            self.assertEqual(len(late.drain()), 25)
+            logbook.add("after")
+            self.assertEqual(idle.drain(), ["after"])
+            logbook.close()
+            self.assertTrue(idle.closed)
+            self.assertEqual((logbook._subscribers, logbook._event_subscribers), ([], []))
+
+    def test_logbook_entries_snapshot_and_boss_ending_scans_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            logbook = LogBook(max_entries=4, spill_dir=Path(tmp_dir), echo=False)
+            logbook.add("first")
+            logbook.entries.clear()
+            logbook.add_template("{}에게 {} 피해!", ("슬라임", 4))
+            self.assertEqual(logbook.entries, ["first", "슬라임에게 4 피해!"])
+            logbook.extend([f"line {index}" for index in range(5)])
+            self.assertEqual(logbook.entries, ["line 1", "line 2", "line 3", "line 4"])
+            self.assertEqual(list(logbook.lines())[:2], ["first", "슬라임에게 4 피해!"])
+            with mock.patch.object(logbook, "lines", wraps=logbook.lines) as lines:
+                explore.boss_ending(logbook, Player(name="tester"))
+            self.assertEqual(lines.call_count, 1)
+
+    def test_logbook_template_entries_format_on_replay(self) -> None:
+        logbook = LogBook()
+        subscription = logbook.subscribe()
+        logbook.add_template("{}에게 {} 피해!", ("슬라임", 4))
+        logbook.add("DISCOVER_MATERIAL:약초")
+        self.assertEqual(list(logbook.replay()), ["슬라임에게 4 피해!"])
+        self.assertEqual(subscription.drain(), ["슬라임에게 4 피해!", "DISCOVER_MATERIAL:약초"])
+        self.assertEqual(len(logbook), 2)
+
     def test_next_level_exp_formula(self) -> None:
         self.assertEqual(explore.next_level_exp(1), 10)
         self.assertEqual(explore.next_level_exp(2), 16)
@@ -81,6 +197,29 @@ class TestCoreSystems(unittest.TestCase):
         self.assertEqual(def_bonus, 1)
         self.assertEqual(explore_bonus, 0.0)
 
+    def test_derived_stats_follow_equipment_changes(self) -> None:
+        player = Player(name="tester")
+        self.assertEqual(player.total_atk, 5)
+        player.weapon_item = "초원의 결의검"
+        player.weapon_level = 1
+        self.assertEqual(player.total_atk, 8)
+        player.armor_tag = "EXPLORER"
+        self.assertEqual(player.total_defense, 1)
+        self.assertAlmostEqual(player.total_explore, 0.05)
+
+    def test_derived_stats_refresh_after_load(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            save_path = Path(tmp_dir) / "savegame.json"
+            achievements = AchievementManager(Path(tmp_dir) / "achievements.json")
+            logbook = LogBook()
+            player = Player(name="tester", atk=9)
+            player.armor_item = "철갑 방패"
+            save_game(player, achievements, DexManager(), logbook, save_path)
+            loaded = Player(name="other")
+            load_game(loaded, achievements, DexManager(), logbook, save_path)
+            self.assertEqual(loaded.total_atk, player.total_atk)
+            self.assertEqual(loaded.total_defense, player.total_defense)
+
     def test_boss_entry_allowed(self) -> None:
         player = Player(name="tester")
         player.level = explore.BOSS_ENTRY_LEVEL
@@ -119,10 +258,210 @@ class TestCoreSystems(unittest.TestCase):
         self.assertIsInstance(drops, list)
         self.assertTrue(enemy is None or isinstance(enemy, Enemy))
 
+    def test_sync_turn_matches_async_turn(self) -> None:
+        region = first_region()
+        for seed in range(20):
+            random.seed(seed)
+            enemy, drops, event = explore.resolve_turn(region, 0.1)
+            random.seed(seed)
+            async_enemy, async_drops, async_event = explore.run_explore_turn(region, 0.1, delay=0.001)
+            self.assertEqual(enemy, async_enemy)
+            self.assertEqual((drops, event), (async_drops, async_event))
+        self.assertIs(explore.turn_loop(), explore.turn_loop())
+
+    def test_headless_run_is_reproducible(self) -> None:
+        summary = simulate_run(3)
+        self.assertEqual(summary, simulate_run(3))
+        self.assertEqual(len(summary.gold_curve), summary.expeditions)
+        self.assertEqual(summary.level, summary.level_curve[-1])
+        self.assertLessEqual(summary.expeditions, BotStrategy().max_expeditions)
+
+    def test_incomplete_strategy_fails_on_instantiation(self) -> None:
+        class TownOnly(Strategy):
+            def town_action(self, player: Player, logbook: LogBook) -> int:
+                return 11
+
+        with self.assertRaises(TypeError):
+            TownOnly(AlwaysAttackPolicy())
+        InteractiveStrategy()
+
+    def test_headless_run_stops_after_budget(self) -> None:
+        with mock.patch("builtins.input", side_effect=AssertionError("prompted")):
+            summary = simulate_run(5, BotStrategy(max_expeditions=2, stop_after_boss=False))
+        self.assertLessEqual(summary.expeditions, 2)
+        self.assertIsNone(summary.boss_kill_expedition)
+
+    def test_farm_results_independent_of_workers(self) -> None:
+        inline = farm_runs(24, master_seed=7, workers=1, chunk_size=5)
+        pooled = farm_runs(24, master_seed=7, workers=2, chunk_size=4)
+        self.assertEqual(inline, pooled)
+        self.assertEqual(inline.runs, 24)
+        self.assertEqual(len(inline.mean_gold_curve), len(inline.gold_totals))
+        self.assertNotEqual(run_seed(7, 0), run_seed(7, 1))
+
+    def test_economy_report_tracks_gold_flow(self) -> None:
+        stages = simulate_economy_run(3)
+        self.assertGreater(sum(stage.get(GOLD_COMBAT, 0) for stage in stages), 0)
+        self.assertEqual(len(stages), simulate_run(3).expeditions)
+        inline = simulate_economy(12, master_seed=2, workers=1, chunk_size=5)
+        pooled = simulate_economy(12, master_seed=2, workers=2, chunk_size=3)
+        self.assertEqual(inline, pooled)
+        self.assertGreater(inline.mean_per_run(GOLD_POTION), 0.0)
+        for low, middle, high in inline.percentiles(GOLD_BALANCE):
+            self.assertLessEqual(low, middle)
+            self.assertLessEqual(middle, high)
+
+    def test_region_table_matches_sequential_rolls(self) -> None:
+        table = explore.region_table("동굴", 0.1, ("수정", 0.5))
+        self.assertIs(table, explore.region_table("동굴", 0.1, ("수정", 0.5)))
+        self.assertEqual(table.drop_thresholds[-1], ("수정", 0.5))
+        batch = table.sample_turns(50, random.Random(4))
+        rng = random.Random(4)
+        expected = [explore.resolve_turn("동굴", 0.1, ("수정", 0.5), rng) for _ in range(50)]
+        self.assertEqual(batch, expected)
+
+    def test_region_table_batch_sampling(self) -> None:
+        table = explore.region_table("폐허 심층")
+        batch = table.sample_batch(2000, seed=3)
+        self.assertEqual(len(batch.events), 2000)
+        self.assertTrue(all(bool(hit) for hit in batch.encounters))
+        self.assertTrue(all(int(index) == 0 for index in batch.monsters))
+        self.assertEqual(len(batch.drops[0]), len(table.drop_thresholds))
+        with mock.patch.object(explore, "np", None):
+            fallback = table.sample_batch(10, seed=1)
+        self.assertEqual(len(fallback.drops), 10)
+
+    def test_turn_rewards_closed_form(self) -> None:
+        boss = turn_rewards("폐허 심층", 1)
+        self.assertEqual(boss.gold, explore.BOSS_TEMPLATE[4] * 1.8 // 1)
+        self.assertEqual(boss.gold_var, 0.0)
+        self.assertAlmostEqual(boss.materials, 0.8 + 0.5)
+        plain = turn_rewards("동굴", 2)
+        conquered = turn_rewards("동굴", 2, conquered=True)
+        self.assertAlmostEqual(conquered.materials - plain.materials, 0.8 * 0.15)
+        halved = turn_rewards("동굴", 2, win_probability=lambda template: 0.5)
+        self.assertAlmostEqual(halved.gold, plain.gold / 2)
+        self.assertIs(turn_rewards("동굴", 2), plain)
+
+    def test_cumulative_rewards_sum_depths(self) -> None:
+        totals = cumulative_rewards("초원", 3, 0.05)
+        self.assertEqual(len(totals), 3)
+        self.assertAlmostEqual(totals[-1].exp, sum(turn_rewards("초원", depth, 0.05).exp for depth in (1, 2, 3)))
+        self.assertEqual(len(cumulative_rewards("폐허 심층", 5)), 1)
+
+    def test_stopping_table_respects_risk(self) -> None:
+        player = Player(name="tester", potions=3)
+        free = stopping_table(player, "초원", max_depth=5)
+        self.assertEqual(free.death_penalty, 0.0)
+        self.assertTrue(free.should_continue(1, player.max_hp, 3))
+        self.assertFalse(free.should_continue(5, player.max_hp, 3))
+        model = StoppingModel(montecarlo.combatant_stats(player), "초원", 5)
+        floor = model.solve(1e9).death_probability
+        safe = constrained_table(model, floor + 0.01)
+        self.assertLessEqual(safe.death_probability, floor + 0.01)
+        self.assertLess(safe.death_probability, free.death_probability)
+        self.assertLess(safe.expected_reward, free.expected_reward)
+        self.assertEqual(stopping_table(player, "폐허 심층").max_depth, 1)
+
     def test_boss_charge_to_heavy(self) -> None:
         self.assertEqual(resolve_boss_intent(False, 0.1), "charge")
         self.assertEqual(resolve_boss_intent(True, 0.9), "heavy")
 
+    def test_headless_battle_matches_interactive(self) -> None:
+        random.seed(11)
+        player = Player(name="tester")
+        enemy = Enemy("고블린", 12, 4, 6, 4)
+        with mock.patch("builtins.input", return_value="1"), contextlib.redirect_stdout(io.StringIO()):
+            won = battle(player, enemy, LogBook())
+        random.seed(11)
+        headless_player = Player(name="tester")
+        headless_enemy = Enemy("고블린", 12, 4, 6, 4)
+        result = run_battle(headless_player, headless_enemy, AlwaysAttackPolicy())
+        self.assertEqual(result.won, won)
+        self.assertEqual(headless_player.hp, player.hp)
+        self.assertEqual(headless_enemy.hp, enemy.hp)
+        self.assertEqual(result.damage_taken, 20 - player.hp)
+
+    def test_potion_policy_records_usage(self) -> None:
+        random.seed(3)
+        player = Player(name="tester")
+        player.hp = 5
+        result = run_battle(player, Enemy("슬라임", 10, 3, 4, 3), PotionBelowThresholdPolicy(6))
+        self.assertGreaterEqual(result.potions_used, 1)
+        self.assertEqual(player.potions, 2 - result.potions_used)
+
+    def test_combat_state_steps_mutate_in_place(self) -> None:
+        player = Player(name="tester")
+        state = CombatState(player, Enemy("슬라임", 5, 4, 4, 3))
+        self.assertEqual(player_step(state, ACTION_GUARD), STEP_CONTINUE)
+        self.assertEqual(state.next_attack_bonus, 1)
+        with mock.patch("random.random", return_value=0.99):
+            self.assertEqual(enemy_step(state), STEP_CONTINUE)
+        self.assertEqual(state.player_hp, 19)
+        self.assertEqual(player_step(state, ACTION_ATTACK), STEP_ENEMY_DOWN)
+        self.assertEqual(state.damage_dealt, 5)
+        self.assertEqual(player.hp, 20)
+
+    def test_policy_sees_live_combat_state(self) -> None:
+        random.seed(2)
+        seen = []
+        player = Player(name="tester")
+        result = run_battle(
+            player, Enemy("고블린", 12, 4, 6, 4), CallbackPolicy(lambda view: seen.append(view.enemy_hp) or 1)
+        )
+        self.assertTrue(result.won)
+        self.assertEqual(seen[0], 12)
+        self.assertEqual(len(seen), result.turns)
+
+    def test_incomplete_policy_fails_on_instantiation(self) -> None:
+        class NoChoice(CombatPolicy):
+            pass
+
+        with self.assertRaises(TypeError):
+            NoChoice()
+        with self.assertRaises(TypeError):
+            CombatPolicy()
+
+    @unittest.skipUnless(montecarlo.numpy_available(), "numpy not installed")
+    def test_vectorized_simulation_matches_engine(self) -> None:
+        player = Player(name="tester", max_hp=40, hp=40, atk=9, defense=3)
+        policy = GuardOnChargePolicy(PotionBelowThresholdPolicy(8))
+        template = montecarlo.phase_two_template()
+        vectorized = montecarlo.simulate_battles(player, template, 100000, policy, phase_two=True, seed=1)
+        scalar = montecarlo._simulate_scalar(player, template, 10000, policy, True, 1)
+        self.assertAlmostEqual(vectorized.win_rate, scalar.win_rate, delta=0.02)
+        self.assertAlmostEqual(vectorized.mean_turns, scalar.mean_turns, delta=0.1)
+
+    def test_simulation_falls_back_for_custom_policy(self) -> None:
+        player = Player(name="tester")
+        result = montecarlo.simulate_battles(
+            player, explore.REGION_MONSTERS["초원"][0], 20, CallbackPolicy(lambda view: 4), seed=5
+        )
+        self.assertEqual(result.wins + result.losses + result.escapes, 20)
+        self.assertGreater(result.escapes, 0)
+        self.assertEqual(player.hp, 20)
+
+    def test_solver_exact_simple_fight(self) -> None:
+        player = Player(name="tester")
+        solution = solve_battle(player, explore.REGION_MONSTERS["초원"][0])
+        self.assertAlmostEqual(solution.win_probability, 1.0)
+        self.assertAlmostEqual(solution.expected_turns, 2.0)
+
+    def test_solver_escape_probability(self) -> None:
+        player = Player(name="tester")
+        solution = solve_battle(player, explore.REGION_MONSTERS["초원"][0], CallbackPolicy(lambda view: 4))
+        self.assertAlmostEqual(solution.loss_probability, 0.5**20)
+        self.assertAlmostEqual(solution.escape_probability, 1.0 - 0.5**20)
+
+    @unittest.skipUnless(montecarlo.numpy_available(), "numpy not installed")
+    def test_solver_matches_simulation_for_boss(self) -> None:
+        player = Player(name="tester", max_hp=30, hp=30, atk=6, defense=2, potions=4)
+        policy = GuardOnChargePolicy(PotionBelowThresholdPolicy(8))
+        solution = solve_battle(player, explore.BOSS_TEMPLATE, policy)
+        simulated = montecarlo.simulate_battles(player, explore.BOSS_TEMPLATE, 200000, policy, seed=4)
+        self.assertAlmostEqual(solution.win_probability, simulated.win_rate, delta=0.01)
+        self.assertAlmostEqual(solution.expected_turns, simulated.mean_turns, delta=0.05)
+
     def test_guard_reduces_damage(self) -> None:
         reduced = apply_damage_reduction(10, False, True)
         self.assertLess(reduced, 10)
@@ -147,6 +486,7 @@ class TestCoreSystems(unittest.TestCase):
         player = Player(name="tester")
         logbook = LogBook()
         logbook.add("전투 승리! 경험치 1, 골드 1 획득!")
+        logbook.emit(EventKind.VICTORY, "슬라임")
         quest_manager.process(logbook, player)
         self.assertTrue(quest_manager.active_quests[0].completed)
         self.assertEqual(player.gold, 13)
@@ -157,10 +497,50 @@ class TestCoreSystems(unittest.TestCase):
             manager = AchievementManager(storage_path)
             logbook = LogBook()
             logbook.add("폐허의 왕을 쓰러뜨렸습니다. 새로운 엔딩이 열립니다.")
+            logbook.emit(EventKind.BOSS_DEFEATED, BOSS_NAME)
             manager.process(logbook)
             manager.process(logbook)
             self.assertEqual(len(manager.unlocked), 1)
 
+    def test_true_ending_clear_does_not_count_as_first_boss_clear(self) -> None:
+        class BossBot(BotStrategy):
+            def choose_region(self, player: Player) -> str:
+                return "폐허 심층"
+
+        boss = Enemy(BOSS_NAME, 1, 1, 1, 1)
+        for ready, expected in ((False, {"first_boss_clear"}), (True, {"true_ending_clear"})):
+            logbook = LogBook(echo=False)
+            with mock.patch.object(explore, "true_ending_ready", return_value=ready), mock.patch.object(
+                explore, "resolve_turn", return_value=(boss, [], "none")
+            ), mock.patch.object(explore, "run_battle", return_value=mock.Mock(won=True)):
+                explore.exploration(Player(name="tester"), logbook, BossBot(), random.Random(1))
+            manager = AchievementManager(None)
+            manager.process(logbook)
+            self.assertEqual(manager.unlocked, expected)
+
+    def test_achievement_bleed_kill_from_events(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            manager = AchievementManager(Path(tmp_dir) / "achievements.json")
+            logbook = LogBook()
+            logbook.emit(EventKind.VICTORY, "슬라임")
+            manager.process(logbook)
+            self.assertNotIn("bleed_kill", manager.unlocked)
+            logbook.emit(EventKind.BLEED_TICK, "슬라임", 2)
+            logbook.emit(EventKind.VICTORY, "슬라임")
+            manager.process(logbook)
+            self.assertIn("bleed_kill", manager.unlocked)
+
+    def test_craft_emits_event_for_quests(self) -> None:
+        quest = Quest("craft_1", "장비 1회 제작", "craft", 1, reward_gold=4)
+        quest_manager = QuestManager([quest])
+        player = Player(name="tester")
+        player.materials["약초"] = 2
+        player.materials["사슴뿔"] = 1
+        logbook = LogBook()
+        craft_item(player, "길잡이 활", logbook)
+        quest_manager.process(logbook, player)
+        self.assertTrue(quest_manager.active_quests[0].completed)
+
     def test_quest_process_no_flow_impact(self) -> None:
         player = Player(name="tester")
         player.hp = 15
@@ -193,6 +573,158 @@ class TestCoreSystems(unittest.TestCase):
             self.assertEqual(player.materials["철"], 2)
             self.assertIn("first_boss_clear", achievements.unlocked)
 
+    def test_save_journals_deltas_and_compacts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            save_path = Path(tmp_dir) / "savegame.json"
+            achievements = AchievementManager(Path(tmp_dir) / "achievements.json")
+            logbook = LogBook(echo=False)
+            player = Player(name="tester")
+            save_game(player, achievements, DexManager(), logbook, save_path)
+            snapshot = save_path.read_bytes()
+            player.gold = 77
+            player.materials["철"] = 4
+            save_game(player, achievements, DexManager(), logbook, save_path)
+            self.assertEqual(save_path.read_bytes(), snapshot)
+            journal = journal_path(save_path)
+            self.assertEqual(len(journal.read_bytes().splitlines()), 1)
+            with journal.open("a", encoding="utf-8") as handle:
+                handle.write('{"set": [[["player", "gold"], 5')
+            loaded = Player(name="other")
+            self.assertTrue(load_game(loaded, achievements, DexManager(), logbook, save_path))
+            self.assertEqual((loaded.gold, loaded.materials["철"]), (77, 4))
+            self.assertEqual(len(journal.read_bytes().splitlines()), 1)
+            for gold in range(JOURNAL_COMPACT_LIMIT):
+                player.gold = gold
+                save_game(player, achievements, DexManager(), logbook, save_path)
+            self.assertLess(save_store(save_path).journal.entries, JOURNAL_COMPACT_LIMIT)
+            load_game(loaded, achievements, DexManager(), logbook, save_path)
+            self.assertEqual(loaded.gold, JOURNAL_COMPACT_LIMIT - 1)
+
+    def test_tracked_saves_journal_only_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            save_path = Path(tmp_dir) / "savegame.json"
+            achievements = AchievementManager(None)
+            dex_manager = DexManager()
+            logbook = LogBook(echo=False)
+            player = Player(name="tester")
+            save_game(player, achievements, dex_manager, logbook, save_path)
+            self.assertIs(save_store(save_path), save_store(Path(tmp_dir) / "." / "savegame.json"))
+            player.gold = 50
+            player.materials["철"] = 3
+            player.weapons_owned.append("피의 전투도끼")
+            with mock.patch("systems.save.build_save_data", side_effect=AssertionError("full rebuild")):
+                save_game(player, achievements, dex_manager, logbook, save_path)
+            record = json.loads(journal_path(save_path).read_text(encoding="utf-8"))
+            self.assertEqual(
+                sorted(path for path, _ in record["set"]),
+                [["player", "gold"], ["player", "materials", "철"], ["player", "weapons_owned"]],
+            )
+            player.materials = {"약초": 4}
+            save_game(player, achievements, dex_manager, logbook, save_path)
+            loaded = Player(name="other")
+            load_game(loaded, achievements, dex_manager, logbook, save_path)
+            self.assertEqual((loaded.gold, loaded.materials["약초"], loaded.materials["철"]), (50, 4, 0))
+            self.assertEqual(loaded.weapons_owned, ["피의 전투도끼"])
+
+    def test_fresh_snapshot_retires_stale_journal_first(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            save_path = Path(tmp_dir) / "savegame.json"
+            save_path.write_text("{torn", encoding="utf-8")
+            journal = journal_path(save_path)
+            journal.write_text('{"set": [[["player", "gold"], 5]], "del": []}\n', encoding="utf-8")
+            player = Player(name="tester", gold=7)
+            args = (player, AchievementManager(None), DexManager(), LogBook(echo=False), save_path)
+            with mock.patch("systems.save.atomic_write_bytes", side_effect=OSError("crash")):
+                with self.assertRaises(OSError):
+                    save_game(*args)
+            self.assertFalse(journal.exists())
+            save_game(*args)
+            loaded = Player(name="other")
+            load_game(loaded, *args[1:])
+            self.assertEqual(loaded.gold, 7)
+
+    def test_achievements_journal_unlocks(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            storage_path = Path(tmp_dir) / "achievements.json"
+            manager = AchievementManager(storage_path)
+            manager.unlock("first_craft", LogBook(echo=False))
+            self.assertFalse(storage_path.exists())
+            self.assertEqual(AchievementManager(storage_path).unlocked, {"first_craft"})
+            manager.save()
+            self.assertFalse(journal_path(storage_path).exists())
+            self.assertEqual(AchievementManager(storage_path).unlocked, {"first_craft"})
+
+    def test_binary_save_roundtrips_json(self) -> None:
+        player = Player(name="tester", gold=321)
+        player.materials["수정"] = 5
+        player.materials["이름 없는 돌"] = 1
+        player.weapons_owned = ["피의 전투도끼", "피의 전투도끼", "전설의 몽둥이"]
+        player.world.conquer("동굴")
+        player.world.discover_material("수정")
+        achievements = AchievementManager(None)
+        achievements.set_unlocked(["first_craft", "old_badge"])
+        data = json.loads(json.dumps(build_save_data(player, achievements, DexManager(["수정"], [], ["슬라임"]))))
+        self.assertEqual(decode_save(encode_save(data)), data)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = Path(tmp_dir) / "savegame.json"
+            binary_path = Path(tmp_dir) / "savegame.sav"
+            logbook = LogBook(echo=False)
+            save_game(player, achievements, DexManager(), logbook, json_path)
+            convert_save(json_path, binary_path)
+            self.assertEqual(read_save_section(binary_path, "player")["gold"], 321)
+            self.assertEqual(read_save_section(binary_path, "progress")["location"], "town")
+            loaded = Player(name="other")
+            self.assertTrue(load_game(loaded, achievements, DexManager(), logbook, binary_path))
+            self.assertEqual(loaded.weapons_owned, player.weapons_owned)
+            self.assertEqual(loaded.materials["수정"], 5)
+            convert_save(binary_path, Path(tmp_dir) / "back.json")
+            self.assertEqual(
+                json.loads((Path(tmp_dir) / "back.json").read_text(encoding="utf-8")),
+                json.loads(json_path.read_text(encoding="utf-8")),
+            )
+
+    def test_binary_convert_accepts_partial_and_reordered_saves(self) -> None:
+        partial = {
+            "version": "2.0",
+            "player": {"name": "tester", "level": 3, "gold": 50, "materials": {"수정": 2}},
+            "world": {"conquered_regions": ["동굴"]},
+            "dex": {"materials": ["수정"], "equipment": [], "monsters": []},
+        }
+        achievements = AchievementManager(None)
+        logbook = LogBook(echo=False)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = Path(tmp_dir) / "partial.json"
+            binary_path = Path(tmp_dir) / "partial.sav"
+            json_path.write_text(json.dumps(partial, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+            convert_save(json_path, binary_path)
+            from_json = Player(name="other")
+            from_binary = Player(name="other")
+            load_game(from_json, achievements, DexManager(), logbook, json_path)
+            load_game(from_binary, achievements, DexManager(), logbook, binary_path)
+            self.assertEqual(from_binary, from_json)
+            self.assertEqual(from_binary.world.discovered_materials, {"수정"})
+
+            full = build_save_data(Player(name="tester", gold=77), achievements, DexManager())
+            reordered = json.loads(json.dumps(full, sort_keys=True))
+            self.assertEqual(decode_save(encode_save(reordered)), full)
+            reordered["player"]["mana"] = 1
+            with self.assertRaises(ValueError):
+                encode_save(reordered)
+
+    def test_binary_section_read_replays_journal(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            save_path = Path(tmp_dir) / "s.sav"
+            achievements = AchievementManager(None)
+            logbook = LogBook(echo=False)
+            player = Player(name="tester", gold=10)
+            save_game(player, achievements, DexManager(), logbook, save_path)
+            player.gold = 999
+            save_game(player, achievements, DexManager(), logbook, save_path)
+            self.assertTrue(journal_path(save_path).exists())
+            self.assertEqual(read_save_section(save_path, "player")["gold"], 999)
+            save_store(save_path).compact()
+            self.assertEqual(read_save_section(save_path, "player")["gold"], 999)
+
     def test_load_missing_file(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             save_path = Path(tmp_dir) / "missing.json"
@@ -233,6 +765,83 @@ class TestCoreSystems(unittest.TestCase):
         craftable = list_craftable(materials)
         self.assertIn("길잡이 활", craftable)
 
+    def test_craft_tracker_matches_full_scan(self) -> None:
+        rng = random.Random(5)
+        player = Player(name="tester")
+        self.assertEqual(list_craftable(player.materials), [])
+        names = sorted({name for recipe in CRAFT_RECIPES.values() for name in recipe})
+        for _ in range(300):
+            name = rng.choice(names)
+            player.materials[name] = max(0, player.materials[name] + rng.choice((-2, -1, 1, 2)))
+            self.assertEqual(list_craftable(player.materials), list_craftable(dict(player.materials)))
+        player.materials = {"약초": 2, "사슴뿔": 1}
+        self.assertIsInstance(player.materials, MaterialBag)
+        self.assertIn("길잡이 활", list_craftable(player.materials))
+
+    def test_craft_tracker_follows_every_mutation(self) -> None:
+        player = Player(name="tester")
+        materials = player.materials
+        materials.update({"사슴뿔": 2, "야생꽃": 1, "철": 1})
+        self.assertEqual(list_craftable(materials), ["초원의 결의검", "피의 전투도끼"])
+
+        def check() -> None:
+            self.assertEqual(list_craftable(materials), list_craftable(dict(materials)))
+
+        del materials["철"]
+        check()
+        self.assertEqual(materials.pop("야생꽃"), 1)
+        check()
+        materials |= {"야생꽃": 1, "철": 1}
+        check()
+        materials.popitem()
+        check()
+        materials.clear()
+        check()
+        materials.update({"사슴뿔": 2, "야생꽃": 1})
+        for clone in (copy.deepcopy(player), copy.copy(player.materials)):
+            bag = clone.materials if isinstance(clone, Player) else clone
+            self.assertEqual(bag.listeners, [])
+            self.assertEqual(list_craftable(bag), ["초원의 결의검"])
+            bag["철"] = 1
+            self.assertEqual(list_craftable(bag), ["초원의 결의검", "피의 전투도끼"])
+        self.assertEqual(list_craftable(materials), ["초원의 결의검"])
+
+    def test_craft_plan_trades_gold_for_turns(self) -> None:
+        broke = plan_craft("철벽 단검", {}, 0)
+        self.assertEqual(broke.gold_cost, 0)
+        self.assertEqual(dict(broke.region_turns).keys(), {"동굴"})
+        rich = plan_craft("철벽 단검", {}, 100)
+        self.assertEqual(rich.expected_turns, 0.0)
+        self.assertEqual(rich.gold_cost, 12)
+        self.assertTrue(plan_craft("철벽 단검", {"철": 2, "수정": 1}, 0).ready)
+        cloak = plan_craft("별빛 망토", {}, 100)
+        self.assertEqual(cloak.boss_materials, ("왕의 심장석",))
+        self.assertFalse(cloak.feasible)
+        self.assertEqual(cloak.cost, float("inf"))
+        locked = plan_craft("별빛 망토", {}, 100, conquered=("초원",))
+        self.assertEqual([step.material for step in locked.steps if step.locked], ["왕의 심장석"])
+        held = plan_craft("별빛 망토", {"왕의 심장석": 1}, 100, conquered=("초원",))
+        self.assertTrue(held.feasible)
+        self.assertNotIn("폐허 심층", dict(held.region_turns))
+
+    def test_craft_batch_is_all_or_nothing(self) -> None:
+        player = Player(name="tester")
+        logbook = LogBook(echo=False)
+        player.materials.update({"약초": 5, "사슴뿔": 2, "야생꽃": 1})
+        failed = craft_batch(player, {"길잡이 활": 2, "초원의 경갑": 1}, logbook)
+        self.assertFalse(failed.ok)
+        self.assertEqual(failed.missing, {"야생꽃": 1})
+        self.assertEqual(player.materials["약초"], 5)
+        self.assertEqual(player.weapons_owned, [])
+        result = craft_items(player, ["길잡이 활", "길잡이 활"], logbook)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.consumed, {"약초": 4, "사슴뿔": 2})
+        self.assertEqual(player.weapons_owned, ["길잡이 활", "길잡이 활"])
+        self.assertEqual(player.materials["약초"], 1)
+        crafted = [event for event in logbook.events if event.kind == EventKind.CRAFTED]
+        self.assertEqual([(event.subject, event.amount) for event in crafted], [("길잡이 활", 2)])
+        self.assertIn("제작 완료: 길잡이 활 x2", logbook.entries)
+
     def test_sell_price_listed_equipment(self) -> None:
         self.assertEqual(get_sell_price("초원의 결의검"), 6)
 
@@ -246,6 +855,24 @@ class TestCoreSystems(unittest.TestCase):
         for tag in BUILD_TAGS:
             self.assertTrue(any(EQUIPMENT_ITEMS[name].tag == tag for name in rotating))
 
+    def test_shop_catalog_rebuilds_on_content_version(self) -> None:
+        catalog = shop.shop_catalog()
+        self.assertIs(catalog, shop.shop_catalog())
+        self.assertEqual(catalog.buy_prices["포션"], 5)
+        with mock.patch("models.CONTENT_VERSION", catalog.version + 1):
+            rebuilt = shop.shop_catalog()
+            self.assertIsNot(rebuilt, catalog)
+            self.assertEqual(rebuilt.version, catalog.version + 1)
+        rng = random.Random(9)
+        previous = build_rotating_stock(rng, BASE_EQUIPMENT_STOCK)
+        for _ in range(20):
+            rotating = build_rotating_stock(rng, BASE_EQUIPMENT_STOCK, previous)
+            for name in rotating:
+                tag = EQUIPMENT_ITEMS[name].tag
+                if len(shop.shop_catalog().tag_items[tag]) > 1:
+                    self.assertNotIn(name, previous)
+            previous = rotating
+
     def test_rotating_stock_excludes_tier3(self) -> None:
         rng = random.Random(2)
         rotating = build_rotating_stock(rng, BASE_EQUIPMENT_STOCK)
@@ -270,6 +897,27 @@ class TestCoreSystems(unittest.TestCase):
         dex_manager.process(logbook)
         self.assertIn("약초", dex_manager.materials)
 
+    def test_dex_processes_only_new_entries(self) -> None:
+        logbook = LogBook()
+        logbook.add("DISCOVER_MATERIAL:약초")
+        dex_manager = DexManager()
+        dex_manager.process(logbook)
+        dex_manager.materials.clear()
+        logbook.add("DISCOVER_MATERIAL:철")
+        dex_manager.process(logbook)
+        self.assertEqual(dex_manager.materials, {"철"})
+
+    def test_log_subscription_delivers_once(self) -> None:
+        logbook = LogBook()
+        logbook.add("first")
+        subscription = logbook.subscribe(from_start=False)
+        logbook.add("second")
+        self.assertEqual(subscription.drain(), ["second"])
+        self.assertEqual(subscription.drain(), [])
+        subscription.close()
+        logbook.add("third")
+        self.assertEqual(subscription.drain(), [])
+
     def test_dex_equipment_discovery(self) -> None:
         player = Player(name="tester")
         player.materials["사슴뿔"] = 2
@@ -295,6 +943,42 @@ class TestCoreSystems(unittest.TestCase):
             self.assertIn("초원의 결의검", loaded_dex.equipment)
             self.assertIn("슬라임", loaded_dex.monsters)
 
+    def test_world_state_survives_save(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            save_path = Path(tmp_dir) / "savegame.json"
+            player = Player(name="tester")
+            player.world.conquer("초원")
+            player.world.record_boss_kill(explore.BOSS_TEMPLATE[0])
+            player.world.true_ending_cleared = True
+            player.world.blacksmith_visits = 3
+            save_game(player, AchievementManager(None), DexManager(), LogBook(echo=False), save_path)
+            loaded = Player(name="loaded")
+            load_game(loaded, AchievementManager(None), DexManager(), LogBook(echo=False), save_path)
+            self.assertEqual(loaded.world, player.world)
+            self.assertEqual(explore.world_conquest_bonus(loaded.world, "초원"), ("초원의 정수", 0.15))
+            self.assertIsNone(explore.world_conquest_bonus(loaded.world, "동굴"))
+
+    def test_true_ending_readiness_counters(self) -> None:
+        player = Player(name="tester")
+        logbook = LogBook(echo=False)
+        for region in explore.TRUE_ENDING_REGIONS:
+            player.world.conquer(region)
+        player.world.record_boss_kill(explore.BOSS_TEMPLATE[0])
+        explore.apply_drops(player, ["약초", "약초"], logbook)
+        self.assertEqual(player.world.discovered_materials, {"약초"})
+        self.assertFalse(explore.true_ending_ready(player))
+        for name in MATERIAL_NAMES:
+            player.world.discover_material(name)
+        for name in EQUIPMENT_ITEMS:
+            player.world.discover_equipment(name)
+        self.assertFalse(player.world.discover_equipment("없는 장비"))
+        self.assertEqual(player.world.dex_ratio, 1.0)
+        self.assertTrue(explore.true_ending_ready(player))
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            show_status(player)
+        self.assertIn("도감 진행률: 100%", output.getvalue())
+        self.assertIn("진엔딩 조건: 충족", output.getvalue())
+
     def test_new_material_in_region_drops(self) -> None:
         self.assertTrue(
             any(name == "이끼씨앗" for name, _ in explore.REGION_DROPS["초원"])
@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Tuple
+
+
+class EventKind(Enum):
+    VICTORY = "victory"
+    MATERIAL_GAINED = "material"
+    MERCHANT_MET = "merchant"
+    CRAFTED = "craft"
+    BLEED_TICK = "bleed"
+    BOSS_CHARGE = "boss_charge"
+    ENEMY_STUNNED = "enemy_stunned"
+    BOSS_DEFEATED = "boss_defeated"
+    TRUE_ENDING_CLEAR = "true_ending_clear"
+    GOLD_GAINED = "gold_gained"
+    GOLD_SPENT = "gold_spent"
+
+
+GOLD_COMBAT: str = "combat"
+GOLD_QUEST: str = "quest"
+GOLD_DEX: str = "dex"
+GOLD_SALE: str = "sale"
+GOLD_POTION: str = "potion"
+GOLD_MATERIAL: str = "material"
+GOLD_EQUIPMENT: str = "equipment"
+GOLD_SOURCES: Tuple[str, ...] = (GOLD_COMBAT, GOLD_QUEST, GOLD_DEX, GOLD_SALE)
+GOLD_SINKS: Tuple[str, ...] = (GOLD_POTION, GOLD_MATERIAL, GOLD_EQUIPMENT)
+
+
+@dataclass(frozen=True, slots=True)
+class LogEvent:
+    kind: EventKind
+    subject: str = ""
+    amount: int = 1
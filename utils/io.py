@@ -1,4 +1,12 @@
-﻿from typing import List
+﻿import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, List
+
+
+JOURNAL_SUFFIX: str = ".journal"
+JOURNAL_COMPACT_LIMIT: int = 64
 
 
 def safe_int(prompt: str, min_value: int, max_value: int) -> int:
@@ -19,3 +27,67 @@ def clamp(value: int, min_value: int, max_value: int) -> int:
 
 def list_to_text(items: List[str]) -> str:
     return ", ".join(items) if items else "없음"
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def dump_json(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def journal_path(path: Path) -> Path:
+    return path.with_name(path.name + JOURNAL_SUFFIX)
+
+
+class Journal:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries = 0
+
+    def read(self) -> List[Any]:
+        try:
+            raw = self.path.read_bytes()
+        except FileNotFoundError:
+            self.entries = 0
+            return []
+        records: List[Any] = []
+        good = 0
+        for line in raw.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                records.append(json.loads(line))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                break
+            good += len(line)
+        if good < len(raw):
+            with self.path.open("r+b") as handle:
+                handle.truncate(good)
+        self.entries = len(records)
+        return records
+
+    def append(self, record: Any) -> None:
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(dump_json(record) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.entries += 1
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.entries = 0
@@ -1,26 +1,321 @@
-﻿from typing import Iterator, List
+﻿import json
+import shutil
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Generic, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from utils.events import EventKind, LogEvent
+
+
+MARKER_PREFIXES: Tuple[str, ...] = (
+    "REGION_CONQUEST:",
+    "DISCOVER_",
+    "KILL_BOSS:",
+    "TRUE_ENDING_",
+    "BLACKSMITH_",
+    "DEX_REWARD:",
+)
+REPLAY_HIDDEN_PREFIXES: Tuple[str, ...] = (
+    "DISCOVER_",
+    "KILL_BOSS:",
+    "TRUE_ENDING_",
+    "DEX_REWARD:",
+)
+SEGMENT_LINES: int = 10000
+RAW_TEMPLATE_ID: int = 0
+
+_TEMPLATES: List[str] = ["{}"]
+_TEMPLATE_IDS: Dict[str, int] = {"{}": RAW_TEMPLATE_ID}
+
+
+T = TypeVar("T")
+
+
+def intern_template(template: str) -> int:
+    template_id = _TEMPLATE_IDS.get(template)
+    if template_id is None:
+        template_id = len(_TEMPLATES)
+        _TEMPLATES.append(template)
+        _TEMPLATE_IDS[template] = template_id
+    return template_id
+
+
+def format_entry(template_id: int, args: Any) -> str:
+    if template_id == RAW_TEMPLATE_ID:
+        return args
+    return _TEMPLATES[template_id].format(*args)
+
+
+class SegmentLog:
+    def __init__(self, spill_dir: Optional[Path], name: str, segment_lines: int) -> None:
+        self.spill_dir = spill_dir
+        self.name = name
+        self.segment_lines = segment_lines
+        self.segments: List[Path] = []
+        self.fill = 0
+        self.spilled = 0
+
+    def append(self, rows: List[Any]) -> None:
+        index = 0
+        while index < len(rows):
+            if not self.segments or self.fill >= self.segment_lines:
+                self.segments.append(self.spill_dir / f"{self.name}_{len(self.segments):06d}.log")
+                self.fill = 0
+            chunk = rows[index : index + self.segment_lines - self.fill]
+            with self.segments[-1].open("a", encoding="utf-8") as segment:
+                segment.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in chunk)
+            self.fill += len(chunk)
+            index += len(chunk)
+        self.spilled += len(rows)
+
+    def read_from(self, position: int = 0) -> Iterator[Any]:
+        first = max(0, position) // self.segment_lines
+        skip = max(0, position) - first * self.segment_lines
+        for path in self.segments[first:]:
+            with path.open(encoding="utf-8") as segment:
+                for raw in segment:
+                    if skip:
+                        skip -= 1
+                        continue
+                    yield json.loads(raw)
+
+    def clear(self) -> None:
+        self.segments = []
+        self.fill = 0
+        self.spilled = 0
+
+
+class LogSubscription(Generic[T]):
+    def __init__(
+        self,
+        logbook: "LogBook",
+        events: bool = False,
+        prefixes: Optional[Tuple[str, ...]] = None,
+        resync_from: Optional[int] = None,
+    ) -> None:
+        self.logbook = logbook
+        self.events = events
+        self.prefixes = prefixes
+        self.closed = False
+        self._pending: List[T] = []
+        self._first_position = 0
+        self._resync_from = resync_from
+
+    def push(self, item: T, position: int) -> None:
+        if self._resync_from is not None:
+            return
+        if not self._pending:
+            self._first_position = position
+        self._pending.append(item)
+        limit = self.logbook.max_entries
+        if limit is not None and len(self._pending) > limit:
+            self._resync_from = self._first_position
+            self._pending = []
+
+    def drain(self) -> List[T]:
+        if self._resync_from is not None:
+            position = self._resync_from
+            self._resync_from = None
+            if self.events:
+                return list(self.logbook.events_from(position))
+            return [
+                line
+                for line in self.logbook.lines_from(position)
+                if self.prefixes is None or line.startswith(self.prefixes)
+            ]
+        items = self._pending
+        self._pending = []
+        return items
+
+    def close(self) -> None:
+        self.logbook.unsubscribe(self)
+        self.closed = True
+        self._pending = []
+        self._resync_from = None
+
+
+class LogCursor(Generic[T]):
+    def __init__(self, events: bool = False, prefixes: Optional[Tuple[str, ...]] = None) -> None:
+        self.events = events
+        self.prefixes = prefixes
+        self._subscription: Optional[LogSubscription[T]] = None
+
+    def read(self, logbook: "LogBook") -> List[T]:
+        subscription = self._subscription
+        if subscription is None or subscription.closed or subscription.logbook is not logbook:
+            self.reset()
+            if self.events:
+                self._subscription = logbook.subscribe_events()
+            else:
+                self._subscription = logbook.subscribe(prefixes=self.prefixes)
+        return self._subscription.drain()
+
+    def skip(self, logbook: "LogBook") -> None:
+        self.read(logbook)
+
+    def reset(self) -> None:
+        if self._subscription is not None:
+            self._subscription.close()
+        self._subscription = None
 
 
 class LogBook:
-    def __init__(self) -> None:
-        self.entries: List[str] = []
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        spill_dir: Optional[Path] = None,
+        segment_lines: int = SEGMENT_LINES,
+        echo: bool = True,
+    ) -> None:
+        self.max_entries = max_entries
+        self.echo = echo
+        self.spill_dir = spill_dir
+        self.segment_lines = max(1, segment_lines)
+        self._owns_spill_dir = False
+        if max_entries is not None:
+            if max_entries < 2:
+                raise ValueError("max_entries must be at least 2")
+            if spill_dir is None:
+                self.spill_dir = Path(tempfile.mkdtemp(prefix="logbook_"))
+                self._owns_spill_dir = True
+            else:
+                spill_dir.mkdir(parents=True, exist_ok=True)
+        self._line_log = SegmentLog(self.spill_dir, "segment", self.segment_lines)
+        self._event_log = SegmentLog(self.spill_dir, "events", self.segment_lines)
+        self._template_ids = array("I")
+        self._args: List[Any] = []
+        self._markers: Set[str] = set()
+        self.events: List[LogEvent] = []
+        self._subscribers: List[LogSubscription[str]] = []
+        self._event_subscribers: List[LogSubscription[LogEvent]] = []
+
+    @property
+    def entries(self) -> List[str]:
+        return [
+            format_entry(template_id, args) for template_id, args in zip(self._template_ids, self._args)
+        ]
 
     def add(self, line: str) -> None:
-        self.entries.append(line)
+        position = len(self)
+        self._template_ids.append(RAW_TEMPLATE_ID)
+        self._args.append(line)
+        if line.startswith(MARKER_PREFIXES):
+            self._markers.add(line)
+        for subscriber in self._subscribers:
+            if subscriber.prefixes is None or line.startswith(subscriber.prefixes):
+                subscriber.push(line, position)
+        self._check_capacity()
+
+    def add_template(self, template: str, args: Tuple[Any, ...] = ()) -> None:
+        position = len(self)
+        template_id = intern_template(template)
+        self._template_ids.append(template_id)
+        self._args.append(args)
+        line = None
+        for subscriber in self._subscribers:
+            if subscriber.prefixes is None:
+                if line is None:
+                    line = format_entry(template_id, args)
+                subscriber.push(line, position)
+        self._check_capacity()
 
     def extend(self, lines: List[str]) -> None:
-        self.entries.extend(lines)
+        for line in lines:
+            self.add(line)
+
+    def emit(self, kind: EventKind, subject: str = "", amount: int = 1) -> None:
+        event = LogEvent(kind, subject, amount)
+        position = self._event_log.spilled + len(self.events)
+        self.events.append(event)
+        for subscriber in self._event_subscribers:
+            subscriber.push(event, position)
+        if self.max_entries is not None and len(self.events) > self.max_entries:
+            count = len(self.events) - self.max_entries // 2
+            self._event_log.append(
+                [[event.kind.value, event.subject, event.amount] for event in self.events[:count]]
+            )
+            del self.events[:count]
 
     def replay(self) -> Iterator[str]:
-        for line in self.entries:
-            if line.startswith(("DISCOVER_", "KILL_BOSS:", "TRUE_ENDING_")):
+        for line in self.lines():
+            if line.startswith(REPLAY_HIDDEN_PREFIXES):
                 continue
             yield line
 
+    def lines(self) -> Iterator[str]:
+        return self.lines_from(0)
+
+    def lines_from(self, position: int = 0) -> Iterator[str]:
+        yield from self._line_log.read_from(position)
+        for index in range(max(0, position - self._line_log.spilled), len(self._args)):
+            yield format_entry(self._template_ids[index], self._args[index])
+
+    def events_from(self, position: int = 0) -> Iterator[LogEvent]:
+        for kind, subject, amount in self._event_log.read_from(position):
+            yield LogEvent(EventKind(kind), subject, amount)
+        yield from self.events[max(0, position - self._event_log.spilled) :]
+
     def has_entries(self) -> bool:
-        return bool(self.entries)
+        return len(self) > 0
+
+    def __len__(self) -> int:
+        return self._line_log.spilled + len(self._args)
+
+    def close(self) -> None:
+        for subscription in self._subscribers + self._event_subscribers:
+            subscription.close()
+        if self._owns_spill_dir and self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+        self._line_log.clear()
+        self._event_log.clear()
+
+    def subscribe(
+        self, from_start: bool = True, prefixes: Optional[Tuple[str, ...]] = None
+    ) -> LogSubscription[str]:
+        subscription: LogSubscription[str] = LogSubscription(
+            self, prefixes=prefixes, resync_from=0 if from_start and len(self) else None
+        )
+        self._subscribers.append(subscription)
+        return subscription
+
+    def subscribe_events(self, from_start: bool = True) -> LogSubscription[LogEvent]:
+        has_events = bool(self.events) or self._event_log.spilled > 0
+        subscription: LogSubscription[LogEvent] = LogSubscription(
+            self, events=True, resync_from=0 if from_start and has_events else None
+        )
+        self._event_subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LogSubscription) -> None:
+        for subscribers in (self._subscribers, self._event_subscribers):
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+
+    def has_marker(self, marker: str) -> bool:
+        return marker in self._markers
+
+    def _check_capacity(self) -> None:
+        if self.max_entries is not None and len(self._args) > self.max_entries:
+            self._spill()
+
+    def _spill(self) -> None:
+        count = len(self._args) - self.max_entries // 2
+        spilled = [
+            format_entry(self._template_ids[index], self._args[index]) for index in range(count)
+        ]
+        del self._template_ids[:count]
+        del self._args[:count]
+        self._line_log.append(spilled)
 
 
 def log_print(logbook: LogBook, line: str) -> None:
-    print(line)
+    if logbook.echo:
+        print(line)
     logbook.add(line)
+
+
+def log_format(logbook: LogBook, template: str, args: Tuple[Any, ...] = ()) -> None:
+    if logbook.echo:
+        print(template.format(*args))
+    logbook.add_template(template, args)